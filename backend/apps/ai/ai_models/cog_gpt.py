@@ -1,32 +1,51 @@
+import json
 import os
 import time
 import openai
-from ..utils import download_from_gcs, load_jsonl_data, prepare_data_for_fine_tuning
+from asgiref.sync import sync_to_async
+from ..utils import download_from_gcs
+from .dataset import build_dataset
+from apps.games.metrics import user_metrics
+from apps.games.norms import get_percentile
+from apps.surveys.models import Survey, SurveyResponse
+from apps.surveys.scoring import score_response
 
 # Set up your OpenAI API key
 openai.api_key = os.getenv("OPENAI_API_KEY")
 
-def perform_analysis(data: dict) -> dict:
+def collect_analysis(data: dict) -> dict:
     """
-    Perform AI analysis on the provided data.
-    Returns insights and charts.
+    Survey and game sections of an analysis, without the overall profile.
+    These query the database; callers that release their connection for
+    the model call collect them first.
     """
-    try:
-        # Initialize response structure
-        analysis_output = {
-            "insights": {},
-            "charts": {}
-        }
+    # Initialize response structure
+    analysis_output = {
+        "insights": {},
+        "charts": {}
+    }
 
-        # Process survey data
-        if 'survey_data' in data:
-            survey_insights = analyze_survey_data(data['survey_data'])
-            analysis_output["insights"]["surveys"] = survey_insights
+    # Process survey data
+    if 'survey_data' in data:
+        survey_insights = analyze_survey_data(data['survey_data'], data.get('user_id'))
+        analysis_output["insights"]["surveys"] = survey_insights
 
-        # Process game data
-        if 'game_data' in data:
-            game_insights = analyze_game_data(data['game_data'])
-            analysis_output["insights"]["games"] = game_insights
+    # Process game data
+    if 'game_data' in data:
+        game_insights = analyze_game_data(data['game_data'], data.get('user_id'))
+        analysis_output["insights"]["games"] = game_insights
+
+    return analysis_output
+
+def perform_analysis(data: dict, analysis_output: dict = None) -> dict:
+    """
+    Perform AI analysis on the provided data.
+    Returns insights and charts. ``analysis_output`` is the result of
+    ``collect_analysis`` when it was already run.
+    """
+    try:
+        if analysis_output is None:
+            analysis_output = collect_analysis(data)
 
         # Generate overall insights
         analysis_output["insights"]["overall"] = generate_overall_insights(
@@ -39,24 +58,80 @@ def perform_analysis(data: dict) -> dict:
         print(f"Error in perform_analysis: {str(e)}")
         raise
 
-def analyze_survey_data(survey_data: list) -> dict:
-    """Analyze survey responses and generate insights."""
-    # Your survey analysis logic here
+def analyze_survey_data(survey_data: list, user_id: int = None) -> dict:
+    """
+    Score survey responses on the psychometric scales declared in each
+    survey. Uses the user's completed responses when ``user_id`` is given;
+    entries of ``survey_data`` with ``survey`` and ``responses`` keys are
+    scored as well, taking precedence over stored responses.
+    """
+    answers_by_survey = {}
+    if user_id:
+        stored = SurveyResponse.objects.filter(user_id=user_id, completed=True)
+        for survey_id, responses in stored.values_list('survey_id', 'responses'):
+            answers_by_survey[survey_id] = responses or {}
+    for entry in survey_data or []:
+        if not isinstance(entry, dict):
+            continue
+        survey_id = entry.get('survey_id', entry.get('survey'))
+        if str(survey_id).isdigit() and isinstance(entry.get('responses'), dict):
+            answers_by_survey[int(survey_id)] = entry['responses']
+
+    surveys = Survey.objects.in_bulk(list(answers_by_survey))
+    scales = {}
+    for survey_id, answers in answers_by_survey.items():
+        survey = surveys.get(survey_id)
+        if survey is None:
+            continue
+        scores = score_response(survey, answers)
+        if scores:
+            scales[str(survey_id)] = scores
+
+    scale_count = sum(len(scores) for scores in scales.values())
     return {
-        "summary": "Survey analysis summary",
-        "key_findings": ["Finding 1", "Finding 2"],
-        "recommendations": ["Recommendation 1", "Recommendation 2"]
+        "summary": (
+            f"Scored {scale_count} scales across {len(scales)} surveys"
+            if scales else "No scored survey scales available yet"
+        ),
+        "scales": scales
     }
 
-def analyze_game_data(game_data: list) -> dict:
-    """Analyze game performance data and generate insights."""
-    # Your game analysis logic here
+def analyze_game_data(game_data: list, user_id: int = None) -> dict:
+    """
+    Analyze game performance data and generate insights.
+    When ``user_id`` is given, cognitive metrics are computed from the
+    user's full score and trial history for the games in ``game_data``.
+    """
+    percentiles = {}
+    game_ids = set()
+    for entry in game_data:
+        if not isinstance(entry, dict):
+            continue
+        game_id = entry.get('game_id', entry.get('game'))
+        if not str(game_id).isdigit():
+            continue
+        game_ids.add(int(game_id))
+        if entry.get('score') is None:
+            continue
+        percentile = get_percentile(
+            int(game_id),
+            entry['score'],
+            entry.get('difficulty', '')
+        )
+        if percentile is not None:
+            percentiles[str(game_id)] = percentile
+
+    average = round(sum(percentiles.values()) / len(percentiles)) if percentiles else None
+    metrics = user_metrics(user_id, game_ids) if user_id and game_ids else {}
     return {
-        "summary": "Game performance analysis summary",
+        "summary": (
+            f"Average population percentile of {average} across {len(percentiles)} games"
+            if average is not None else "No population norms available yet"
+        ),
         "performance_metrics": {
-            "accuracy": "85%",
-            "speed": "Above average",
-            "consistency": "Good"
+            "percentiles": percentiles,
+            "average_percentile": average,
+            "games": {str(game_id): values for game_id, values in metrics.items()}
         }
     }
 
@@ -69,6 +144,74 @@ def generate_overall_insights(insights: dict) -> dict:
         "recommendations": ["Overall recommendation 1", "Overall recommendation 2"]
     }
 
+OVERALL_SYSTEM_PROMPT = (
+    "You are a cognitive assessment assistant. Given a user's survey scale scores "
+    "and game performance metrics as JSON, reply with only a JSON object with the keys "
+    "summary (string), strengths, areas_for_improvement and recommendations (lists of strings)."
+)
+
+def overall_messages(insights: dict) -> list:
+    """Chat messages asking the model for the overall profile."""
+    return [
+        {"role": "system", "content": OVERALL_SYSTEM_PROMPT},
+        {"role": "user", "content": json.dumps(insights, default=str)},
+    ]
+
+def parse_overall(reply: str, fallback: dict) -> dict:
+    """Read the model's overall profile, keeping ``fallback`` if it is unusable."""
+    try:
+        overall = json.loads(reply)
+    except (TypeError, ValueError):
+        return fallback
+    if not isinstance(overall, dict) or not isinstance(overall.get('summary'), str):
+        return fallback
+    return {key: overall.get(key, fallback[key]) for key in fallback}
+
+# Typical length of the overall profile reply, for analyze stage progress
+EXPECTED_REPLY_CHARS = 600
+
+async def perform_analysis_async(data: dict, runner, stream=None, progress=None,
+                                 analysis_output: dict = None) -> dict:
+    """
+    ``perform_analysis`` with the overall profile written by the model
+    through an ``AnalysisRunner``. Survey and game analysis run in a
+    thread since they query the database, unless ``analysis_output``
+    already holds them. With an ``AnalysisStream``, the finished sections
+    and the model output are streamed as they arrive; with a
+    ``ProgressReporter``, the process and analyze stages are reported.
+    """
+    if analysis_output is None:
+        if progress is not None:
+            await progress.aupdate('process')
+        analysis_output = await sync_to_async(perform_analysis)(data)
+    else:
+        analysis_output = perform_analysis(data, analysis_output)
+    if progress is not None:
+        await progress.aupdate('analyze')
+    insights = analysis_output["insights"]
+    sections = {key: value for key, value in insights.items() if key != "overall"}
+    messages = overall_messages(sections)
+
+    if stream is None:
+        reply = await runner.complete(messages, response_format={"type": "json_object"})
+    else:
+        for name, section in sections.items():
+            await stream.section(name, section)
+        parts, received = [], 0
+        async for delta in runner.stream(messages, response_format={"type": "json_object"}):
+            parts.append(delta)
+            await stream.text(delta)
+            if progress is not None:
+                received += len(delta)
+                await progress.aupdate('analyze', min(received / EXPECTED_REPLY_CHARS, 0.95))
+        await stream.flush()
+        reply = ''.join(parts)
+
+    insights["overall"] = parse_overall(reply, insights["overall"])
+    if stream is not None:
+        await stream.section("overall", insights["overall"])
+    return analysis_output
+
 def upload_file_to_openai(file_path):
     """
     Upload a file to OpenAI and return the file ID.
@@ -127,7 +270,7 @@ def main():
     BUCKET_NAME = 'your-gcs-bucket-name'
     BLOB_NAME = 'path/to/your/data.jsonl'
     LOCAL_FILE_PATH = 'data.jsonl'
-    PREPARED_FILE_PATH = 'prepared_data.jsonl'
+    PREPARED_DIR = 'prepared_data'
     MODEL_NAME = 'gpt-4o-mini'
 
     # Ensure OpenAI API key is set
@@ -138,14 +281,14 @@ def main():
     # Download data from GCS
     download_from_gcs(BUCKET_NAME, BLOB_NAME, LOCAL_FILE_PATH)
 
-    # Load data
-    data_list = load_jsonl_data(LOCAL_FILE_PATH)
-
-    # Prepare data for fine-tuning
-    prepare_data_for_fine_tuning(data_list, PREPARED_FILE_PATH)
+    # Validate and prepare data for fine-tuning as a single shard
+    report = build_dataset(LOCAL_FILE_PATH, PREPARED_DIR, shard_size=None)
+    print(f"Prepared {report.examples} examples ({report.tokens} tokens), rejected {report.rejected}")
+    if not report.shards:
+        return
 
     # Upload file to OpenAI
-    training_file_id = upload_file_to_openai(PREPARED_FILE_PATH)
+    training_file_id = upload_file_to_openai(report.shards[0].path)
     if not training_file_id:
         return
 
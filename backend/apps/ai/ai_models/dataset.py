@@ -0,0 +1,234 @@
+# Backend/Apps/AI/ai_models/dataset.py
+
+"""
+Streaming preparation of fine-tuning datasets.
+
+``build_dataset`` reads a JSONL corpus line by line, validates and token
+counts examples in a process pool, and writes accepted examples to
+sharded JSONL files. Lines are handed to workers in chunks with a bounded
+number of chunks in flight, and shards are written as results arrive, so
+memory use depends on ``chunk_size`` and ``processes``, not on the size
+of the corpus.
+
+Outputs in ``output_dir``:
+
+- ``<prefix>-00000.jsonl``, ...: ``{"messages": [...]}`` per line
+- ``rejects.jsonl``: ``{"line": n, "error": ...}`` per rejected line
+- ``manifest.json``: per-shard and total counts and token statistics
+
+Tokens are counted with ``tiktoken`` when it is installed, and estimated
+from the text length otherwise.
+"""
+
+import json
+import os
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from itertools import islice
+from multiprocessing import get_context
+
+ROLES = {'system', 'user', 'assistant'}
+
+# Context limit of a gpt-4o-mini training example
+DEFAULT_MAX_TOKENS = 65536
+DEFAULT_SHARD_SIZE = 50_000  # examples per shard
+DEFAULT_CHUNK_SIZE = 1000  # lines per worker job
+
+# Chat format overhead per message and per conversation
+TOKENS_PER_MESSAGE = 3
+TOKENS_PER_CONVERSATION = 3
+CHARS_PER_TOKEN = 4
+
+_encoding = None
+
+def count_tokens(text: str) -> int:
+    global _encoding
+    if _encoding is None:
+        try:
+            import tiktoken
+            _encoding = tiktoken.get_encoding('o200k_base')
+        except ImportError:
+            _encoding = False
+    if _encoding:
+        return len(_encoding.encode(text))
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+def validate_example(example):
+    """
+    Check one parsed example. Returns the messages to keep, or raises
+    ``ValueError`` describing the first problem.
+    """
+    if not isinstance(example, dict):
+        raise ValueError("Example is not a JSON object")
+    messages = example.get('messages')
+    if not isinstance(messages, list) or not messages:
+        raise ValueError("'messages' must be a non-empty list")
+
+    kept = []
+    for position, message in enumerate(messages):
+        if not isinstance(message, dict):
+            raise ValueError(f"Message {position} is not an object")
+        if message.get('role') not in ROLES:
+            raise ValueError(f"Message {position} has invalid role {message.get('role')!r}")
+        if not isinstance(message.get('content'), str) or not message['content'].strip():
+            raise ValueError(f"Message {position} has no text content")
+        kept.append({'role': message['role'], 'content': message['content']})
+    if kept[-1]['role'] != 'assistant':
+        raise ValueError("Last message must be from the assistant")
+    return kept
+
+def example_tokens(messages) -> int:
+    return TOKENS_PER_CONVERSATION + sum(
+        TOKENS_PER_MESSAGE + count_tokens(message['content']) for message in messages
+    )
+
+def process_lines(lines, max_tokens=DEFAULT_MAX_TOKENS):
+    """
+    Decode, parse, validate and count a chunk of ``(line number, bytes)``
+    pairs. Returns ``('ok', line, json, tokens)`` or ``('reject', line,
+    error)`` per non-blank line. Runs in worker processes.
+    """
+    results = []
+    for line_number, raw in lines:
+        if not raw.strip():
+            continue
+        try:
+            messages = validate_example(json.loads(raw.decode('utf-8')))
+        except ValueError as e:  # includes JSONDecodeError and UnicodeDecodeError
+            results.append(('reject', line_number, str(e)))
+            continue
+        tokens = example_tokens(messages)
+        if tokens > max_tokens:
+            results.append(('reject', line_number, f"{tokens} tokens exceeds the limit of {max_tokens}"))
+            continue
+        results.append(('ok', line_number, json.dumps({'messages': messages}, ensure_ascii=False), tokens))
+    return results
+
+def iter_chunks(path, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Yield lists of ``(line number, bytes)`` from a JSONL file. Lines are
+    decoded by the workers, so an invalid line is rejected on its own.
+    """
+    with open(path, 'rb') as f:
+        numbered = enumerate(f, start=1)
+        while True:
+            chunk = list(islice(numbered, chunk_size))
+            if not chunk:
+                return
+            yield chunk
+
+def _process_chunks(chunks, processes, max_tokens):
+    """Yield processed chunks in input order with bounded look-ahead."""
+    if processes <= 1:
+        for chunk in chunks:
+            yield process_lines(chunk, max_tokens)
+        return
+
+    with get_context().Pool(processes) as pool:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(pool.apply_async(process_lines, (chunk, max_tokens)))
+            if len(pending) >= processes * 2:
+                yield pending.popleft().get()
+        while pending:
+            yield pending.popleft().get()
+
+@dataclass
+class ShardStats:
+    path: str
+    examples: int = 0
+    tokens: int = 0
+    min_tokens: int = None
+    max_tokens: int = None
+    bytes: int = 0
+
+    def add(self, tokens, size):
+        self.examples += 1
+        self.tokens += tokens
+        self.bytes += size
+        self.min_tokens = tokens if self.min_tokens is None else min(self.min_tokens, tokens)
+        self.max_tokens = tokens if self.max_tokens is None else max(self.max_tokens, tokens)
+
+    def as_dict(self):
+        return {
+            **asdict(self),
+            'mean_tokens': round(self.tokens / self.examples, 1) if self.examples else None,
+        }
+
+@dataclass
+class DatasetReport:
+    lines: int = 0  # non-blank lines read
+    examples: int = 0
+    rejected: int = 0
+    tokens: int = 0
+    shards: list = field(default_factory=list)  # ShardStats
+
+    def as_dict(self):
+        return {
+            'lines': self.lines,
+            'examples': self.examples,
+            'rejected': self.rejected,
+            'tokens': self.tokens,
+            'shards': [shard.as_dict() for shard in self.shards],
+        }
+
+class ShardWriter:
+    """Writes examples to numbered shard files of at most ``shard_size`` examples."""
+    def __init__(self, output_dir, prefix='train', shard_size=DEFAULT_SHARD_SIZE):
+        self.output_dir = output_dir
+        self.prefix = prefix
+        self.shard_size = shard_size
+        self.shards = []
+        self._file = None
+
+    def _open_shard(self):
+        self.close()
+        path = os.path.join(self.output_dir, f"{self.prefix}-{len(self.shards):05d}.jsonl")
+        self._file = open(path, 'w', encoding='utf-8')
+        self.shards.append(ShardStats(path=path))
+
+    def write(self, text, tokens):
+        if self._file is None or (self.shard_size and self.shards[-1].examples >= self.shard_size):
+            self._open_shard()
+        data = text + '\n'
+        self._file.write(data)
+        self.shards[-1].add(tokens, len(data.encode('utf-8')))
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+def build_dataset(path, output_dir, shard_size=DEFAULT_SHARD_SIZE, max_tokens=DEFAULT_MAX_TOKENS,
+                  processes=None, chunk_size=DEFAULT_CHUNK_SIZE, prefix='train') -> DatasetReport:
+    """
+    Validate a JSONL corpus and write it as sharded fine-tuning files.
+    ``shard_size=None`` writes a single shard; ``processes`` defaults to
+    the CPU count.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    processes = processes or os.cpu_count() or 1
+    report = DatasetReport()
+    writer = ShardWriter(output_dir, prefix=prefix, shard_size=shard_size)
+
+    with open(os.path.join(output_dir, 'rejects.jsonl'), 'w', encoding='utf-8') as rejects:
+        try:
+            for results in _process_chunks(iter_chunks(path, chunk_size), processes, max_tokens):
+                for result in results:
+                    report.lines += 1
+                    if result[0] == 'ok':
+                        _, _, text, tokens = result
+                        writer.write(text, tokens)
+                        report.examples += 1
+                        report.tokens += tokens
+                    else:
+                        _, line_number, error = result
+                        rejects.write(json.dumps({'line': line_number, 'error': error}) + '\n')
+                        report.rejected += 1
+        finally:
+            writer.close()
+
+    report.shards = writer.shards
+    with open(os.path.join(output_dir, 'manifest.json'), 'w', encoding='utf-8') as manifest:
+        json.dump(report.as_dict(), manifest, indent=2)
+    return report
@@ -0,0 +1,162 @@
+# Backend/Apps/AI/ai_models/fake_llm.py
+
+"""
+Fake OpenAI-compatible chat completion server for offline benchmarks.
+
+Serves ``POST /v1/chat/completions`` over HTTP/1.1 keep-alive with the
+standard library only. Each request waits ``latency`` seconds (plus up to
+``jitter``) before a canned reply, which stands in for provider latency.
+Requests with ``"stream": true`` get the reply as server-sent events in
+``STREAM_PIECE`` character pieces, ``token_interval`` seconds apart.
+Point ``OPENAI_BASE_URL`` (or ``AnalysisRunner(base_url=...)``) at
+``http://<host>:<port>/v1``.
+"""
+
+import asyncio
+import json
+import random
+import time
+import uuid
+
+REPLY = json.dumps({
+    "summary": "Consistent performance with room to grow",
+    "strengths": ["Working memory"],
+    "areas_for_improvement": ["Processing speed"],
+    "recommendations": ["Practice timed tasks"],
+})
+
+STREAM_PIECE = 8
+
+class FakeLLMServer:
+    def __init__(self, host='127.0.0.1', port=8765, latency=0.5, jitter=0.0, reply=REPLY,
+                 token_interval=0.01):
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.jitter = jitter
+        self.token_interval = token_interval
+        self.reply = reply
+        self.requests = 0
+        self._server = None
+
+    @property
+    def base_url(self):
+        return f"http://{self.host}:{self.port}/v1"
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        # Port 0 picks a free port
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def serve_forever(self):
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, *exc_info):
+        await self.stop()
+
+    def completion(self, request):
+        prompt = ' '.join(str(message.get('content', '')) for message in request.get('messages', []))
+        completion_tokens = len(self.reply) // 4
+        return {
+            "id": f"chatcmpl-{uuid.uuid4().hex}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request.get('model', 'fake'),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": self.reply},
+                "finish_reason": "stop",
+            }],
+            "usage": {
+                "prompt_tokens": len(prompt) // 4,
+                "completion_tokens": completion_tokens,
+                "total_tokens": len(prompt) // 4 + completion_tokens,
+            },
+        }
+
+    def chunk(self, request, completion_id, delta, finish_reason=None):
+        return {
+            "id": completion_id,
+            "object": "chat.completion.chunk",
+            "created": int(time.time()),
+            "model": request.get('model', 'fake'),
+            "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+        }
+
+    async def _stream(self, writer, request):
+        writer.write(
+            b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\n"
+            b"Transfer-Encoding: chunked\r\n\r\n"
+        )
+        completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+        events = [self.chunk(request, completion_id, {"role": "assistant", "content": ""})]
+        events += [
+            self.chunk(request, completion_id, {"content": self.reply[start:start + STREAM_PIECE]})
+            for start in range(0, len(self.reply), STREAM_PIECE)
+        ]
+        events.append(self.chunk(request, completion_id, {}, finish_reason="stop"))
+
+        for position, event in enumerate(events):
+            if position > 1:
+                await asyncio.sleep(self.token_interval)
+            self._write_chunk(writer, f"data: {json.dumps(event)}\n\n".encode())
+            await writer.drain()
+        self._write_chunk(writer, b"data: [DONE]\n\n")
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+
+    @staticmethod
+    def _write_chunk(writer, data):
+        writer.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+
+    async def _handle(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, _ = request_line.decode('latin-1').split(' ', 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get('content-length', 0)))
+
+                if method == 'POST' and path.rstrip('/').endswith('/chat/completions'):
+                    self.requests += 1
+                    request = json.loads(body or b'{}')
+                    await asyncio.sleep(self.latency + random.uniform(0, self.jitter))
+                    if request.get('stream'):
+                        await self._stream(writer, request)
+                        continue
+                    status, payload = '200 OK', self.completion(request)
+                else:
+                    status, payload = '404 Not Found', {"error": {"message": "Not found"}}
+
+                data = json.dumps(payload).encode()
+                writer.write(
+                    f"HTTP/1.1 {status}\r\nContent-Type: application/json\r\n"
+                    f"Content-Length: {len(data)}\r\n\r\n".encode() + data
+                )
+                await writer.drain()
+                if headers.get('connection', '').lower() == 'close':
+                    break
+        except (asyncio.IncompleteReadError, ConnectionResetError, ValueError):
+            pass
+        finally:
+            writer.close()
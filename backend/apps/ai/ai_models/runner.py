@@ -0,0 +1,154 @@
+# Backend/Apps/AI/ai_models/runner.py
+
+"""
+Asyncio runner for model calls.
+
+One ``AnalysisRunner`` owns a single ``AsyncOpenAI`` client over a pooled
+HTTP connection pool, so many analyses can wait on the provider at once
+inside one worker process. Concurrency is capped by a semaphore
+(``AI_MAX_IN_FLIGHT``) and request and token rates by token buckets sized
+from the provider limits (``AI_REQUESTS_PER_MINUTE``,
+``AI_TOKENS_PER_MINUTE``).
+
+``OPENAI_BASE_URL`` points the client at another server, e.g. the fake
+one in ``fake_llm`` for offline benchmarks.
+
+The client is bound to the event loop it was created in: create a runner
+inside the coroutine that uses it, e.g. ``async with AnalysisRunner() as
+runner: ...`` under ``asyncio.run``.
+"""
+
+import asyncio
+import os
+import time
+
+from django.conf import settings
+
+DEFAULT_MAX_IN_FLIGHT = 16
+DEFAULT_REQUESTS_PER_MINUTE = 500
+DEFAULT_TOKENS_PER_MINUTE = 200_000
+DEFAULT_MAX_TOKENS = 800
+DEFAULT_TIMEOUT = 60  # seconds
+
+# Rough prompt size estimate for the token bucket
+CHARS_PER_TOKEN = 4
+
+class TokenBucket:
+    """
+    Token bucket refilled continuously at ``rate`` tokens per second up to
+    ``capacity``. ``acquire`` waits until enough tokens are available;
+    waiters are served in arrival order.
+    """
+    def __init__(self, rate: float, capacity: float = None):
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, amount: float = 1):
+        # Requests larger than the bucket would wait forever; let them drain it
+        amount = min(float(amount), self.capacity)
+        async with self._lock:
+            self._refill()
+            while self._tokens < amount:
+                await asyncio.sleep((amount - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= amount
+
+def _setting(name, default):
+    return getattr(settings, name, None) or default
+
+def estimate_tokens(messages, max_tokens: int) -> int:
+    """Prompt size estimate plus the completion budget."""
+    chars = sum(len(message.get('content') or '') for message in messages)
+    return chars // CHARS_PER_TOKEN + max_tokens
+
+def is_configured() -> bool:
+    """Whether a model API is available (a key, or an alternate server)."""
+    return bool(os.getenv('OPENAI_API_KEY') or _setting('OPENAI_BASE_URL', None))
+
+class AnalysisRunner:
+    """
+    Concurrent, rate-limited chat completions over one pooled client.
+    """
+    def __init__(self, model=None, max_in_flight=None, requests_per_minute=None,
+                 tokens_per_minute=None, base_url=None, api_key=None, timeout=DEFAULT_TIMEOUT):
+        self.model = model or _setting('AI_ANALYSIS_MODEL', 'gpt-4o-mini')
+        self.max_in_flight = max_in_flight or _setting('AI_MAX_IN_FLIGHT', DEFAULT_MAX_IN_FLIGHT)
+        requests_per_minute = requests_per_minute or _setting('AI_REQUESTS_PER_MINUTE', DEFAULT_REQUESTS_PER_MINUTE)
+        tokens_per_minute = tokens_per_minute or _setting('AI_TOKENS_PER_MINUTE', DEFAULT_TOKENS_PER_MINUTE)
+
+        self._semaphore = asyncio.Semaphore(self.max_in_flight)
+        self._requests = TokenBucket(requests_per_minute / 60, capacity=max(1, requests_per_minute / 60))
+        self._tokens = TokenBucket(tokens_per_minute / 60, capacity=tokens_per_minute)
+
+        import httpx
+        from openai import AsyncOpenAI
+
+        self._http = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=self.max_in_flight,
+                max_keepalive_connections=self.max_in_flight
+            ),
+            timeout=timeout
+        )
+        self.client = AsyncOpenAI(
+            api_key=api_key or os.getenv('OPENAI_API_KEY') or 'unset',
+            base_url=base_url or _setting('OPENAI_BASE_URL', None),
+            http_client=self._http
+        )
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    async def aclose(self):
+        await self.client.close()
+        await self._http.aclose()
+
+    async def complete(self, messages, max_tokens=DEFAULT_MAX_TOKENS, **kwargs) -> str:
+        """Run one chat completion and return the reply text."""
+        await self._requests.acquire()
+        await self._tokens.acquire(estimate_tokens(messages, max_tokens))
+        async with self._semaphore:
+            response = await self.client.chat.completions.create(
+                model=self.model,
+                messages=messages,
+                max_tokens=max_tokens,
+                **kwargs
+            )
+        return response.choices[0].message.content or ''
+
+    async def stream(self, messages, max_tokens=DEFAULT_MAX_TOKENS, **kwargs):
+        """Run one chat completion, yielding reply text as it arrives."""
+        await self._requests.acquire()
+        await self._tokens.acquire(estimate_tokens(messages, max_tokens))
+        async with self._semaphore:
+            response = await self.client.chat.completions.create(
+                model=self.model,
+                messages=messages,
+                max_tokens=max_tokens,
+                stream=True,
+                **kwargs
+            )
+            async for chunk in response:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+
+    async def complete_many(self, conversations, **kwargs) -> list:
+        """
+        Run many completions concurrently. Returns replies in input order,
+        with the exception in place of any call that failed.
+        """
+        return await asyncio.gather(
+            *(self.complete(messages, **kwargs) for messages in conversations),
+            return_exceptions=True
+        )
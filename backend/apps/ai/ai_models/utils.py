@@ -14,13 +14,13 @@ def download_from_gcs(bucket_name, blob_name, destination_file):
 
 def load_jsonl_data(file_path):
     """
-    Load data from a JSONL file.
+    Iterate over the records of a JSONL file without loading it whole.
+    Use ``dataset.build_dataset`` to validate and shard a corpus.
     """
-    data = []
     with open(file_path, 'r', encoding='utf-8') as f:
         for line in f:
-            data.append(json.loads(line.strip()))
-    return data
+            if line.strip():
+                yield json.loads(line)
 
 def prepare_data_for_fine_tuning(data_list, output_file):
     """
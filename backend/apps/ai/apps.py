@@ -3,4 +3,7 @@ from django.apps import AppConfig
 class AIConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.ai'
-    label = 'ai'
\ No newline at end of file
+    label = 'ai'
+
+    def ready(self):
+        from . import checks  # noqa: F401 registers the system checks
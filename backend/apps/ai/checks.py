@@ -0,0 +1,25 @@
+# Backend/Apps/AI/checks.py
+
+from django.conf import settings
+from django.core.checks import Error, register
+
+@register()
+def check_event_store(app_configs, **kwargs):
+    """
+    Streaming, replay and progress state go from the Celery worker to the
+    ASGI server through the AI event store, so outside DEBUG it must be a
+    real Redis rather than the in-process fallback.
+    """
+    if settings.DEBUG or getattr(settings, 'AI_DATA_REDIS_URL', None):
+        return []
+    return [
+        Error(
+            "AI_DATA_REDIS_URL is not set.",
+            hint=(
+                "Analysis streams, their replay lists and progress state are "
+                "shared between worker and web processes through Redis; the "
+                "in-process fallback only works with DEBUG on."
+            ),
+            id='ai.E001',
+        )
+    ]
@@ -1,17 +1,26 @@
 import json
 import asyncio
+from urllib.parse import parse_qs
 from channels.generic.websocket import AsyncWebsocketConsumer
 from channels.db import database_sync_to_async
 from django.core.cache import cache
 from .tasks import perform_ai_analysis
+from . import progress, streaming
 
 class AnalysisConsumer(AsyncWebsocketConsumer):
+    """
+    Streams the frames of one analysis task. A client that reconnects with
+    ``?after=<seq>`` (or sends ``{"action": "resume", "after": <seq>}``)
+    first receives every frame it missed, then live frames; frames are
+    never delivered twice on one socket.
+    """
     TIMEOUT = 300  # 5 minutes timeout
     
     async def connect(self):
         self.task_id = self.scope['url_route']['kwargs']['task_id']
-        self.room_group_name = f'analysis_{self.task_id}'
+        self.room_group_name = streaming.group_name(self.task_id)
         self.disconnect_timer = None
+        self.last_seq = 0
 
         # Join room group
         await self.channel_layer.group_add(
@@ -24,6 +33,37 @@ class AnalysisConsumer(AsyncWebsocketConsumer):
         
         await self.accept()
 
+        # Current stage and progress, without waiting for the next update
+        state = await database_sync_to_async(progress.get_state)(self.task_id)
+        if state is not None and state.get('status') == 'processing':
+            await self.send(text_data=json.dumps({'type': 'progress', **state}))
+
+        # Joined the group first, so nothing published meanwhile is missed
+        query = parse_qs(self.scope.get('query_string', b'').decode())
+        await self.resume(self._seq(query.get('after', [0])[0]))
+
+    @staticmethod
+    def _seq(value):
+        try:
+            return max(int(value), 0)
+        except (TypeError, ValueError):
+            return 0
+
+    async def resume(self, after):
+        """Send the recorded frames after sequence number ``after``."""
+        self.last_seq = after
+        frames = await database_sync_to_async(streaming.replay)(self.task_id, self.last_seq)
+        for frame in frames:
+            await self.send_frame(frame)
+
+    async def send_frame(self, frame):
+        seq = frame.get('seq')
+        if seq is not None:
+            if seq <= self.last_seq:
+                return
+            self.last_seq = seq
+        await self.send(text_data=json.dumps(frame))
+
     async def disconnect_on_timeout(self):
         """Disconnect after timeout period"""
         await asyncio.sleep(self.TIMEOUT)
@@ -65,7 +105,11 @@ class AnalysisConsumer(AsyncWebsocketConsumer):
             if self.disconnect_timer:
                 self.disconnect_timer.cancel()
             self.disconnect_timer = asyncio.create_task(self.disconnect_on_timeout())
-            
+
+            if data.get('action') == 'resume':
+                await self.resume(self._seq(data.get('after')))
+                return
+
             await self.send(text_data=json.dumps({
                 'status': 'received'
             }))
@@ -79,7 +123,7 @@ class AnalysisConsumer(AsyncWebsocketConsumer):
         """
         Receive analysis update from room group
         """
-        await self.send(text_data=json.dumps(event['data']))
+        await self.send_frame(event['data'])
 
     async def send_status_update(self, task):
         """
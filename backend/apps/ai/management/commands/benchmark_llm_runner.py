@@ -0,0 +1,57 @@
+# Backend/Apps/AI/management/commands/benchmark_llm_runner.py
+
+import asyncio
+import time
+from django.core.management.base import BaseCommand, CommandError
+from apps.ai.ai_models.cog_gpt import overall_messages
+from apps.ai.ai_models.fake_llm import FakeLLMServer
+from apps.ai.ai_models.runner import AnalysisRunner
+
+class Command(BaseCommand):
+    help = "Benchmark concurrent model calls through the async analysis runner"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200)
+        parser.add_argument('--max-in-flight', type=int, default=32)
+        parser.add_argument('--requests-per-minute', type=int, default=60000)
+        parser.add_argument('--tokens-per-minute', type=int, default=10_000_000)
+        parser.add_argument(
+            '--base-url',
+            help='Server to call; by default a fake server is started in-process'
+        )
+        parser.add_argument('--latency', type=float, default=0.5, help='Fake server seconds per completion')
+
+    def handle(self, *args, **options):
+        if options['requests'] < 1 or options['max_in_flight'] < 1:
+            raise CommandError("--requests and --max-in-flight must be positive")
+        elapsed, failures = asyncio.run(self._run(options))
+
+        requests = options['requests']
+        self.stdout.write(f"{requests} completions, {options['max_in_flight']} in flight, {failures} failed")
+        self.stdout.write(self.style.SUCCESS(
+            f"{elapsed:.2f} s total, {requests / elapsed:.1f} completions/s"
+        ))
+
+    async def _run(self, options):
+        server = None
+        base_url = options['base_url']
+        if not base_url:
+            server = await FakeLLMServer(port=0, latency=options['latency']).start()
+            base_url = server.base_url
+
+        messages = overall_messages({"games": {"summary": "benchmark"}})
+        try:
+            async with AnalysisRunner(
+                max_in_flight=options['max_in_flight'],
+                requests_per_minute=options['requests_per_minute'],
+                tokens_per_minute=options['tokens_per_minute'],
+                base_url=base_url,
+                api_key='benchmark'
+            ) as runner:
+                started = time.perf_counter()
+                replies = await runner.complete_many([messages] * options['requests'])
+                elapsed = time.perf_counter() - started
+        finally:
+            if server is not None:
+                await server.stop()
+        return elapsed, sum(isinstance(reply, Exception) for reply in replies)
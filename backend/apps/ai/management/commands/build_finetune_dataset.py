@@ -0,0 +1,48 @@
+# Backend/Apps/AI/management/commands/build_finetune_dataset.py
+
+from django.core.management.base import BaseCommand, CommandError
+from apps.ai.ai_models import dataset
+
+class Command(BaseCommand):
+    help = "Validate a JSONL fine-tuning corpus and write it as token-counted shards"
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Input JSONL file')
+        parser.add_argument('output_dir')
+        parser.add_argument(
+            '--shard-size',
+            type=int,
+            default=dataset.DEFAULT_SHARD_SIZE,
+            help='Examples per shard (0 for a single shard)'
+        )
+        parser.add_argument('--max-tokens', type=int, default=dataset.DEFAULT_MAX_TOKENS)
+        parser.add_argument('--processes', type=int, help='Worker processes (default: CPU count)')
+        parser.add_argument('--chunk-size', type=int, default=dataset.DEFAULT_CHUNK_SIZE)
+        parser.add_argument('--prefix', default='train')
+
+    def handle(self, *args, **options):
+        if options['chunk_size'] < 1:
+            raise CommandError("--chunk-size must be positive")
+        try:
+            report = dataset.build_dataset(
+                options['path'],
+                options['output_dir'],
+                shard_size=options['shard_size'] or None,
+                max_tokens=options['max_tokens'],
+                processes=options['processes'],
+                chunk_size=options['chunk_size'],
+                prefix=options['prefix']
+            )
+        except FileNotFoundError as e:
+            raise CommandError(str(e))
+
+        for shard in report.shards:
+            stats = shard.as_dict()
+            self.stdout.write(
+                f"{stats['path']}: {stats['examples']} examples, {stats['tokens']} tokens "
+                f"(min {stats['min_tokens']}, mean {stats['mean_tokens']}, max {stats['max_tokens']})"
+            )
+        self.stdout.write(self.style.SUCCESS(
+            f"{report.examples} examples, {report.tokens} tokens in {len(report.shards)} shards; "
+            f"{report.rejected} rejected"
+        ))
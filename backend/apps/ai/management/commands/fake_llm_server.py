@@ -0,0 +1,27 @@
+# Backend/Apps/AI/management/commands/fake_llm_server.py
+
+import asyncio
+from django.core.management.base import BaseCommand
+from apps.ai.ai_models.fake_llm import FakeLLMServer
+
+class Command(BaseCommand):
+    help = "Serve a fake OpenAI-compatible chat completion API for offline benchmarks"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--host', default='127.0.0.1')
+        parser.add_argument('--port', type=int, default=8765)
+        parser.add_argument('--latency', type=float, default=0.5, help='Seconds per completion')
+        parser.add_argument('--jitter', type=float, default=0.0, help='Extra random seconds per completion')
+
+    def handle(self, *args, **options):
+        server = FakeLLMServer(
+            host=options['host'],
+            port=options['port'],
+            latency=options['latency'],
+            jitter=options['jitter']
+        )
+        self.stdout.write(f"Serving fake completions at {server.base_url}")
+        try:
+            asyncio.run(server.serve_forever())
+        except KeyboardInterrupt:
+            self.stdout.write(f"Served {server.requests} completions")
@@ -63,3 +63,24 @@ class AnalysisTask(models.Model):
     class Meta:
         db_table = 'AI_analysistask'
         app_label = 'AI'
+
+class AnalysisCache(models.Model):
+    """
+    Durable store of analysis outputs keyed by a hash of the analysis input,
+    prompt version and model name. See ``apps.ai.result_cache``.
+    """
+    key = models.CharField(max_length=64, unique=True)
+    prompt_version = models.CharField(max_length=50)
+    model_name = models.CharField(max_length=100)
+    insights = models.JSONField(default=dict)
+    charts = models.JSONField(default=dict)
+    hit_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(default=timezone.now)
+    expires_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        db_table = 'AI_analysiscache'
+        app_label = 'AI'
+
+    def __str__(self):
+        return f"Cached analysis {self.key[:12]} ({self.model_name})"
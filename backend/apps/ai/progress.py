@@ -0,0 +1,126 @@
+# Backend/Apps/AI/progress.py
+
+"""
+Staged progress reporting for analysis tasks.
+
+A task moves through the stages collect -> process -> analyze -> finalize,
+each covering a slice of the overall 0..1 progress, and reports a fraction
+within the current stage. ``ProgressReporter`` sends ``progress`` frames
+to the ``analysis_{task_id}`` group, throttled per task: a new stage is
+always sent, updates within a stage at most every ``MIN_INTERVAL`` seconds
+and only when progress moved by ``MIN_STEP``. Repeated states are dropped.
+
+The latest state is kept in the AI event store under ``state_key(task_id)``,
+shared by the worker that reports it and the web processes that serve it,
+so REST polling and newly connected sockets see it without waiting for the
+next frame. Progress frames are not added to the replay list of
+``apps.ai.streaming``, since only the latest one matters; the final status
+is, through ``finish``.
+"""
+
+import json
+import time
+
+from asgiref.sync import sync_to_async
+
+from . import streaming
+from .services import get_event_store
+
+COLLECT, PROCESS, ANALYZE, FINALIZE = 'collect', 'process', 'analyze', 'finalize'
+STAGES = (COLLECT, PROCESS, ANALYZE, FINALIZE)
+
+# Slice of overall progress covered by each stage
+STAGE_SPANS = {
+    COLLECT: (0.0, 0.2),
+    PROCESS: (0.2, 0.4),
+    ANALYZE: (0.4, 0.8),
+    FINALIZE: (0.8, 1.0),
+}
+
+MIN_INTERVAL = 0.5  # seconds between updates within a stage
+MIN_STEP = 0.01  # smallest overall progress change worth sending
+STATE_TTL = 3600  # seconds
+
+def state_key(task_id) -> str:
+    return f"analysis_progress:{task_id}"
+
+def get_state(task_id):
+    """Latest progress state of a task, or None."""
+    state = get_event_store().get(state_key(task_id))
+    return json.loads(state) if state is not None else None
+
+def _store(task_id, state):
+    get_event_store().set(state_key(task_id), json.dumps(state), ex=STATE_TTL)
+
+def set_pending(task_id, **context):
+    """Record a queued task, so polling finds it before a worker picks it up."""
+    state = {**context, 'status': 'pending', 'stage': None, 'progress': 0.0}
+    _store(task_id, state)
+    return state
+
+def overall_progress(stage: str, fraction: float) -> float:
+    start, end = STAGE_SPANS[stage]
+    return round(start + (end - start) * min(max(fraction, 0.0), 1.0), 3)
+
+class ProgressReporter:
+    """
+    Progress reporter of one task. ``update`` is for synchronous code and
+    ``aupdate`` for coroutines; both return the state if it was sent.
+    ``context`` (e.g. analysis and user ids) is included in every state.
+    """
+    def __init__(self, task_id, min_interval=MIN_INTERVAL, min_step=MIN_STEP, **context):
+        self.task_id = task_id
+        self.min_interval = min_interval
+        self.min_step = min_step
+        self.context = context
+        self.state = None
+        self._sent_at = 0.0
+
+    def _accept(self, stage, fraction, force):
+        progress = overall_progress(stage, fraction)
+        previous = self.state
+        if previous is not None and not force:
+            if previous['stage'] == stage:
+                if progress - previous['progress'] < self.min_step:
+                    return None
+                if time.monotonic() - self._sent_at < self.min_interval:
+                    return None
+            elif STAGES.index(stage) < STAGES.index(previous['stage']):
+                return None  # Stages only move forward
+        self.state = {
+            **self.context,
+            'status': 'processing',
+            'stage': stage,
+            'progress': progress,
+        }
+        self._sent_at = time.monotonic()
+        return self.state
+
+    def update(self, stage: str, fraction: float = 0.0, force: bool = False):
+        state = self._accept(stage, fraction, force)
+        if state is not None:
+            _store(self.task_id, state)
+            streaming.broadcast(self.task_id, {'type': 'progress', **state})
+        return state
+
+    async def aupdate(self, stage: str, fraction: float = 0.0, force: bool = False):
+        state = self._accept(stage, fraction, force)
+        if state is not None:
+            await sync_to_async(_store, thread_sensitive=False)(self.task_id, state)
+            await streaming.abroadcast(self.task_id, {'type': 'progress', **state})
+        return state
+
+    def finish(self, status: str, **data):
+        """Record and broadcast the final status (``completed`` or ``failed``)."""
+        previous = self.state or {'stage': COLLECT, 'progress': 0.0}
+        completed = status == 'completed'
+        self.state = {
+            **self.context,
+            'status': status,
+            'stage': FINALIZE if completed else previous['stage'],
+            'progress': 1.0 if completed else previous['progress'],
+            **data,
+        }
+        _store(self.task_id, self.state)
+        streaming.publish(self.task_id, {'type': 'status', **self.state})
+        return self.state
@@ -0,0 +1,136 @@
+# Backend/Apps/AI/result_cache.py
+
+"""
+Memoization of analysis results.
+
+An analysis is identified by a SHA-256 over the canonical JSON of its
+input, the prompt version and the model name. The input includes a marker
+of the user's stored survey and game history, since the analysis reads it,
+so new completions produce a new key instead of a stale result.
+
+Results live in the ``AnalysisCache`` table for ``RESULT_TTL`` and in a
+per-process LRU in front of it for ``FRONT_TTL``, so a repeated request is
+answered without an LLM call or a Celery round-trip.
+"""
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import Counter, OrderedDict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import F, Max
+from django.utils import timezone
+
+from apps.games.models import GameScore
+from apps.surveys.models import SurveyResponse
+from .models import AnalysisCache
+
+logger = logging.getLogger(__name__)
+
+# Bump when prompts or the analysis output format change
+PROMPT_VERSION = '1'
+
+RESULT_TTL = timedelta(days=7)
+FRONT_TTL = 300  # seconds
+MAX_FRONT_ENTRIES = 512
+
+_front = OrderedDict()  # key -> (expires at, result)
+_lock = threading.Lock()
+_counters = Counter()
+
+def model_name():
+    return getattr(settings, 'AI_ANALYSIS_MODEL', 'gpt-4o-mini')
+
+def prompt_version():
+    return getattr(settings, 'AI_PROMPT_VERSION', PROMPT_VERSION)
+
+def history_marker(user_id):
+    """Latest stored survey response change and game score of a user."""
+    if not user_id:
+        return None
+    surveys = SurveyResponse.objects.filter(user_id=user_id).aggregate(latest=Max('updated_at'))
+    games = GameScore.objects.filter(user_id=user_id).aggregate(latest=Max('id'))
+    return [str(surveys['latest']), games['latest']]
+
+def cache_key(data: dict, user_id=None) -> str:
+    payload = {
+        'data': data,
+        'user_id': user_id,
+        'history': history_marker(user_id),
+        'prompt_version': prompt_version(),
+        'model': model_name(),
+    }
+    canonical = json.dumps(payload, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+def _remember(key, result):
+    with _lock:
+        _front[key] = (time.monotonic() + FRONT_TTL, result)
+        _front.move_to_end(key)
+        while len(_front) > MAX_FRONT_ENTRIES:
+            _front.popitem(last=False)
+
+def get(key):
+    """Return the cached ``{'insights', 'charts'}`` for a key, or None."""
+    with _lock:
+        cached = _front.get(key)
+        if cached is not None and cached[0] > time.monotonic():
+            _front.move_to_end(key)
+            _counters['front_hits'] += 1
+            return cached[1]
+        _front.pop(key, None)
+
+    row = AnalysisCache.objects.filter(key=key, expires_at__gt=timezone.now()) \
+        .values('insights', 'charts').first()
+    if row is None:
+        with _lock:
+            _counters['misses'] += 1
+        return None
+
+    AnalysisCache.objects.filter(key=key).update(hit_count=F('hit_count') + 1)
+    with _lock:
+        _counters['table_hits'] += 1
+    _remember(key, row)
+    return row
+
+def put(key, output: dict):
+    """Store an analysis output under a key."""
+    result = {'insights': output.get('insights', {}), 'charts': output.get('charts', {})}
+    AnalysisCache.objects.update_or_create(
+        key=key,
+        defaults={
+            **result,
+            'prompt_version': prompt_version(),
+            'model_name': model_name(),
+            'created_at': timezone.now(),
+            'expires_at': timezone.now() + RESULT_TTL,
+        }
+    )
+    _remember(key, result)
+    return result
+
+def stats() -> dict:
+    """Hit and miss counters of this process."""
+    with _lock:
+        counters = dict(_counters)
+    hits = counters.get('front_hits', 0) + counters.get('table_hits', 0)
+    lookups = hits + counters.get('misses', 0)
+    return {
+        'front_hits': counters.get('front_hits', 0),
+        'table_hits': counters.get('table_hits', 0),
+        'misses': counters.get('misses', 0),
+        'hit_rate': hits / lookups if lookups else None,
+    }
+
+def clear_front():
+    with _lock:
+        _front.clear()
+        _counters.clear()
+
+def purge_expired() -> int:
+    deleted, _ = AnalysisCache.objects.filter(expires_at__lte=timezone.now()).delete()
+    return deleted
@@ -1,48 +1,92 @@
-from django.core.cache import cache
-from django.conf import settings
+# Backend/Apps/AI/services.py
+
+"""
+Collection of completion data for AI analysis.
+
+Each user has one append-only event list per data type (``survey``,
+``game``). A completion is a single atomic list push plus a TTL refresh,
+so appending costs the same however long the history is, and concurrent
+completions cannot overwrite each other. Reads fetch a list range.
+
+The same store carries the analysis stream replay lists and progress
+state. When ``AI_DATA_REDIS_URL`` is not configured an in-process
+stand-in (``LocalRedis``) is used, so the service works offline and in
+tests; it is not shared between processes, so outside ``DEBUG`` the
+``ai.E001`` system check fails and a warning is logged.
+"""
+
 import json
-from datetime import timedelta
+import logging
+
+from django.conf import settings
+
+from mindmodel.core.utils import LocalRedis
+
+logger = logging.getLogger(__name__)
+
+DATA_TYPES = ('survey', 'game')
+
+# Lists expire this long after their last append (seconds)
+EVENT_TTL = 86400  # 24 hours
+
+# Oldest events are dropped beyond this many per user and data type
+MAX_EVENTS = 1000
+
+_client = None
+
+def get_event_store():
+    """Return the shared event store client, creating it on first use."""
+    global _client
+    if _client is None:
+        url = getattr(settings, 'AI_DATA_REDIS_URL', None)
+        if url:
+            import redis
+            _client = redis.Redis.from_url(url, decode_responses=True)
+        else:
+            if not settings.DEBUG:
+                logger.warning(
+                    "AI_DATA_REDIS_URL is not set; analysis events, streams and "
+                    "progress are kept in process memory"
+                )
+            _client = LocalRedis()
+    return _client
+
+def event_key(user_id, data_type):
+    return f"ai:events:{user_id}:{data_type}"
 
 class AIDataService:
     """
     Service to handle data collection and caching for AI analysis.
-    Uses Redis for efficient data storage and retrieval.
+    Uses Redis lists for efficient data storage and retrieval.
     """
-    
+
     @staticmethod
     def cache_completion_data(user_id: int, data_type: str, data: dict):
         """
-        Cache survey or game completion data in Redis.
+        Append survey or game completion data to the user's event list.
         """
-        cache_key = f"user_{user_id}_{data_type}_data"
-        existing_data = cache.get(cache_key, [])
-        
-        if isinstance(existing_data, str):
-            existing_data = json.loads(existing_data)
-        
-        existing_data.append(data)
-        cache.set(
-            cache_key, 
-            json.dumps(existing_data),
-            timeout=86400  # 24 hours
-        )
+        key = event_key(user_id, data_type)
+        pipe = get_event_store().pipeline(transaction=True)
+        pipe.rpush(key, json.dumps(data))
+        pipe.ltrim(key, -MAX_EVENTS, -1)
+        pipe.expire(key, EVENT_TTL)
+        pipe.execute()
 
     @staticmethod
-    def get_user_data(user_id: int) -> dict:
+    def get_user_data(user_id: int, limit: int = None) -> dict:
         """
-        Retrieve all cached user data for AI analysis.
+        Retrieve cached user data for AI analysis, oldest first. With
+        ``limit`` only the most recent events of each type are returned.
         """
-        survey_data = cache.get(f"user_{user_id}_survey_data", [])
-        game_data = cache.get(f"user_{user_id}_game_data", [])
-        
-        if isinstance(survey_data, str):
-            survey_data = json.loads(survey_data)
-        if isinstance(game_data, str):
-            game_data = json.loads(game_data)
-            
+        start = -limit if limit else 0
+        pipe = get_event_store().pipeline(transaction=False)
+        for data_type in DATA_TYPES:
+            pipe.lrange(event_key(user_id, data_type), start, -1)
+        survey_data, game_data = pipe.execute()
+
         return {
-            'survey_data': survey_data,
-            'game_data': game_data
+            'survey_data': [json.loads(event) for event in survey_data],
+            'game_data': [json.loads(event) for event in game_data]
         }
 
     @staticmethod
@@ -50,5 +94,4 @@ class AIDataService:
         """
         Clear cached data after successful analysis.
         """
-        cache.delete(f"user_{user_id}_survey_data")
-        cache.delete(f"user_{user_id}_game_data") 
\ No newline at end of file
+        get_event_store().delete(*(event_key(user_id, data_type) for data_type in DATA_TYPES))
@@ -0,0 +1,109 @@
+# Backend/Apps/AI/streaming.py
+
+"""
+Streaming of analysis progress to ``AnalysisConsumer`` sockets.
+
+Every frame sent to the ``analysis_{task_id}`` group is also appended to a
+per-task replay list in the AI event store. The list length after the push
+is the frame's sequence number, and a socket can resume with every frame
+after the last one it saw. The store must be a Redis shared by the worker
+and the ASGI server (see the ``ai.E001`` check) for numbering to be
+atomic across processes and for replays to see the worker's frames.
+
+Frames are ``{'seq': n, 'type': ...}`` with type ``section`` (one finished
+part of the insights), ``chunk`` (model output text) or ``status``. Model
+output is coalesced into frames at most every ``FRAME_INTERVAL`` seconds so
+token-sized deltas don't flood the channel layer.
+"""
+
+import json
+import time
+
+from asgiref.sync import async_to_sync, sync_to_async
+from channels.layers import get_channel_layer
+
+from .services import get_event_store
+
+FRAME_INTERVAL = 0.1  # seconds
+
+# Replay lists outlive the socket timeout of AnalysisConsumer
+REPLAY_TTL = 3600  # seconds
+
+def group_name(task_id) -> str:
+    return f'analysis_{task_id}'
+
+def replay_key(task_id) -> str:
+    return f"ai:stream:{task_id}"
+
+def _record(task_id, frame) -> int:
+    key = replay_key(task_id)
+    pipe = get_event_store().pipeline(transaction=True)
+    pipe.rpush(key, json.dumps(frame))
+    pipe.expire(key, REPLAY_TTL)
+    length, _ = pipe.execute()
+    return length
+
+def replay(task_id, after: int = 0) -> list:
+    """Frames of a task with a sequence number greater than ``after``."""
+    frames = get_event_store().lrange(replay_key(task_id), max(after, 0), -1)
+    return [{**json.loads(frame), 'seq': after + position + 1} for position, frame in enumerate(frames)]
+
+def broadcast(task_id, data: dict):
+    """
+    Send data to the sockets of a task from synchronous code. Without a
+    configured channel layer there are no sockets to reach, so nothing is
+    sent.
+    """
+    layer = get_channel_layer()
+    if layer is not None:
+        async_to_sync(layer.group_send)(group_name(task_id), {'type': 'analysis_update', 'data': data})
+
+async def abroadcast(task_id, data: dict, layer=None):
+    """``broadcast`` for coroutines."""
+    layer = layer or get_channel_layer()
+    if layer is not None:
+        await layer.group_send(group_name(task_id), {'type': 'analysis_update', 'data': data})
+
+def publish(task_id, frame: dict) -> dict:
+    """Record and broadcast a frame from synchronous code."""
+    frame = {**frame, 'seq': _record(task_id, frame)}
+    broadcast(task_id, frame)
+    return frame
+
+class AnalysisStream:
+    """
+    Async publisher for one analysis. ``text`` buffers model output and
+    sends it once ``FRAME_INTERVAL`` has passed since the last frame;
+    ``section`` and ``status`` flush pending text first so frames stay in
+    order.
+    """
+    def __init__(self, task_id, interval=FRAME_INTERVAL):
+        self.task_id = task_id
+        self.interval = interval
+        self._channel_layer = get_channel_layer()
+        self._pending = []
+        self._last_frame = time.monotonic()
+
+    async def _publish(self, frame):
+        frame = {**frame, 'seq': await sync_to_async(_record, thread_sensitive=False)(self.task_id, frame)}
+        self._last_frame = time.monotonic()
+        await abroadcast(self.task_id, frame, self._channel_layer)
+        return frame
+
+    async def text(self, delta: str):
+        self._pending.append(delta)
+        if time.monotonic() - self._last_frame >= self.interval:
+            await self.flush()
+
+    async def flush(self):
+        if self._pending:
+            text, self._pending = ''.join(self._pending), []
+            await self._publish({'type': 'chunk', 'text': text})
+
+    async def section(self, name: str, data):
+        await self.flush()
+        await self._publish({'type': 'section', 'section': name, 'data': data})
+
+    async def status(self, status: str, **data):
+        await self.flush()
+        await self._publish({'type': 'status', 'status': status, **data})
@@ -1,127 +1,228 @@
 # Backend/Apps/AI/tasks.py
 
+import asyncio
+from datetime import timedelta
 from celery import shared_task
 from celery.utils.log import get_task_logger
-from django.core.cache import cache
-from channels.layers import get_channel_layer
-from asgiref.sync import async_to_sync
-from .models import AnalysisResult
-from .ai_models.cogGPT import perform_analysis
-import json
-from django.db import transaction
+from django.db import connection
+from django.utils import timezone
+from .models import Analysis, AnalysisResult
+from .ai_models.cog_gpt import collect_analysis, perform_analysis, perform_analysis_async
+from .ai_models.runner import AnalysisRunner, is_configured
+from .progress import COLLECT, FINALIZE, PROCESS, ProgressReporter
+from .streaming import AnalysisStream
+from . import result_cache
 from celery.exceptions import SoftTimeLimitExceeded
 
 logger = get_task_logger(__name__)
-channel_layer = get_channel_layer()
-
-def cleanup_analysis(user_id: int) -> None:
-    """Clean up failed analysis data."""
-    cache_key = f"analysis_data_{user_id}"
-    cache.delete(cache_key)
-    
-    # Update any processing analysis to failed
-    AnalysisResult.objects.filter(
-        user_id=user_id,
-        status='PROCESSING'
-    ).update(status='FAILED')
+
+# Status transitions; each is a single conditional UPDATE, so a transition
+# only happens from the expected state and replays are no-ops
+PENDING, PROCESSING, COMPLETED, FAILED = 'pending', 'processing', 'completed', 'failed'
+
+# Hard time limits of the tasks that claim analyses (seconds)
+ANALYSIS_TIME_LIMIT = 300
+BATCH_TIME_LIMIT = 600
+
+# A processing claim older than the longest hard time limit of any claiming
+# task belongs to a dead worker
+STALE_CLAIM_AFTER = timedelta(seconds=max(ANALYSIS_TIME_LIMIT, BATCH_TIME_LIMIT))
+
+def transition(analysis_id: int, from_statuses, to_status: str, **fields) -> bool:
+    """Move an analysis to ``to_status`` if it is in one of ``from_statuses``."""
+    return bool(
+        Analysis.objects.filter(pk=analysis_id, status__in=from_statuses)
+        .update(status=to_status, updated_at=timezone.now(), **fields)
+    )
+
+def claim_analysis(analysis_id: int) -> bool:
+    """Take a pending analysis, or one abandoned by a crashed worker."""
+    if transition(analysis_id, [PENDING], PROCESSING):
+        return True
+    stale = Analysis.objects.filter(
+        pk=analysis_id,
+        status=PROCESSING,
+        updated_at__lt=timezone.now() - STALE_CLAIM_AFTER
+    )
+    return bool(stale.update(updated_at=timezone.now()))
+
+def cleanup_analysis(analysis_id: int, error: str) -> None:
+    """Mark a processing analysis as failed."""
+    transition(analysis_id, [PROCESSING], FAILED, results={'error': error})
+
+async def _stream_analysis(task_id: str, data: dict, collected: dict, progress) -> dict:
+    async with AnalysisRunner() as runner:
+        return await perform_analysis_async(
+            data, runner, stream=AnalysisStream(task_id), progress=progress, analysis_output=collected
+        )
 
 @shared_task(
     bind=True,
     max_retries=3,
     default_retry_delay=60,  # 1 minute between retries
-    time_limit=300,  # 5 minutes max
+    time_limit=ANALYSIS_TIME_LIMIT,  # 5 minutes max
     soft_time_limit=240,  # 4 minutes soft limit
     acks_late=True  # Only acknowledge after successful completion
 )
-def perform_ai_analysis(self, user_id: int, data: dict) -> int:
+def perform_ai_analysis(self, analysis_id: int) -> int:
     """
-    Perform AI analysis asynchronously with enhanced error handling and timeouts.
+    Run an analysis as a series of short, idempotent steps:
+
+    1. pending -> processing, one autocommitted UPDATE
+    2. the model call, outside any transaction and without a held connection,
+       streamed to the ``analysis_{task_id}`` group
+    3. processing -> completed with the results, one autocommitted UPDATE
+
+    Stage progress (collect, process, analyze, finalize) is reported
+    through a ``ProgressReporter``.
+
+    A redelivered or duplicate task finds the analysis already claimed or
+    finished and returns without calling the model again.
     """
-    logger.info(f"Starting analysis for user {user_id}")
-    
+    logger.info(f"Starting analysis {analysis_id}")
+
+    if not claim_analysis(analysis_id):
+        status = Analysis.objects.filter(pk=analysis_id).values_list('status', flat=True).first()
+        logger.info(f"Analysis {analysis_id} is {status}; nothing to do")
+        return analysis_id
+
+    reporter = ProgressReporter(self.request.id, analysis_id=analysis_id)
     try:
-        with transaction.atomic():  # Use transaction for atomicity
-            # Create analysis result record
-            analysis_result = AnalysisResult.objects.create(
-                user_id=user_id,
-                status='PROCESSING',
-                metadata={'task_id': self.request.id}
-            )
-
-            # Cache key with timeout
-            cache_key = f"analysis_data_{user_id}"
-            cache.set(cache_key, json.dumps(data), timeout=3600)  # 1 hour timeout
-
-            try:
-                # Perform analysis with timeout protection
-                analysis_output = perform_analysis(data)
-                
-                # Update result
-                analysis_result.status = 'COMPLETED'
-                analysis_result.insights = analysis_output['insights']
-                analysis_result.charts = analysis_output['charts']
-                analysis_result.save()
-
-                # Send WebSocket notification
-                async_to_sync(channel_layer.group_send)(
-                    f'analysis_{self.request.id}',
-                    {
-                        'type': 'analysis_update',
-                        'data': {
-                            'status': 'completed',
-                            'result_id': analysis_result.id
-                        }
-                    }
-                )
-
-                # Cleanup
-                cache.delete(cache_key)
-                return analysis_result.id
-
-            except Exception as e:
-                logger.error(f"Analysis failed: {str(e)}")
-                analysis_result.status = 'FAILED'
-                analysis_result.metadata = {
-                    'error': str(e),
-                    'task_id': self.request.id
-                }
-                analysis_result.save()
-
-                # Send failure notification
-                async_to_sync(channel_layer.group_send)(
-                    f'analysis_{self.request.id}',
-                    {
-                        'type': 'analysis_update',
-                        'data': {
-                            'status': 'failed',
-                            'error': str(e)
-                        }
-                    }
-                )
-
-                if self.request.retries < self.max_retries:
-                    raise self.retry(exc=e)
-                raise
+        # Everything after the claim runs under the handlers below, so a
+        # failure hands the analysis back or marks it failed
+        analysis = Analysis.objects.only('id', 'user_id', 'data').get(pk=analysis_id)
+        user_id, data = analysis.user_id, analysis.data or {}
+        reporter.context['user_id'] = user_id
+        reporter.update(COLLECT)
+
+        # Identical inputs reuse the stored result instead of a new LLM call
+        result_key = result_cache.cache_key(data, user_id)
+        analysis_output = result_cache.get(result_key)
+        if analysis_output is None:
+            payload = {**data, 'user_id': user_id}
+            reporter.update(PROCESS)
+            # Run the survey and metric queries first, then don't keep a
+            # connection open for the length of the model call
+            collected = collect_analysis(payload)
+            connection.close()
+            if is_configured():
+                # Sections and model output reach the socket as they are produced
+                output = asyncio.run(_stream_analysis(self.request.id, payload, collected, reporter))
+            else:
+                output = perform_analysis(payload, collected)
+            reporter.update(FINALIZE)
+            analysis_output = result_cache.put(result_key, output)
+
+        finished = transition(analysis_id, [PROCESSING], COMPLETED, results=analysis_output)
+        if finished:
+            reporter.finish('completed', result_id=analysis_id)
+        return analysis_id
 
     except SoftTimeLimitExceeded:
-        logger.error("Task timed out")
-        # Clean up and mark as failed
-        cleanup_analysis(user_id)
+        logger.error(f"Analysis {analysis_id} timed out")
+        cleanup_analysis(analysis_id, 'Analysis timed out')
+        reporter.finish('failed', error='Analysis timed out')
         raise
+
     except Exception as e:
-        logger.error(f"Task failed: {str(e)}")
-        cleanup_analysis(user_id)
+        logger.error(f"Analysis {analysis_id} failed: {str(e)}")
+        if self.request.retries < self.max_retries:
+            # Hand the analysis back so the retry can claim it
+            transition(analysis_id, [PROCESSING], PENDING)
+            raise self.retry(exc=e)
+        cleanup_analysis(analysis_id, str(e))
+        reporter.finish('failed', error=str(e))
         raise
 
+async def _run_concurrently(jobs):
+    async with AnalysisRunner() as runner:
+        return await asyncio.gather(
+            *(perform_analysis_async(data, runner, analysis_output=collected) for data, collected in jobs),
+            return_exceptions=True
+        )
+
+def _run_sequentially(jobs):
+    results = []
+    for data, collected in jobs:
+        try:
+            results.append(perform_analysis(data, collected))
+        except Exception as e:
+            results.append(e)
+    return results
+
+@shared_task(
+    bind=True,
+    time_limit=BATCH_TIME_LIMIT,
+    soft_time_limit=540,
+    acks_late=True
+)
+def perform_ai_analyses(self, analysis_ids: list) -> list:
+    """
+    Run several analyses concurrently in this worker over one pooled,
+    rate-limited model client, or one after another through the synchronous
+    client when the pooled one is not configured. Uses the same status
+    transitions as ``perform_ai_analysis``; failed analyses, including all
+    uncached ones when the run itself fails, are marked failed and not
+    retried.
+    """
+    claimed = [analysis_id for analysis_id in analysis_ids if claim_analysis(analysis_id)]
+    rows = Analysis.objects.filter(pk__in=claimed).values_list('id', 'user_id', 'data')
+
+    outputs, pending = {}, []
+    for analysis_id, user_id, data in rows:
+        result_key = result_cache.cache_key(data or {}, user_id)
+        cached = result_cache.get(result_key)
+        if cached is not None:
+            outputs[analysis_id] = cached
+        else:
+            pending.append((analysis_id, result_key, {**(data or {}), 'user_id': user_id}))
+
+    # The survey and metric queries run before the connection is released
+    results, jobs = [None] * len(pending), {}
+    for position, (_, _, data) in enumerate(pending):
+        try:
+            jobs[position] = (data, collect_analysis(data))
+        except Exception as e:
+            results[position] = e
+
+    if jobs:
+        # Don't keep a connection open while waiting on the model
+        connection.close()
+        try:
+            if is_configured():
+                outcomes = asyncio.run(_run_concurrently(list(jobs.values())))
+            else:
+                outcomes = _run_sequentially(list(jobs.values()))
+        except Exception as e:
+            # Claimed analyses must not be left in processing
+            logger.error(f"Analysis batch failed: {str(e)}")
+            outcomes = [e] * len(jobs)
+        for position, output in zip(jobs, outcomes):
+            results[position] = output
+
+    for (analysis_id, result_key, _), output in zip(pending, results):
+        # gather() also returns BaseExceptions such as CancelledError
+        if isinstance(output, BaseException):
+            logger.error(f"Analysis {analysis_id} failed: {str(output)}")
+            cleanup_analysis(analysis_id, str(output))
+        else:
+            outputs[analysis_id] = result_cache.put(result_key, output)
+
+    for analysis_id, output in outputs.items():
+        transition(analysis_id, [PROCESSING], COMPLETED, results=output)
+    logger.info(f"Completed {len(outputs)} of {len(claimed)} claimed analyses")
+    return sorted(outputs)
+
 @shared_task
 def cleanup_old_analyses():
     """
     Periodic task to clean up old analyses and cached data.
     Runs daily to prevent data accumulation.
     """
-    from django.utils import timezone
-    from datetime import timedelta
-    
     # Delete analyses older than 30 days
     threshold = timezone.now() - timedelta(days=30)
     AnalysisResult.objects.filter(created_at__lt=threshold).delete()
+
+    # Drop expired memoized results
+    purged = result_cache.purge_expired()
+    logger.info(f"Purged {purged} expired cached analyses; cache stats {result_cache.stats()}")
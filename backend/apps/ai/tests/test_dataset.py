@@ -0,0 +1,73 @@
+import json
+import pytest
+from apps.ai.ai_models import dataset
+
+def _example(answer='Sure.', **extra):
+    return {'messages': [{'role': 'user', 'content': 'Hi'}, {'role': 'assistant', 'content': answer}], **extra}
+
+@pytest.fixture
+def corpus(tmp_path):
+    lines = [json.dumps(_example(str(number), id=number)) for number in range(5)]
+    lines[1:1] = [
+        'not json',
+        '',
+        json.dumps({'messages': [{'role': 'user', 'content': 'Hi'}]}),
+        json.dumps({'messages': [{'role': 'bot', 'content': 'x'}, {'role': 'assistant', 'content': 'y'}]}),
+    ]
+    path = tmp_path / 'corpus.jsonl'
+    path.write_text('\n'.join(lines) + '\n', encoding='utf-8')
+    return path
+
+class TestValidation:
+    def test_extra_keys_are_dropped(self):
+        messages = dataset.validate_example(
+            {'messages': [{'role': 'user', 'content': 'a', 'name': 'x'}, {'role': 'assistant', 'content': 'b'}]}
+        )
+
+        assert messages == [{'role': 'user', 'content': 'a'}, {'role': 'assistant', 'content': 'b'}]
+
+    @pytest.mark.parametrize('example', [[], {'messages': []}, {'messages': [{'role': 'user', 'content': ' '}]}])
+    def test_invalid_examples(self, example):
+        with pytest.raises(ValueError):
+            dataset.validate_example(example)
+
+    def test_token_limit(self):
+        results = dataset.process_lines([(1, json.dumps(_example('word ' * 400)).encode())], max_tokens=50)
+
+        assert results[0][0] == 'reject' and 'exceeds the limit' in results[0][2]
+
+class TestBuildDataset:
+    @pytest.mark.parametrize('processes', [1, 2])
+    def test_shards_rejects_and_manifest(self, corpus, tmp_path, processes):
+        output = tmp_path / f'out{processes}'
+        report = dataset.build_dataset(corpus, output, shard_size=2, processes=processes, chunk_size=2)
+
+        assert (report.examples, report.rejected, report.lines) == (5, 3, 8)
+        assert [shard.examples for shard in report.shards] == [2, 2, 1]
+        first = [json.loads(line) for line in (output / 'train-00000.jsonl').read_text().splitlines()]
+        assert first == [{'messages': _example('0')['messages']}, {'messages': _example('1')['messages']}]
+
+        rejects = [json.loads(line) for line in (output / 'rejects.jsonl').read_text().splitlines()]
+        assert [reject['line'] for reject in rejects] == [2, 4, 5]
+
+        manifest = json.loads((output / 'manifest.json').read_text())
+        assert manifest['tokens'] == sum(shard['tokens'] for shard in manifest['shards'])
+        assert manifest['shards'][0]['mean_tokens'] == manifest['shards'][0]['tokens'] / 2
+
+    def test_single_shard(self, corpus, tmp_path):
+        report = dataset.build_dataset(corpus, tmp_path / 'out', shard_size=None, processes=1)
+
+        assert [shard.examples for shard in report.shards] == [5]
+
+    def test_undecodable_line_is_rejected(self, tmp_path):
+        path = tmp_path / 'corpus.jsonl'
+        path.write_bytes(
+            json.dumps(_example('é')).encode() + b'\n\xff\xfe\n' + json.dumps(_example()).encode() + b'\n'
+        )
+        output = tmp_path / 'out'
+        report = dataset.build_dataset(path, output, processes=1)
+
+        assert (report.examples, report.rejected) == (2, 1)
+        rejects = [json.loads(line) for line in (output / 'rejects.jsonl').read_text().splitlines()]
+        assert [reject['line'] for reject in rejects] == [2]
+        assert json.loads((output / 'manifest.json').read_text())['examples'] == 2
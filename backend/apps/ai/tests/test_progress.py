@@ -0,0 +1,75 @@
+import asyncio
+import pytest
+from channels.layers import InMemoryChannelLayer
+from apps.ai import progress, services, streaming
+from apps.ai.progress import ANALYZE, COLLECT, FINALIZE, PROCESS, ProgressReporter
+from mindmodel.core.utils import LocalRedis
+
+@pytest.fixture
+def layer(monkeypatch):
+    monkeypatch.setattr(services, '_client', LocalRedis())
+    layer = InMemoryChannelLayer()
+    monkeypatch.setattr(streaming, 'get_channel_layer', lambda: layer)
+    return layer
+
+class TestProgressReporter:
+    def test_stage_spans(self):
+        assert progress.overall_progress(COLLECT, 0) == 0.0
+        assert progress.overall_progress(ANALYZE, 0.5) == 0.6
+        assert progress.overall_progress(FINALIZE, 2) == 1.0
+
+    def test_updates_within_a_stage_are_throttled(self, layer):
+        reporter = ProgressReporter('t1', min_interval=60, analysis_id=7, user_id=3)
+
+        assert reporter.update(COLLECT)['progress'] == 0.0
+        assert reporter.update(COLLECT) is None  # duplicate
+        assert reporter.update(COLLECT, 0.5) is None  # too soon
+        assert reporter.update(PROCESS)['stage'] == PROCESS  # new stages always go out
+        assert reporter.update(COLLECT, 1.0) is None  # never backwards
+        assert progress.get_state('t1') == {
+            'analysis_id': 7, 'user_id': 3, 'status': 'processing', 'stage': PROCESS, 'progress': 0.2,
+        }
+
+    def test_small_steps_are_dropped(self, layer):
+        reporter = ProgressReporter('t2', min_interval=0, min_step=0.05)
+        reporter.update(ANALYZE, 0.0)
+
+        assert reporter.update(ANALYZE, 0.05) is None
+        assert reporter.update(ANALYZE, 0.2)['progress'] == 0.48
+
+    def test_frames_and_final_status(self, layer):
+        async def listen():
+            channel = await layer.new_channel()
+            await layer.group_add(streaming.group_name('t3'), channel)
+            return channel
+
+        channel = asyncio.run(listen())
+        reporter = ProgressReporter('t3', user_id=3)
+        reporter.update(COLLECT)
+        asyncio.run(reporter.aupdate(ANALYZE, 0.5))
+        reporter.finish('completed', result_id=9)
+
+        async def drain():
+            return [(await layer.receive(channel))['data'] for _ in range(3)]
+
+        frames = asyncio.run(drain())
+        assert [(frame['type'], frame.get('stage'), frame['progress']) for frame in frames] == [
+            ('progress', COLLECT, 0.0), ('progress', ANALYZE, 0.6), ('status', FINALIZE, 1.0),
+        ]
+        assert progress.get_state('t3')['status'] == 'completed'
+        # Only the final status is kept for replay
+        assert [frame['type'] for frame in streaming.replay('t3')] == ['status']
+
+    def test_pending_state(self, layer):
+        progress.set_pending('t4', analysis_id=1, user_id=2)
+
+        assert progress.get_state('t4')['status'] == 'pending'
+
+    def test_without_a_channel_layer(self, monkeypatch):
+        monkeypatch.setattr(services, '_client', LocalRedis())
+        monkeypatch.setattr(streaming, 'get_channel_layer', lambda: None)
+        reporter = ProgressReporter('t5')
+
+        assert reporter.update(COLLECT)['stage'] == COLLECT
+        reporter.finish('completed')
+        assert progress.get_state('t5')['status'] == 'completed'
@@ -0,0 +1,40 @@
+import pytest
+from apps.ai import result_cache
+
+@pytest.fixture(autouse=True)
+def front_cache():
+    result_cache.clear_front()
+    yield
+    result_cache.clear_front()
+
+class TestResultCacheKey:
+    def test_key_ignores_ordering(self):
+        first = {'survey_data': [{'survey': 1}], 'game_data': [{'game_id': 2, 'score': 5}]}
+        second = {'game_data': [{'score': 5, 'game_id': 2}], 'survey_data': [{'survey': 1}]}
+
+        assert result_cache.cache_key(first) == result_cache.cache_key(second)
+
+    def test_key_depends_on_input_prompt_and_model(self, settings):
+        data = {'game_data': [{'game_id': 2, 'score': 5}]}
+        key = result_cache.cache_key(data)
+
+        assert result_cache.cache_key({'game_data': [{'game_id': 2, 'score': 6}]}) != key
+        settings.AI_PROMPT_VERSION = '2'
+        assert result_cache.cache_key(data) != key
+        settings.AI_PROMPT_VERSION = result_cache.PROMPT_VERSION
+        settings.AI_ANALYSIS_MODEL = 'another-model'
+        assert result_cache.cache_key(data) != key
+
+class TestFrontCache:
+    def test_front_hits_are_counted(self):
+        result_cache._remember('abc', {'insights': {'overall': {}}, 'charts': {}})
+
+        assert result_cache.get('abc') == {'insights': {'overall': {}}, 'charts': {}}
+        assert result_cache.stats() == {'front_hits': 1, 'table_hits': 0, 'misses': 0, 'hit_rate': 1.0}
+
+    def test_front_cache_is_bounded(self, monkeypatch):
+        monkeypatch.setattr(result_cache, 'MAX_FRONT_ENTRIES', 2)
+        for key in ('a', 'b', 'c'):
+            result_cache._remember(key, {})
+
+        assert list(result_cache._front) == ['b', 'c']
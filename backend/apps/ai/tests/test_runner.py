@@ -0,0 +1,79 @@
+import asyncio
+import json
+import time
+from apps.ai.ai_models.fake_llm import FakeLLMServer
+from apps.ai.ai_models.runner import TokenBucket, estimate_tokens
+
+async def _post(reader, writer, body):
+    data = json.dumps(body).encode()
+    writer.write(
+        b"POST /v1/chat/completions HTTP/1.1\r\nHost: test\r\n"
+        b"Content-Type: application/json\r\nContent-Length: " + str(len(data)).encode() + b"\r\n\r\n" + data
+    )
+    await writer.drain()
+    status = await reader.readline()
+    headers = {}
+    while (line := await reader.readline()) != b'\r\n':
+        name, _, value = line.decode().partition(':')
+        headers[name.lower()] = value.strip()
+    return status, json.loads(await reader.readexactly(int(headers['content-length'])))
+
+class TestTokenBucket:
+    def test_burst_then_rate(self):
+        async def run():
+            bucket = TokenBucket(rate=50, capacity=5)
+            started = time.monotonic()
+            for _ in range(10):
+                await bucket.acquire()
+            return time.monotonic() - started
+
+        # 5 from the full bucket, 5 more at 50/s
+        assert 0.08 <= asyncio.run(run()) < 0.5
+
+    def test_oversized_request_drains_bucket(self):
+        async def run():
+            bucket = TokenBucket(rate=1000, capacity=10)
+            await bucket.acquire(50)
+            return bucket._tokens
+
+        assert asyncio.run(run()) < 1
+
+    def test_estimate_tokens(self):
+        assert estimate_tokens([{'content': 'x' * 400}, {'content': None}], 100) == 200
+
+class TestFakeLLMServer:
+    def test_keep_alive_completions(self):
+        async def run():
+            async with FakeLLMServer(port=0, latency=0) as server:
+                reader, writer = await asyncio.open_connection(server.host, server.port)
+                first = await _post(reader, writer, {'model': 'm', 'messages': [{'role': 'user', 'content': 'hi'}]})
+                second = await _post(reader, writer, {'model': 'm', 'messages': []})
+                writer.close()
+                return server.requests, first, second
+
+        requests, (status, body), (second_status, _) = asyncio.run(run())
+
+        assert requests == 2
+        assert status.startswith(b'HTTP/1.1 200') and second_status.startswith(b'HTTP/1.1 200')
+        assert body['object'] == 'chat.completion'
+        assert json.loads(body['choices'][0]['message']['content'])['summary']
+
+    def test_streamed_completion(self):
+        async def run():
+            async with FakeLLMServer(port=0, latency=0, token_interval=0) as server:
+                reader, writer = await asyncio.open_connection(server.host, server.port)
+                data = json.dumps({'model': 'm', 'messages': [], 'stream': True}).encode()
+                writer.write(
+                    b"POST /v1/chat/completions HTTP/1.1\r\nContent-Length: "
+                    + str(len(data)).encode() + b"\r\n\r\n" + data
+                )
+                body = await reader.readuntil(b"0\r\n\r\n")
+                writer.close()
+                return server.reply, body.decode()
+
+        reply, body = asyncio.run(run())
+        events = [line[6:] for line in body.splitlines() if line.startswith('data: ')]
+
+        assert events[-1] == '[DONE]'
+        text = ''.join(json.loads(event)['choices'][0]['delta'].get('content', '') for event in events[:-1])
+        assert text == reply
@@ -0,0 +1,66 @@
+import threading
+import pytest
+from apps.ai import checks, services
+from apps.ai.services import AIDataService
+from mindmodel.core.utils import LocalRedis
+
+@pytest.fixture
+def store(monkeypatch):
+    store = LocalRedis()
+    monkeypatch.setattr(services, '_client', store)
+    return store
+
+class TestAIDataService:
+    def test_events_are_appended_and_read_in_order(self, store):
+        AIDataService.cache_completion_data(1, 'game', {'score': 10})
+        AIDataService.cache_completion_data(1, 'game', {'score': 20})
+        AIDataService.cache_completion_data(1, 'survey', {'survey_id': 3})
+
+        data = AIDataService.get_user_data(1)
+
+        assert data == {'survey_data': [{'survey_id': 3}], 'game_data': [{'score': 10}, {'score': 20}]}
+        assert AIDataService.get_user_data(1, limit=1)['game_data'] == [{'score': 20}]
+        assert AIDataService.get_user_data(2) == {'survey_data': [], 'game_data': []}
+
+    def test_history_is_capped(self, store, monkeypatch):
+        monkeypatch.setattr(services, 'MAX_EVENTS', 3)
+        for score in range(5):
+            AIDataService.cache_completion_data(1, 'game', {'score': score})
+
+        assert [event['score'] for event in AIDataService.get_user_data(1)['game_data']] == [2, 3, 4]
+
+    def test_concurrent_appends_are_not_lost(self, store):
+        def complete(offset):
+            for score in range(200):
+                AIDataService.cache_completion_data(1, 'game', {'score': offset + score})
+
+        threads = [threading.Thread(target=complete, args=(offset * 1000,)) for offset in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(AIDataService.get_user_data(1)['game_data']) == 800
+
+    def test_clear_and_expiry(self, store):
+        AIDataService.cache_completion_data(1, 'game', {'score': 1})
+        AIDataService.clear_user_cache(1)
+        assert AIDataService.get_user_data(1)['game_data'] == []
+
+        AIDataService.cache_completion_data(1, 'game', {'score': 1})
+        store.expire(services.event_key(1, 'game'), -1)
+        assert AIDataService.get_user_data(1)['game_data'] == []
+
+class TestEventStoreCheck:
+    def test_redis_is_required_outside_debug(self, settings):
+        settings.DEBUG = False
+        settings.AI_DATA_REDIS_URL = None
+        assert [error.id for error in checks.check_event_store(None)] == ['ai.E001']
+
+        settings.AI_DATA_REDIS_URL = 'redis://localhost:6379/2'
+        assert checks.check_event_store(None) == []
+
+    def test_local_store_is_allowed_in_debug(self, settings):
+        settings.DEBUG = True
+        settings.AI_DATA_REDIS_URL = None
+        assert checks.check_event_store(None) == []
@@ -0,0 +1,62 @@
+import asyncio
+import pytest
+from channels.layers import InMemoryChannelLayer
+from apps.ai import services, streaming
+from mindmodel.core.utils import LocalRedis
+
+@pytest.fixture
+def layer(monkeypatch):
+    monkeypatch.setattr(services, '_client', LocalRedis())
+    layer = InMemoryChannelLayer()
+    monkeypatch.setattr(streaming, 'get_channel_layer', lambda: layer)
+    return layer
+
+async def _received(layer, channel):
+    frames = []
+    while True:
+        try:
+            message = await asyncio.wait_for(layer.receive(channel), 0.05)
+        except asyncio.TimeoutError:
+            return frames
+        frames.append(message['data'])
+
+class TestAnalysisStream:
+    def test_text_is_coalesced_and_numbered(self, layer):
+        async def run():
+            channel = await layer.new_channel()
+            await layer.group_add(streaming.group_name('t1'), channel)
+            stream = streaming.AnalysisStream('t1', interval=60)
+            await stream.section('games', {'summary': 'ok'})
+            for delta in ('{"sum', 'mary"', ': "x"}'):
+                await stream.text(delta)
+            await stream.status('completed', result_id=4)
+            return await _received(layer, channel)
+
+        frames = asyncio.run(run())
+
+        assert frames == [
+            {'type': 'section', 'section': 'games', 'data': {'summary': 'ok'}, 'seq': 1},
+            {'type': 'chunk', 'text': '{"summary": "x"}', 'seq': 2},
+            {'type': 'status', 'status': 'completed', 'result_id': 4, 'seq': 3},
+        ]
+
+    def test_zero_interval_sends_every_delta(self, layer):
+        async def run():
+            stream = streaming.AnalysisStream('t2', interval=0)
+            for delta in ('a', 'b'):
+                await stream.text(delta)
+
+        asyncio.run(run())
+
+        assert [frame['text'] for frame in streaming.replay('t2')] == ['a', 'b']
+
+class TestReplay:
+    def test_resume_after_sequence(self, layer):
+        for position in range(4):
+            streaming.publish('t3', {'type': 'chunk', 'text': str(position)})
+
+        frames = streaming.replay('t3', after=2)
+
+        assert [(frame['seq'], frame['text']) for frame in frames] == [(3, '2'), (4, '3')]
+        assert streaming.replay('t3', after=4) == []
+        assert streaming.replay('missing') == []
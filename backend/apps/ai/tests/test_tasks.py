@@ -0,0 +1,208 @@
+import asyncio
+from datetime import timedelta
+
+import pytest
+from celery.exceptions import Retry
+from django.db import connection
+from django.utils import timezone
+from apps.ai import progress, result_cache, services, streaming, tasks
+from apps.ai.models import Analysis
+from mindmodel.core.utils import LocalRedis
+
+# The task closes its connection before the model call
+pytestmark = pytest.mark.django_db(transaction=True)
+
+OUTPUT = {'insights': {'overall': {'summary': 'Steady'}}, 'charts': {}}
+
+@pytest.fixture(autouse=True)
+def offline(monkeypatch):
+    monkeypatch.setattr(services, '_client', LocalRedis())
+    monkeypatch.setattr(tasks, 'is_configured', lambda: False)
+    result_cache.clear_front()
+    yield
+    result_cache.clear_front()
+
+@pytest.fixture
+def model_calls(monkeypatch):
+    calls = []
+
+    def perform_analysis(data, analysis_output=None):
+        calls.append(data)
+        return OUTPUT
+    monkeypatch.setattr(tasks, 'perform_analysis', perform_analysis)
+    return calls
+
+@pytest.fixture
+def analysis(test_user):
+    return Analysis.objects.create(user=test_user, data={'game_data': [{'game_id': 1, 'score': 5}]})
+
+@pytest.fixture
+def failing_model(monkeypatch):
+    calls = []
+
+    def perform_analysis(data, analysis_output=None):
+        calls.append(data)
+        raise RuntimeError('model unavailable')
+    monkeypatch.setattr(tasks, 'perform_analysis', perform_analysis)
+    return calls
+
+def set_status(analysis, status, age=None):
+    updated_at = timezone.now() - age if age is not None else timezone.now()
+    Analysis.objects.filter(pk=analysis.pk).update(status=status, updated_at=updated_at)
+
+def run(analysis, **options):
+    return tasks.perform_ai_analysis.apply(args=[analysis.id], task_id='task-1', **options)
+
+class TestPerformAIAnalysis:
+    def test_runs_end_to_end_without_a_channel_layer(self, analysis, model_calls):
+        # The repo configures no CHANNEL_LAYERS; progress must not need one
+        result = run(analysis)
+
+        assert result.successful()
+        analysis.refresh_from_db()
+        assert analysis.status == tasks.COMPLETED
+        assert analysis.results == OUTPUT
+        assert len(model_calls) == 1
+        assert progress.get_state('task-1')['status'] == 'completed'
+        assert [frame['type'] for frame in streaming.replay('task-1')] == ['status']
+
+    def test_queries_run_before_the_connection_is_released(self, analysis, monkeypatch):
+        seen = []
+
+        def perform_analysis(data, analysis_output=None):
+            seen.append((connection.connection is None, analysis_output))
+            return OUTPUT
+        monkeypatch.setattr(tasks, 'perform_analysis', perform_analysis)
+
+        assert run(analysis).successful()
+        [(closed, collected)] = seen
+        assert closed
+        assert set(collected['insights']) == {'games'}
+
+    @pytest.mark.parametrize('status', [tasks.COMPLETED, tasks.FAILED])
+    def test_duplicate_delivery_of_a_finished_analysis_is_a_no_op(self, analysis, model_calls, status):
+        set_status(analysis, status)
+
+        assert run(analysis).successful()
+        analysis.refresh_from_db()
+        assert analysis.status == status
+        assert model_calls == []
+
+    def test_duplicate_delivery_during_a_live_claim_is_a_no_op(self, analysis, model_calls):
+        set_status(analysis, tasks.PROCESSING)
+
+        assert run(analysis).successful()
+        analysis.refresh_from_db()
+        assert analysis.status == tasks.PROCESSING
+        assert model_calls == []
+
+    def test_stale_claim_is_taken_over(self, analysis, model_calls):
+        # The worker holding the claim died past the hard time limit
+        set_status(analysis, tasks.PROCESSING, age=tasks.STALE_CLAIM_AFTER * 2)
+
+        assert run(analysis).successful()
+        analysis.refresh_from_db()
+        assert analysis.status == tasks.COMPLETED
+        assert len(model_calls) == 1
+
+    def test_claim_within_the_batch_time_limit_is_not_stale(self, analysis, model_calls):
+        # A batch may still be working on it after a single task's limit
+        set_status(analysis, tasks.PROCESSING, age=timedelta(seconds=tasks.ANALYSIS_TIME_LIMIT + 60))
+
+        assert run(analysis).successful()
+        analysis.refresh_from_db()
+        assert analysis.status == tasks.PROCESSING
+        assert model_calls == []
+
+    def test_retry_hands_the_analysis_back_to_pending(self, analysis, failing_model, monkeypatch):
+        def retry(exc=None, **options):
+            raise Retry(exc=exc)
+        monkeypatch.setattr(tasks.perform_ai_analysis, 'retry', retry)
+
+        assert not run(analysis).successful()
+        analysis.refresh_from_db()
+        assert analysis.status == tasks.PENDING
+        assert len(failing_model) == 1
+
+        # The retry can claim it again
+        assert tasks.claim_analysis(analysis.id)
+
+    def test_last_retry_marks_the_analysis_failed(self, analysis, failing_model):
+        result = run(analysis, retries=tasks.perform_ai_analysis.max_retries)
+
+        assert result.failed()
+        analysis.refresh_from_db()
+        assert analysis.status == tasks.FAILED
+        assert analysis.results == {'error': 'model unavailable'}
+        assert len(failing_model) == 1
+        state = progress.get_state('task-1')
+        assert state['status'] == 'failed'
+        assert state['error'] == 'model unavailable'
+
+    def test_eager_retries_end_in_failed(self, analysis, failing_model):
+        # Each retry re-claims the analysis handed back by the previous attempt
+        result = run(analysis)
+
+        assert result.failed()
+        analysis.refresh_from_db()
+        assert analysis.status == tasks.FAILED
+        assert len(failing_model) == tasks.perform_ai_analysis.max_retries + 1
+
+class TestPerformAIAnalyses:
+    @pytest.fixture
+    def analyses(self, test_user):
+        return [
+            Analysis.objects.create(user=test_user, data={'game_data': [{'game_id': game_id, 'score': 5}]})
+            for game_id in (1, 2)
+        ]
+
+    def cache(self, analysis):
+        result_cache.put(result_cache.cache_key(analysis.data, analysis.user_id), OUTPUT)
+
+    def statuses(self, analyses):
+        return [Analysis.objects.get(pk=analysis.pk).status for analysis in analyses]
+
+    def run(self, analyses):
+        return tasks.perform_ai_analyses.apply(args=[[analysis.id for analysis in analyses]])
+
+    def test_uses_the_synchronous_client_when_not_configured(self, analyses, model_calls):
+        result = self.run(analyses)
+
+        assert result.get() == sorted(analysis.id for analysis in analyses)
+        assert self.statuses(analyses) == [tasks.COMPLETED] * 2
+        assert len(model_calls) == 2
+
+    def test_cached_batch_does_not_start_the_runner(self, analyses, monkeypatch):
+        for analysis in analyses:
+            self.cache(analysis)
+        monkeypatch.setattr(tasks, 'is_configured', lambda: True)
+        monkeypatch.setattr(tasks, 'AnalysisRunner', None)
+
+        assert self.run(analyses).successful()
+        assert self.statuses(analyses) == [tasks.COMPLETED] * 2
+
+    def test_failed_run_fails_the_uncached_analyses(self, analyses, monkeypatch):
+        cached, uncached = analyses
+        self.cache(cached)
+
+        async def run_concurrently(jobs):
+            raise ImportError("No module named 'httpx'")
+        monkeypatch.setattr(tasks, 'is_configured', lambda: True)
+        monkeypatch.setattr(tasks, '_run_concurrently', run_concurrently)
+
+        assert self.run(analyses).get() == [cached.id]
+        assert self.statuses(analyses) == [tasks.COMPLETED, tasks.FAILED]
+        uncached.refresh_from_db()
+        assert uncached.results == {'error': "No module named 'httpx'"}
+
+    def test_cancelled_analysis_is_marked_failed(self, analyses, monkeypatch):
+        async def run_concurrently(jobs):
+            return [
+                asyncio.CancelledError() if data['game_data'][0]['game_id'] == 2 else OUTPUT
+                for data, _ in jobs
+            ]
+        monkeypatch.setattr(tasks, 'is_configured', lambda: True)
+        monkeypatch.setattr(tasks, '_run_concurrently', run_concurrently)
+
+        assert self.run(analyses).get() == [analyses[0].id]
+        assert self.statuses(analyses) == [tasks.COMPLETED, tasks.FAILED]
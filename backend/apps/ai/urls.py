@@ -1,11 +1,12 @@
 # Backend/Apps/AI/urls.py
 
 from django.urls import path
-from .views import AggregateDataView, AnalysisView
+from .views import AggregateDataView, AnalysisView, AnalysisProgressView
 
 app_name = 'ai'
 
 urlpatterns = [
     path('aggregate/', AggregateDataView.as_view(), name='aggregate-data'),
     path('analysis/<int:pk>/', AnalysisView.as_view(), name='analysis-detail'),
+    path('tasks/<str:task_id>/progress/', AnalysisProgressView.as_view(), name='analysis-progress'),
 ]
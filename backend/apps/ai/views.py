@@ -1,10 +1,14 @@
 # Backend/Apps/AI/views.py
 
+import uuid
+from django.db import transaction
 from rest_framework import generics, status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from .models import Analysis
 from .serializers import AnalysisSerializer, AggregateDataSerializer
+from .tasks import perform_ai_analysis
+from . import progress, result_cache
 from django.db.models import Avg, Count
 
 class AggregateDataView(generics.GenericAPIView):
@@ -17,16 +21,39 @@ class AggregateDataView(generics.GenericAPIView):
     def post(self, request):
         serializer = self.get_serializer(data=request.data)
         if serializer.is_valid():
+            data = serializer.validated_data
+
+            # Identical inputs are answered from the result cache without queueing a task
+            cached = result_cache.get(result_cache.cache_key(data, request.user.id))
+            if cached is not None:
+                analysis = Analysis.objects.create(
+                    user=request.user,
+                    data=data,
+                    results=cached,
+                    status='completed'
+                )
+                return Response({
+                    'analysis_id': analysis.id,
+                    'status': 'completed',
+                    'results': cached
+                }, status=status.HTTP_200_OK)
+
             # Process data and create analysis
             analysis = Analysis.objects.create(
                 user=request.user,
-                data=serializer.validated_data,
-                status='processing'
+                data=data,
+                status='pending'
+            )
+            # The task id doubles as the WebSocket channel of the analysis
+            task_id = str(uuid.uuid4())
+            progress.set_pending(task_id, analysis_id=analysis.id, user_id=request.user.id)
+            transaction.on_commit(
+                lambda: perform_ai_analysis.apply_async((analysis.id,), task_id=task_id)
             )
-            # Trigger async analysis task here
             return Response({
                 'analysis_id': analysis.id,
-                'status': 'processing'
+                'task_id': task_id,
+                'status': 'pending'
             }, status=status.HTTP_202_ACCEPTED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -39,4 +66,17 @@ class AnalysisView(generics.RetrieveAPIView):
     queryset = Analysis.objects.all()
 
     def get_queryset(self):
-        return Analysis.objects.filter(user=self.request.user)
\ No newline at end of file
+        return Analysis.objects.filter(user=self.request.user)
+
+class AnalysisProgressView(generics.GenericAPIView):
+    """
+    Latest stage and progress of an analysis task, for clients polling
+    instead of holding a WebSocket.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, task_id):
+        state = progress.get_state(task_id)
+        if state is None or state.get('user_id') != request.user.id:
+            return Response({'detail': 'Not found.'}, status=status.HTTP_404_NOT_FOUND)
+        return Response(state)
@@ -0,0 +1,142 @@
+# Backend/Apps/Games/exports.py
+
+"""
+Streaming export of game scores.
+
+Rows are read with ``QuerySet.iterator()`` (a server-side cursor on
+PostgreSQL) and encoded one at a time as NDJSON or CSV, optionally gzipped,
+so memory use stays flat regardless of table size.
+"""
+
+import csv
+import io
+import json
+import zlib
+from datetime import datetime, time
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from .models import GameScore
+
+FORMAT_NDJSON = 'ndjson'
+FORMAT_CSV = 'csv'
+FORMATS = (FORMAT_NDJSON, FORMAT_CSV)
+
+CONTENT_TYPES = {
+    FORMAT_NDJSON: 'application/x-ndjson',
+    FORMAT_CSV: 'text/csv',
+}
+
+EXPORT_FIELDS = [
+    'id', 'user_id', 'game_id', 'score', 'completion_time',
+    'completed', 'played_at', 'metadata',
+]
+
+# Rows fetched per cursor round trip
+CHUNK_SIZE = 2000
+
+# Encoded output is buffered to roughly this many bytes before being yielded
+BUFFER_SIZE = 64 * 1024
+
+def parse_moment(value, end_of_day=False):
+    """
+    Parse an ISO date or datetime filter value into an aware datetime.
+    Bare dates resolve to the start of the day, or its end for upper bounds.
+    Returns None for empty values and raises ValueError for invalid ones.
+    """
+    if not value:
+        return None
+    moment = parse_datetime(value)
+    if moment is None:
+        day = parse_date(value)
+        if day is None:
+            raise ValueError(f"Invalid date: {value}")
+        moment = datetime.combine(day, time.max if end_of_day else time.min)
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment
+
+def export_queryset(game_ids=None, since=None, until=None, completed=None):
+    """Build the filtered score queryset to export, in primary key order."""
+    queryset = GameScore.objects.all()
+    if game_ids:
+        queryset = queryset.filter(game_id__in=game_ids)
+    if since is not None:
+        queryset = queryset.filter(played_at__gte=since)
+    if until is not None:
+        queryset = queryset.filter(played_at__lte=until)
+    if completed is not None:
+        queryset = queryset.filter(completed=completed)
+    return queryset.order_by('id').values_list(*EXPORT_FIELDS)
+
+def _rows(queryset, chunk_size):
+    for values in queryset.iterator(chunk_size=chunk_size):
+        row = dict(zip(EXPORT_FIELDS, values))
+        if row['completion_time'] is not None:
+            row['completion_time'] = row['completion_time'].total_seconds()
+        yield row
+
+def iter_ndjson(queryset, chunk_size=CHUNK_SIZE):
+    """Yield one JSON document per line."""
+    encoder = DjangoJSONEncoder(separators=(',', ':'))
+    for row in _rows(queryset, chunk_size):
+        yield encoder.encode(row) + '\n'
+
+def iter_csv(queryset, chunk_size=CHUNK_SIZE):
+    """Yield a header line followed by one CSV line per row."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def line(values):
+        writer.writerow(values)
+        text = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        return text
+
+    yield line(EXPORT_FIELDS)
+    for row in _rows(queryset, chunk_size):
+        if row['metadata'] is not None:
+            row['metadata'] = json.dumps(row['metadata'], cls=DjangoJSONEncoder)
+        if row['played_at'] is not None:
+            row['played_at'] = row['played_at'].isoformat()
+        yield line([row[field] for field in EXPORT_FIELDS])
+
+def encode(lines, compress=False, buffer_size=BUFFER_SIZE):
+    """
+    Encode text lines to bytes, batching small writes into buffer_size
+    chunks and optionally gzip-compressing the stream on the fly.
+    """
+    compressor = zlib.compressobj(wbits=31) if compress else None
+    pending = []
+    pending_size = 0
+
+    def flush():
+        data = b''.join(pending)
+        pending.clear()
+        return compressor.compress(data) if compressor else data
+
+    for text in lines:
+        data = text.encode('utf-8')
+        pending.append(data)
+        pending_size += len(data)
+        if pending_size >= buffer_size:
+            pending_size = 0
+            chunk = flush()
+            if chunk:
+                yield chunk
+
+    chunk = flush()
+    if compressor:
+        chunk += compressor.flush()
+    if chunk:
+        yield chunk
+
+def stream_export(queryset, fmt=FORMAT_NDJSON, compress=False, chunk_size=CHUNK_SIZE):
+    """Return an iterator of encoded byte chunks for a score queryset."""
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown export format: {fmt}")
+    lines = iter_csv(queryset, chunk_size) if fmt == FORMAT_CSV else iter_ndjson(queryset, chunk_size)
+    return encode(lines, compress=compress)
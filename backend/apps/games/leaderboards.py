@@ -0,0 +1,190 @@
+# Backend/Apps/Games/leaderboards.py
+
+"""
+Sorted-set leaderboards for games.
+
+Each game keeps one sorted set of best scores per user for all time, plus
+optional daily and weekly windows. Sets are updated when completed scores
+are recorded and can be rebuilt from the database at any time.
+
+When ``LEADERBOARD_REDIS_URL`` is not configured an in-process stand-in
+(``LocalRedis``) is used, so the feature works offline and in tests. Each
+process then has its own leaderboards, so a warning is logged outside
+``DEBUG``.
+"""
+
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Max
+from django.utils import timezone
+
+from mindmodel.core.utils import LocalRedis
+
+from .models import GameScore
+
+logger = logging.getLogger(__name__)
+
+WINDOW_ALL = 'all'
+WINDOW_DAILY = 'daily'
+WINDOW_WEEKLY = 'weekly'
+WINDOWS = (WINDOW_ALL, WINDOW_DAILY, WINDOW_WEEKLY)
+
+# How long windowed sets are kept after they were last written (seconds)
+WINDOW_TTL = {
+    WINDOW_DAILY: 2 * 86400,     # 2 days
+    WINDOW_WEEKLY: 14 * 86400,   # 2 weeks
+}
+
+_client = None
+
+def get_redis():
+    """Return the shared leaderboard client, creating it on first use."""
+    global _client
+    if _client is None:
+        url = getattr(settings, 'LEADERBOARD_REDIS_URL', None)
+        if url:
+            import redis
+            _client = redis.Redis.from_url(url, decode_responses=True)
+        else:
+            if not settings.DEBUG:
+                logger.warning(
+                    "LEADERBOARD_REDIS_URL is not set; leaderboards are kept in "
+                    "process memory and differ between workers"
+                )
+            _client = LocalRedis()
+    return _client
+
+def window_key(game_id, window=WINDOW_ALL, when=None):
+    """Build the sorted-set key for a game and window at a point in time."""
+    if window == WINDOW_ALL:
+        return f"leaderboard:game:{game_id}:all"
+
+    day = timezone.localtime(when or timezone.now()).date()
+    if window == WINDOW_DAILY:
+        return f"leaderboard:game:{game_id}:daily:{day.isoformat()}"
+    if window == WINDOW_WEEKLY:
+        year, week, _ = day.isocalendar()
+        return f"leaderboard:game:{game_id}:weekly:{year}-W{week:02d}"
+    raise ValueError(f"Unknown leaderboard window: {window}")
+
+def record_scores(scores):
+    """
+    Add completed scores to every leaderboard window they belong to.
+    Only a user's best score is kept in each set.
+    """
+    client = get_redis()
+    pipe = client.pipeline(transaction=False)
+    for score in scores:
+        member = {str(score.user_id): score.score}
+        pipe.zadd(window_key(score.game_id, WINDOW_ALL), member, gt=True)
+        for window, ttl in WINDOW_TTL.items():
+            key = window_key(score.game_id, window, score.played_at)
+            pipe.zadd(key, member, gt=True)
+            pipe.expire(key, ttl)
+    pipe.execute()
+
+def _entries(rows, offset):
+    return [
+        {'rank': offset + position + 1, 'user_id': int(member), 'score': int(score)}
+        for position, (member, score) in enumerate(rows)
+    ]
+
+def top(game_id, limit=10, window=WINDOW_ALL):
+    """Return the top ``limit`` entries of a leaderboard."""
+    rows = get_redis().zrevrange(window_key(game_id, window), 0, limit - 1, withscores=True)
+    return _entries(rows, 0)
+
+def rank(game_id, user_id, window=WINDOW_ALL):
+    """Return a user's 1-based rank and best score, or None if unranked."""
+    client = get_redis()
+    key = window_key(game_id, window)
+    position = client.zrevrank(key, str(user_id))
+    if position is None:
+        return None
+    return {
+        'rank': position + 1,
+        'user_id': int(user_id),
+        'score': int(client.zscore(key, str(user_id))),
+        'total': client.zcard(key),
+    }
+
+def around(game_id, user_id, radius=5, window=WINDOW_ALL):
+    """Return the entries within ``radius`` places of a user, or None if unranked."""
+    client = get_redis()
+    key = window_key(game_id, window)
+    position = client.zrevrank(key, str(user_id))
+    if position is None:
+        return None
+    start = max(position - radius, 0)
+    rows = client.zrevrange(key, start, position + radius, withscores=True)
+    return _entries(rows, start)
+
+def rebuild(game_ids=None, chunk_size=5000):
+    """
+    Repopulate leaderboards from completed ``GameScore`` rows.
+
+    Each set is built under a temporary key and swapped in with RENAME so
+    readers never see a partially built leaderboard. Current sets of games
+    that no longer have qualifying rows are deleted. Returns the number of
+    sets written.
+    """
+    client = get_redis()
+    now = timezone.now()
+    today = timezone.localtime(now).date()
+    window_starts = {
+        WINDOW_ALL: None,
+        WINDOW_DAILY: today,
+        WINDOW_WEEKLY: today - timedelta(days=today.weekday()),
+    }
+
+    queryset = GameScore.objects.filter(completed=True)
+    if game_ids is not None:
+        queryset = queryset.filter(game_id__in=game_ids)
+
+    written = 0
+    for window, start in window_starts.items():
+        rows = queryset
+        if start is not None:
+            rows = rows.filter(played_at__date__gte=start)
+        rows = (
+            rows.values('game_id', 'user_id')
+            .annotate(best=Max('score'))
+            .order_by('game_id')
+        )
+
+        pending = {}
+        buffered = {}
+        for row in rows.iterator(chunk_size=chunk_size):
+            tmp_key = f"{window_key(row['game_id'], window, now)}:rebuild"
+            if tmp_key not in pending:
+                client.delete(tmp_key)
+                pending[tmp_key] = row['game_id']
+                buffered[tmp_key] = {}
+            buffered[tmp_key][str(row['user_id'])] = row['best']
+            if len(buffered[tmp_key]) >= chunk_size:
+                client.zadd(tmp_key, buffered[tmp_key])
+                buffered[tmp_key] = {}
+
+        for tmp_key, mapping in buffered.items():
+            if mapping:
+                client.zadd(tmp_key, mapping)
+
+        for tmp_key, game_id in pending.items():
+            key = window_key(game_id, window, now)
+            client.rename(tmp_key, key)
+            if window in WINDOW_TTL:
+                client.expire(key, WINDOW_TTL[window])
+            written += 1
+
+        rebuilt = {str(game_id) for game_id in pending.values()}
+        selected = None if game_ids is None else {str(game_id) for game_id in game_ids}
+        stale = [
+            key for key in client.scan_iter(match=window_key('*', window, now))
+            if key.split(':')[2] not in rebuilt
+            and (selected is None or key.split(':')[2] in selected)
+        ]
+        if stale:
+            client.delete(*stale)
+    return written
@@ -0,0 +1,63 @@
+# Backend/Apps/Games/management/commands/backfill_rollups.py
+
+from datetime import timedelta
+from django.core.management.base import BaseCommand
+from django.db.models import Min
+from django.utils import timezone
+from apps.games import rollups, running_stats
+from apps.games.models import GameScore
+
+class Command(BaseCommand):
+    help = "Build score rollups and running stats from existing completed scores in chunks"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-days',
+            type=int,
+            default=30,
+            help='Days of daily rollups rebuilt per query'
+        )
+        parser.add_argument(
+            '--chunk-users',
+            type=int,
+            default=500,
+            help='Users whose per-game rollups are rebuilt per query'
+        )
+
+    def handle(self, *args, **options):
+        completed = GameScore.objects.filter(completed=True).order_by()
+        first = completed.aggregate(first=Min('played_at'))['first']
+        if first is None:
+            self.stdout.write("No completed scores to roll up")
+            return
+
+        start = timezone.localdate(first)
+        today = timezone.localdate()
+        day_rows = 0
+        while start <= today:
+            end = min(start + timedelta(days=options['chunk_days'] - 1), today)
+            day_rows += rollups.reconcile_days(start, end)
+            self.stdout.write(f"Daily rollups {start} to {end}: {day_rows} rows so far")
+            start = end + timedelta(days=1)
+
+        user_ids = completed.values_list('user_id', flat=True).distinct().order_by('user_id')
+        chunk = []
+        user_rows = 0
+        for user_id in user_ids.iterator(chunk_size=options['chunk_users']):
+            chunk.append(user_id)
+            if len(chunk) >= options['chunk_users']:
+                user_rows += rollups.reconcile_users(chunk)
+                chunk = []
+        if chunk:
+            user_rows += rollups.reconcile_users(chunk)
+
+        pairs = completed.values_list('user_id', 'game_id').distinct().order_by('user_id', 'game_id')
+        stats_rows = 0
+        for user_id, game_id in pairs.iterator():
+            if running_stats.rebuild(user_id, game_id):
+                stats_rows += 1
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Backfilled {day_rows} daily rollups, {user_rows} user rollups "
+            f"and {stats_rows} running stats"
+        ))
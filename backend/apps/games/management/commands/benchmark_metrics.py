@@ -0,0 +1,54 @@
+# Backend/Apps/Games/management/commands/benchmark_metrics.py
+
+import time
+import numpy as np
+from django.core.management.base import BaseCommand, CommandError
+from apps.games import metrics
+
+class Command(BaseCommand):
+    help = "Benchmark the vectorized cognitive metrics engine on a synthetic cohort"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=5000)
+        parser.add_argument('--games', type=int, default=5, help='Games played per user')
+        parser.add_argument('--sessions', type=int, default=10, help='Sessions per user and game')
+        parser.add_argument('--trials', type=int, default=40, help='Trials per session')
+        parser.add_argument('--repeat', type=int, default=5, help='Timed runs; the best is reported')
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        if min(options['users'], options['games'], options['sessions'], options['trials']) < 1:
+            raise CommandError("--users, --games, --sessions and --trials must be positive")
+
+        data = self._synthetic(options)
+        best = float('inf')
+        for _ in range(max(options['repeat'], 1)):
+            started = time.perf_counter()
+            metrics.compute(data)
+            best = min(best, time.perf_counter() - started)
+
+        users = options['users']
+        self.stdout.write(
+            f"{users} users x {options['games']} games, "
+            f"{data.session_group.size} sessions, {data.trial_group.size} trials"
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"Cohort: {best * 1000:.1f} ms total, {best * 1e6 / users:.1f} us per user"
+        ))
+
+    def _synthetic(self, options) -> metrics.SessionArrays:
+        rng = np.random.default_rng(options['seed'])
+        n_groups = options['users'] * options['games']
+        sessions = n_groups * options['sessions']
+        trials = sessions * options['trials']
+
+        session_group = np.repeat(np.arange(n_groups), options['sessions'])
+        return metrics.SessionArrays(
+            n_groups=n_groups,
+            session_group=session_group,
+            session_time=rng.uniform(0, 1e7, sessions),
+            session_score=rng.integers(0, 1000, sessions).astype(np.float64),
+            trial_group=np.repeat(session_group, options['trials']),
+            reaction_times=rng.lognormal(6.2, 0.3, trials).astype(np.float32),
+            correct=rng.random(trials) < 0.85,
+        )
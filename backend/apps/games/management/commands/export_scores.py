@@ -0,0 +1,72 @@
+# Backend/Apps/Games/management/commands/export_scores.py
+
+import sys
+from django.core.management.base import BaseCommand, CommandError
+from apps.games import exports
+
+class Command(BaseCommand):
+    help = "Stream game scores to a file as NDJSON or CSV with constant memory use"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--output',
+            default='-',
+            help='Destination file path, or - for stdout (default)'
+        )
+        parser.add_argument(
+            '--format',
+            choices=exports.FORMATS,
+            default=exports.FORMAT_NDJSON
+        )
+        parser.add_argument('--gzip', action='store_true', help='Gzip-compress the output')
+        parser.add_argument(
+            '--game',
+            type=int,
+            action='append',
+            dest='game_ids',
+            help='Only export scores of this game id (repeatable)'
+        )
+        parser.add_argument('--since', help='Only scores played at or after this ISO date/datetime')
+        parser.add_argument('--until', help='Only scores played at or before this ISO date/datetime')
+        completion = parser.add_mutually_exclusive_group()
+        completion.add_argument('--completed', dest='completed', action='store_true', default=None)
+        completion.add_argument('--incomplete', dest='completed', action='store_false')
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=exports.CHUNK_SIZE,
+            help='Rows fetched from the database per round trip'
+        )
+
+    def handle(self, *args, **options):
+        try:
+            since = exports.parse_moment(options['since'])
+            until = exports.parse_moment(options['until'], end_of_day=True)
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        queryset = exports.export_queryset(
+            game_ids=options['game_ids'],
+            since=since,
+            until=until,
+            completed=options['completed']
+        )
+        chunks = exports.stream_export(
+            queryset,
+            fmt=options['format'],
+            compress=options['gzip'],
+            chunk_size=options['chunk_size']
+        )
+
+        if options['output'] == '-':
+            for chunk in chunks:
+                sys.stdout.buffer.write(chunk)
+            sys.stdout.buffer.flush()
+            return
+
+        written = 0
+        with open(options['output'], 'wb') as f:
+            for chunk in chunks:
+                f.write(chunk)
+                written += len(chunk)
+        self.stderr.write(self.style.SUCCESS(f"Wrote {written} bytes to {options['output']}"))
@@ -0,0 +1,61 @@
+# Backend/Apps/Games/management/commands/migrate_trial_metadata.py
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from apps.games import trials as trial_store
+from apps.games.models import GameScore, GameTrialSet
+
+class Command(BaseCommand):
+    help = "Move per-trial data from GameScore.metadata['trials'] into packed trial sets"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=1000,
+            help='Scores converted per transaction'
+        )
+        parser.add_argument(
+            '--keep-metadata',
+            action='store_true',
+            help='Leave the original trials in the metadata'
+        )
+
+    def handle(self, *args, **options):
+        pending = (
+            GameScore.objects.filter(metadata__has_key='trials', trials__isnull=True)
+            .order_by('id')
+        )
+        converted = skipped = 0
+        last_id = 0
+        while True:
+            chunk = list(pending.filter(id__gt=last_id)[:options['chunk_size']])
+            if not chunk:
+                break
+            last_id = chunk[-1].id
+
+            trial_sets = []
+            for score in chunk:
+                try:
+                    trial_sets.append(trial_store.build(
+                        score, *trial_store.from_metadata(score.metadata['trials'])
+                    ))
+                except (AttributeError, TypeError, ValueError):
+                    skipped += 1
+                    continue
+                if not options['keep_metadata']:
+                    del score.metadata['trials']
+
+            with transaction.atomic():
+                GameTrialSet.objects.bulk_create(trial_sets)
+                if not options['keep_metadata']:
+                    GameScore.objects.bulk_update(
+                        [trial_set.score for trial_set in trial_sets],
+                        ['metadata']
+                    )
+            converted += len(trial_sets)
+            self.stdout.write(f"Converted {converted} sessions")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Converted {converted} sessions, skipped {skipped} with malformed trials"
+        ))
@@ -0,0 +1,29 @@
+# Backend/Apps/Games/management/commands/rebuild_leaderboards.py
+
+from django.core.management.base import BaseCommand
+from apps.games import leaderboards
+
+class Command(BaseCommand):
+    help = "Repopulate game leaderboards from completed scores in the database"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--game',
+            type=int,
+            action='append',
+            dest='game_ids',
+            help='Only rebuild the leaderboard of this game id (repeatable)'
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=5000,
+            help='Rows fetched from the database per round trip'
+        )
+
+    def handle(self, *args, **options):
+        written = leaderboards.rebuild(
+            game_ids=options['game_ids'],
+            chunk_size=options['chunk_size']
+        )
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {written} leaderboard sets"))
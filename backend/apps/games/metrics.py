@@ -0,0 +1,238 @@
+# Backend/Apps/Games/metrics.py
+
+"""
+Vectorized cognitive metrics over game sessions.
+
+All metrics are computed for many groups at once from flat NumPy arrays,
+where a group is a game for one user (``user_metrics``) or a (user, game)
+pair across a cohort (``cohort_metrics``). Per-group reductions use
+``np.bincount`` and a single sort, so the cost per group stays small and
+does not depend on Python-level loops over sessions or trials.
+
+Metrics per group:
+
+- ``accuracy``: share of correct trials
+- ``median_rt`` / ``rt_iqr``: median and interquartile range of correct-trial
+  reaction times (ms)
+- ``inverse_efficiency``: mean correct RT divided by accuracy, a combined
+  speed-accuracy trade-off score (lower is better)
+- ``rt_variability``: coefficient of variation of correct-trial RTs, a
+  measure of intra-individual variability
+- ``learning_slope``: least-squares slope of score against session number
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from . import trials as trial_store
+from .models import GameScore
+
+METRIC_NAMES = [
+    'sessions', 'trials', 'mean_score', 'accuracy', 'median_rt', 'rt_iqr',
+    'inverse_efficiency', 'rt_variability', 'learning_slope',
+]
+
+# Score ids per trial-set query, to keep IN lists bounded in cohort mode
+LOAD_CHUNK_SIZE = 5000
+
+# Composite sort keys above this lose sub-millisecond precision in float64
+EXACT_KEY_LIMIT = 2.0 ** 40
+
+@dataclass
+class SessionArrays:
+    """
+    Flat session- and trial-level arrays for a set of groups.
+
+    ``session_group`` and ``trial_group`` hold the group index (0 to
+    ``n_groups - 1``) of each session and each trial respectively.
+    """
+    n_groups: int
+    session_group: np.ndarray
+    session_time: np.ndarray
+    session_score: np.ndarray
+    trial_group: np.ndarray
+    reaction_times: np.ndarray
+    correct: np.ndarray
+
+def _divide(numerator, denominator):
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(denominator > 0, numerator / denominator, np.nan)
+
+def group_quantiles(values, groups, n_groups, quantiles):
+    """
+    Linear-interpolated quantiles of ``values`` per group, computed with one
+    sort. Returns an array of shape (n_groups, len(quantiles)) with NaN for
+    empty groups.
+    """
+    result = np.full((n_groups, len(quantiles)), np.nan)
+    if not values.size:
+        return result
+
+    counts = np.bincount(groups, minlength=n_groups)
+    # Sorting group * span + (value - minimum) orders by group, then value,
+    # and is an order of magnitude faster than a two-key lexsort
+    minimum = values.min()
+    span = values.max() - minimum + 1
+    if n_groups * span < EXACT_KEY_LIMIT:
+        keys = np.sort(groups * span + (values - minimum))
+        sorted_values = keys - np.repeat(np.arange(n_groups) * span, counts) + minimum
+    else:
+        sorted_values = values[np.lexsort((values, groups))]
+    starts = np.cumsum(counts) - counts
+    present = counts > 0
+    for column, q in enumerate(quantiles):
+        position = starts[present] + q * (counts[present] - 1)
+        low = np.floor(position).astype(np.int64)
+        high = np.ceil(position).astype(np.int64)
+        weight = position - low
+        result[present, column] = (
+            sorted_values[low] * (1 - weight) + sorted_values[high] * weight
+        )
+    return result
+
+def _learning_slopes(data: SessionArrays):
+    """Least-squares slope of score against session number per group."""
+    n_groups = data.n_groups
+    order = np.lexsort((data.session_time, data.session_group))
+    groups = data.session_group[order]
+    scores = data.session_score[order].astype(np.float64)
+
+    counts = np.bincount(groups, minlength=n_groups)
+    starts = np.cumsum(counts) - counts
+    x = (np.arange(groups.size) - starts[groups]).astype(np.float64)
+
+    sum_x = np.bincount(groups, weights=x, minlength=n_groups)
+    sum_y = np.bincount(groups, weights=scores, minlength=n_groups)
+    sum_xx = np.bincount(groups, weights=x * x, minlength=n_groups)
+    sum_xy = np.bincount(groups, weights=x * scores, minlength=n_groups)
+
+    numerator = counts * sum_xy - sum_x * sum_y
+    denominator = counts * sum_xx - sum_x * sum_x
+    slopes = _divide(numerator, denominator)
+    return np.where(counts >= 2, slopes, np.nan), counts, sum_y
+
+def compute(data: SessionArrays) -> dict:
+    """
+    Compute every metric for every group. Returns {metric name: array of
+    length n_groups}; metrics without enough data are NaN.
+    """
+    n_groups = data.n_groups
+    slopes, sessions, score_sum = _learning_slopes(data)
+
+    trial_counts = np.bincount(data.trial_group, minlength=n_groups)
+    correct_counts = np.bincount(data.trial_group, weights=data.correct, minlength=n_groups)
+    accuracy = _divide(correct_counts, trial_counts)
+
+    rt = data.reaction_times.astype(np.float64)
+    usable = data.correct & ~np.isnan(rt)
+    rt_groups = data.trial_group[usable]
+    rt = rt[usable]
+
+    rt_counts = np.bincount(rt_groups, minlength=n_groups)
+    rt_sum = np.bincount(rt_groups, weights=rt, minlength=n_groups)
+    rt_sq_sum = np.bincount(rt_groups, weights=rt * rt, minlength=n_groups)
+    mean_rt = _divide(rt_sum, rt_counts)
+    rt_var = np.maximum(_divide(rt_sq_sum, rt_counts) - mean_rt * mean_rt, 0)
+
+    q25, median, q75 = group_quantiles(rt, rt_groups, n_groups, (0.25, 0.5, 0.75)).T
+
+    return {
+        'sessions': sessions,
+        'trials': trial_counts,
+        'mean_score': _divide(score_sum, sessions),
+        'accuracy': accuracy,
+        'median_rt': median,
+        'rt_iqr': q75 - q25,
+        'inverse_efficiency': _divide(mean_rt, accuracy),
+        'rt_variability': _divide(np.sqrt(rt_var), mean_rt),
+        'learning_slope': slopes,
+    }
+
+def _to_python(value):
+    if isinstance(value, (np.integer,)):
+        return int(value)
+    value = float(value)
+    return None if np.isnan(value) else round(value, 4)
+
+def metrics_row(results: dict, index: int) -> dict:
+    """Extract one group's metrics as JSON-friendly values."""
+    return {name: _to_python(results[name][index]) for name in METRIC_NAMES}
+
+def build_arrays(sessions, group_of) -> tuple:
+    """
+    Build ``SessionArrays`` from (score_id, user_id, game_id, score,
+    played_at) rows, grouping by ``group_of(user_id, game_id)``. Returns
+    the arrays and the list of group keys in index order.
+    """
+    sessions = list(sessions)
+    group_index = {}
+    session_group = np.empty(len(sessions), dtype=np.int64)
+    session_time = np.empty(len(sessions), dtype=np.float64)
+    session_score = np.empty(len(sessions), dtype=np.float64)
+    for position, (_, user_id, game_id, score, played_at) in enumerate(sessions):
+        key = group_of(user_id, game_id)
+        session_group[position] = group_index.setdefault(key, len(group_index))
+        session_time[position] = played_at.timestamp()
+        session_score[position] = score
+
+    loaded = {}
+    for offset in range(0, len(sessions), LOAD_CHUNK_SIZE):
+        chunk = sessions[offset:offset + LOAD_CHUNK_SIZE]
+        loaded.update(trial_store.load(row[0] for row in chunk))
+
+    trial_groups, reaction_times, correct = [], [], []
+    for position, row in enumerate(sessions):
+        session_trials = loaded.get(row[0])
+        if session_trials is None or not len(session_trials):
+            continue
+        trial_groups.append(np.full(len(session_trials), session_group[position], dtype=np.int64))
+        reaction_times.append(session_trials.reaction_times)
+        correct.append(session_trials.correct)
+
+    data = SessionArrays(
+        n_groups=len(group_index),
+        session_group=session_group,
+        session_time=session_time,
+        session_score=session_score,
+        trial_group=np.concatenate(trial_groups) if trial_groups else np.empty(0, dtype=np.int64),
+        reaction_times=np.concatenate(reaction_times) if reaction_times else np.empty(0, dtype=np.float32),
+        correct=np.concatenate(correct) if correct else np.empty(0, dtype=bool),
+    )
+    return data, list(group_index)
+
+def _completed_sessions(queryset):
+    return (
+        queryset.filter(completed=True)
+        .order_by()
+        .values_list('id', 'user_id', 'game_id', 'score', 'played_at')
+        .iterator(chunk_size=5000)
+    )
+
+def user_metrics(user_id, game_ids=None) -> dict:
+    """
+    Compute metrics for all of a user's games in one pass.
+    Returns {game_id: metrics}.
+    """
+    queryset = GameScore.objects.filter(user_id=user_id)
+    if game_ids is not None:
+        queryset = queryset.filter(game_id__in=game_ids)
+    data, keys = build_arrays(_completed_sessions(queryset), lambda user, game: game)
+    if not keys:
+        return {}
+    results = compute(data)
+    return {game_id: metrics_row(results, index) for index, game_id in enumerate(keys)}
+
+def cohort_metrics(user_ids=None, game_ids=None) -> tuple:
+    """
+    Compute metrics for every (user, game) pair in a cohort at once, for
+    norm building. Returns (keys, results) where keys is a list of
+    (user_id, game_id) tuples aligned with the result arrays.
+    """
+    queryset = GameScore.objects.all()
+    if user_ids is not None:
+        queryset = queryset.filter(user_id__in=user_ids)
+    if game_ids is not None:
+        queryset = queryset.filter(game_id__in=game_ids)
+    data, keys = build_arrays(_completed_sessions(queryset), lambda user, game: (user, game))
+    return keys, compute(data) if keys else {}
@@ -0,0 +1,63 @@
+# Generated by Django 5.1.1 on 2026-10-18 08:55
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("games", "0002_gamescore_completion_time_alter_gamescore_score"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="GameNorm",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "difficulty",
+                    models.CharField(
+                        blank=True,
+                        choices=[
+                            ("easy", "Easy"),
+                            ("medium", "Medium"),
+                            ("hard", "Hard"),
+                        ],
+                        default="",
+                        max_length=10,
+                    ),
+                ),
+                ("version", models.PositiveIntegerField()),
+                ("sample_size", models.PositiveIntegerField()),
+                ("score_min", models.IntegerField()),
+                ("bin_width", models.PositiveIntegerField(default=1)),
+                ("percentiles", models.JSONField(default=list)),
+                (
+                    "computed_at",
+                    models.DateTimeField(default=django.utils.timezone.now),
+                ),
+                (
+                    "game",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="norms",
+                        to="games.game",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["game", "difficulty", "-version"],
+                "unique_together": {("game", "difficulty", "version")},
+            },
+        ),
+    ]
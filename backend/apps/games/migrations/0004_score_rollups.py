@@ -0,0 +1,100 @@
+# Generated by Django 5.1.1 on 2026-10-18 09:01
+
+import datetime
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("games", "0003_gamenorm"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="GameDailyRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("count", models.PositiveIntegerField(default=0)),
+                ("best_score", models.IntegerField(blank=True, null=True)),
+                ("score_sum", models.BigIntegerField(default=0)),
+                ("score_sq_sum", models.FloatField(default=0)),
+                (
+                    "total_completion_time",
+                    models.DurationField(default=datetime.timedelta(0)),
+                ),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("day", models.DateField()),
+                (
+                    "game",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="daily_rollups",
+                        to="games.game",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["-day"],
+                "indexes": [
+                    models.Index(fields=["day"], name="games_gamed_day_b76aa1_idx")
+                ],
+                "unique_together": {("game", "day")},
+            },
+        ),
+        migrations.CreateModel(
+            name="UserGameRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("count", models.PositiveIntegerField(default=0)),
+                ("best_score", models.IntegerField(blank=True, null=True)),
+                ("score_sum", models.BigIntegerField(default=0)),
+                ("score_sq_sum", models.FloatField(default=0)),
+                (
+                    "total_completion_time",
+                    models.DurationField(default=datetime.timedelta(0)),
+                ),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("first_played_at", models.DateTimeField(blank=True, null=True)),
+                ("last_played_at", models.DateTimeField(blank=True, null=True)),
+                (
+                    "game",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="user_rollups",
+                        to="games.game",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="game_rollups",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "unique_together": {("user", "game")},
+            },
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.1.1 on 2026-10-18 09:03
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("games", "0004_score_rollups"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="gameprogress",
+            index=models.Index(
+                fields=["user", "-last_played", "-id"],
+                name="games_progress_user_recent_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="gamescore",
+            index=models.Index(
+                fields=["user", "-played_at", "-id"],
+                name="games_score_user_history_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="gamescore",
+            index=models.Index(
+                fields=["user", "game", "-played_at", "-id"],
+                name="games_score_user_game_hist_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.1.1 on 2026-10-18 09:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("games", "0005_keyset_history_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="GameTrialSet",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("trial_count", models.PositiveIntegerField()),
+                ("reaction_times", models.BinaryField()),
+                ("correct", models.BinaryField()),
+                ("format_version", models.PositiveSmallIntegerField(default=1)),
+                (
+                    "score",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="trials",
+                        to="games.gamescore",
+                    ),
+                ),
+            ],
+        ),
+    ]
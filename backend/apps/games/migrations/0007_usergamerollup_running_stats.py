@@ -0,0 +1,48 @@
+# Generated by Django 5.1.1 on 2026-10-18 10:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("games", "0006_gametrialset"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="usergamerollup",
+            name="current_streak",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="usergamerollup",
+            name="last_played_on",
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="usergamerollup",
+            name="last_score",
+            field=models.IntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="usergamerollup",
+            name="longest_streak",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="usergamerollup",
+            name="score_ema",
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name="gamedailyrollup",
+            name="score_sq_sum",
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.AlterField(
+            model_name="usergamerollup",
+            name="score_sq_sum",
+            field=models.BigIntegerField(default=0),
+        ),
+    ]
@@ -1,5 +1,6 @@
 # Backend/Apps/Games/models.py
 
+from datetime import timedelta
 from django.db import models
 from django.conf import settings
 from django.utils import timezone
@@ -46,6 +47,9 @@ class GameScore(models.Model):
         indexes = [
             models.Index(fields=['user', 'game']),
             models.Index(fields=['completed']),
+            # Keyset pagination of score history
+            models.Index(fields=['user', '-played_at', '-id'], name='games_score_user_history_idx'),
+            models.Index(fields=['user', 'game', '-played_at', '-id'], name='games_score_user_game_hist_idx'),
         ]
 
     def __str__(self):
@@ -66,6 +70,8 @@ class GameProgress(models.Model):
         indexes = [
             models.Index(fields=['user', 'game_id']),
             models.Index(fields=['completed']),
+            # Keyset pagination of progress lists
+            models.Index(fields=['user', '-last_played', '-id'], name='games_progress_user_recent_idx'),
         ]
 
 class GameConfig(models.Model):
@@ -91,3 +97,129 @@ class GameConfig(models.Model):
 
     class Meta:
         app_label = 'games'
+
+class GameNorm(models.Model):
+    """
+    Versioned population norms for a game, stored as a compact percentile
+    lookup table over equal-width score bins.
+
+    ``percentiles[i]`` is the mid-rank percentile of a score falling in bin
+    ``i``, where bin ``i`` covers ``score_min + i * bin_width`` onwards.
+    """
+    game = models.ForeignKey(Game, on_delete=models.CASCADE, related_name='norms')
+    difficulty = models.CharField(
+        max_length=10,
+        choices=GameConfig.DIFFICULTY_CHOICES,
+        blank=True,
+        default=''
+    )  # blank for norms across all difficulties
+    version = models.PositiveIntegerField()
+    sample_size = models.PositiveIntegerField()
+    score_min = models.IntegerField()
+    bin_width = models.PositiveIntegerField(default=1)
+    percentiles = models.JSONField(default=list)
+    computed_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        app_label = 'games'
+        ordering = ['game', 'difficulty', '-version']
+        unique_together = ('game', 'difficulty', 'version')
+
+    def __str__(self):
+        return f"{self.game.title} norms v{self.version} ({self.difficulty or 'all'})"
+
+class ScoreRollup(models.Model):
+    """
+    Abstract additive aggregate over completed game scores. Every column
+    can be incremented in place, so rollups are maintained with atomic
+    ``F()`` updates and mean/variance are derived on read. Scores are
+    integers, so the sums are kept exact and the variance does not suffer
+    the cancellation of a floating-point sum of squares.
+    """
+    count = models.PositiveIntegerField(default=0)
+    best_score = models.IntegerField(null=True, blank=True)
+    score_sum = models.BigIntegerField(default=0)
+    score_sq_sum = models.BigIntegerField(default=0)
+    total_completion_time = models.DurationField(default=timedelta(0))
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        abstract = True
+
+    @property
+    def mean_score(self):
+        return self.score_sum / self.count if self.count else None
+
+    @property
+    def score_variance(self):
+        """Population variance of the scores."""
+        if not self.count:
+            return None
+        count, total = self.count, int(self.score_sum)
+        # n * sum(x^2) - sum(x)^2 is exact in integers; divide once
+        return (count * int(self.score_sq_sum) - total * total) / (count * count)
+
+class GameDailyRollup(ScoreRollup):
+    """
+    Per-game, per-day aggregates of completed scores.
+    """
+    game = models.ForeignKey(Game, on_delete=models.CASCADE, related_name='daily_rollups')
+    day = models.DateField()
+
+    class Meta:
+        app_label = 'games'
+        ordering = ['-day']
+        unique_together = ('game', 'day')
+        indexes = [
+            models.Index(fields=['day']),
+        ]
+
+    def __str__(self):
+        return f"{self.game.title} - {self.day}"
+
+class UserGameRollup(ScoreRollup):
+    """
+    Per-(user, game) aggregates of completed scores.
+
+    Besides the additive columns it holds order-dependent running
+    statistics maintained by ``apps.games.running_stats``: the latest
+    score, an exponential moving average and a streak of consecutive local
+    days with at least one completed score.
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='game_rollups')
+    game = models.ForeignKey(Game, on_delete=models.CASCADE, related_name='user_rollups')
+    first_played_at = models.DateTimeField(null=True, blank=True)
+    last_played_at = models.DateTimeField(null=True, blank=True)
+    last_score = models.IntegerField(null=True, blank=True)
+    score_ema = models.FloatField(null=True, blank=True)
+    current_streak = models.PositiveIntegerField(default=0)
+    longest_streak = models.PositiveIntegerField(default=0)
+    last_played_on = models.DateField(null=True, blank=True)
+
+    class Meta:
+        app_label = 'games'
+        unique_together = ('user', 'game')
+
+    def __str__(self):
+        return f"{self.user.username} - {self.game.title}"
+
+class GameTrialSet(models.Model):
+    """
+    Packed per-trial telemetry for one game session.
+
+    Reaction times are little-endian float32 milliseconds and correctness
+    is a bitmap (one bit per trial), which is far smaller than storing the
+    trials as JSON in ``GameScore.metadata``. Use ``apps.games.trials`` to
+    pack and read them as NumPy arrays.
+    """
+    score = models.OneToOneField(GameScore, on_delete=models.CASCADE, related_name='trials')
+    trial_count = models.PositiveIntegerField()
+    reaction_times = models.BinaryField()
+    correct = models.BinaryField()
+    format_version = models.PositiveSmallIntegerField(default=1)
+
+    class Meta:
+        app_label = 'games'
+
+    def __str__(self):
+        return f"{self.trial_count} trials for score {self.score_id}"
@@ -0,0 +1,156 @@
+# Backend/Apps/Games/norms.py
+
+"""
+Population norms for games.
+
+Score distributions are computed periodically from completed ``GameScore``
+rows with NumPy and stored as versioned ``GameNorm`` lookup tables. Looking
+up a percentile is a cache read plus one array index, so responses and
+analyses can attach percentiles without scanning the score table.
+"""
+
+import numpy as np
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Max
+
+from .models import Game, GameConfig, GameNorm, GameScore
+
+# Games with fewer completed scores than this get no norms
+MIN_SAMPLE_SIZE = 30
+
+# Upper bound on lookup table size; wider score ranges use wider bins
+MAX_BINS = 1000
+
+# Old norm versions kept for audit and rollback
+KEEP_VERSIONS = 3
+
+CACHE_TIMEOUT = 86400  # 24 hours
+MISSING_CACHE_TIMEOUT = 3600  # 1 hour
+
+DIFFICULTIES = [value for value, _ in GameConfig.DIFFICULTY_CHOICES]
+
+def build_table(scores, max_bins=MAX_BINS) -> dict:
+    """
+    Build a percentile lookup table from an array of integer scores.
+
+    Percentiles use the mid-rank definition: the share of scores below a
+    bin plus half of the scores inside it, scaled to 0-100.
+    """
+    scores = np.asarray(scores, dtype=np.int64)
+    score_min = int(scores.min())
+    score_range = int(scores.max()) - score_min + 1
+    bin_width = max(1, -(-score_range // max_bins))
+    n_bins = -(-score_range // bin_width)
+
+    counts = np.bincount((scores - score_min) // bin_width, minlength=n_bins)
+    below = np.cumsum(counts) - counts
+    percentiles = np.rint((below + counts / 2) * 100.0 / scores.size)
+
+    return {
+        'sample_size': int(scores.size),
+        'score_min': score_min,
+        'bin_width': int(bin_width),
+        'percentiles': percentiles.astype(np.int64).tolist(),
+    }
+
+def percentile_from_table(table: dict, score: int) -> int:
+    """Look up the percentile of a score in a table built by build_table()."""
+    percentiles = table['percentiles']
+    index = (int(score) - table['score_min']) // table['bin_width']
+    if index < 0:
+        return 0
+    if index >= len(percentiles):
+        return 100
+    return percentiles[index]
+
+def _cache_key(game_id, difficulty=''):
+    return f"game_norms:{game_id}:{difficulty or 'all'}"
+
+def _load_scores(queryset) -> np.ndarray:
+    return np.fromiter(
+        queryset.values_list('score', flat=True).iterator(chunk_size=10000),
+        dtype=np.int64
+    )
+
+def compute_game_norms(game: Game, min_sample_size=MIN_SAMPLE_SIZE) -> list:
+    """
+    Compute and store a new norms version for one game, overall and per
+    difficulty. Per-session difficulty is read from the score metadata.
+    Returns the created ``GameNorm`` rows.
+    """
+    completed = GameScore.objects.filter(game=game, completed=True).order_by()
+    groups = {'': completed}
+    for difficulty in DIFFICULTIES:
+        groups[difficulty] = completed.filter(metadata__difficulty=difficulty)
+
+    created = []
+    for difficulty, queryset in groups.items():
+        scores = _load_scores(queryset)
+        if scores.size < min_sample_size:
+            continue
+
+        table = build_table(scores)
+        with transaction.atomic():
+            # unique_together on (game, difficulty, version) rejects racing writers
+            latest = (
+                GameNorm.objects.filter(game=game, difficulty=difficulty)
+                .aggregate(Max('version'))['version__max'] or 0
+            )
+            norm = GameNorm.objects.create(
+                game=game,
+                difficulty=difficulty,
+                version=latest + 1,
+                **table
+            )
+            GameNorm.objects.filter(
+                game=game,
+                difficulty=difficulty,
+                version__lte=norm.version - KEEP_VERSIONS
+            ).delete()
+        cache.set(_cache_key(game.id, difficulty), table, timeout=CACHE_TIMEOUT)
+        created.append(norm)
+    return created
+
+def compute_all_norms(min_sample_size=MIN_SAMPLE_SIZE) -> list:
+    """Compute a new norms version for every active game."""
+    created = []
+    for game in Game.objects.filter(is_active=True):
+        created.extend(compute_game_norms(game, min_sample_size=min_sample_size))
+    return created
+
+def get_table(game_id, difficulty=''):
+    """Return the latest lookup table for a game, or None if not computed."""
+    key = _cache_key(game_id, difficulty)
+    table = cache.get(key)
+    if table is None:
+        norm = (
+            GameNorm.objects.filter(game_id=game_id, difficulty=difficulty or '')
+            .order_by('-version')
+            .first()
+        )
+        if norm is None:
+            # Remember the miss so games without norms don't query every time
+            cache.set(key, False, timeout=MISSING_CACHE_TIMEOUT)
+            return None
+        table = {
+            'sample_size': norm.sample_size,
+            'score_min': norm.score_min,
+            'bin_width': norm.bin_width,
+            'percentiles': norm.percentiles,
+        }
+        cache.set(key, table, timeout=CACHE_TIMEOUT)
+    return table or None
+
+def get_percentile(game_id, score, difficulty=''):
+    """
+    Return the population percentile of a score, or None when the game has
+    no norms. Falls back to the all-difficulty norms when the requested
+    difficulty has none.
+    """
+    table = get_table(game_id, difficulty)
+    if table is None and difficulty:
+        table = get_table(game_id)
+    if table is None:
+        return None
+    return percentile_from_table(table, score)
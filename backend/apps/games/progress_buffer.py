@@ -0,0 +1,257 @@
+# Backend/Apps/Games/progress_buffer.py
+
+"""
+Write-coalescing buffer for high-frequency ``GameProgress`` heartbeats.
+
+Heartbeats are absorbed in the cache instead of issuing a full-row UPDATE
+each time:
+
+- ``current_score``, ``current_level`` and ``completed`` are last-write-wins
+- ``time_spent`` is additive and accumulated with atomic ``cache.incr``
+
+Every buffered row is appended once to a cache-backed log so a periodic
+flush can find it, and ``flush()`` writes all pending rows back with one
+batched ``bulk_update`` using ``F()`` increments for ``time_spent``.
+Reads go through ``overlay()`` so clients always see the merged state.
+
+The buffer only works when every web process and the flushing worker
+share the cache. It is enabled by pointing the default cache at Redis
+(``CACHE_REDIS_URL``) and scheduling ``apps.games.tasks.flush_game_progress``
+every few seconds. With a process-local backend (``LocMemCache``, the
+default) heartbeats are written straight through to the database instead,
+unless ``GAME_PROGRESS_BUFFER`` says otherwise.
+"""
+
+import time
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db.models import F
+from django.utils import timezone
+
+from .models import GameProgress
+
+PREFIX = 'game_progress_buffer'
+
+# Last-write-wins fields accepted from heartbeats
+LWW_FIELDS = ('current_score', 'current_level', 'completed')
+
+# Buffered state outlives several missed flushes before expiring
+BUFFER_TIMEOUT = 3600  # 1 hour
+OWNER_TIMEOUT = 86400  # 24 hours
+
+FLUSH_BATCH_SIZE = 500
+FLUSH_LOCK_TIMEOUT = 60
+
+# A log entry still missing after this long is skipped by the flush: its
+# writer crashed between claiming the sequence number and setting it, or
+# the entry was evicted (seconds)
+LOG_GAP_GRACE = 30
+
+def buffering_enabled():
+    """Whether heartbeats are buffered, i.e. the cache is shared between processes."""
+    enabled = getattr(settings, 'GAME_PROGRESS_BUFFER', None)
+    if enabled is not None:
+        return enabled
+    return not isinstance(caches['default'], (LocMemCache, DummyCache))
+
+def _key(progress_id, name):
+    return f"{PREFIX}:{progress_id}:{name}"
+
+def _ensure_counter(key):
+    # incr() fails on missing keys; add() is a no-op when the key exists
+    cache.add(key, 0, timeout=None)
+
+def remember_owner(progress_id, user_id):
+    cache.set(_key(progress_id, 'owner'), user_id, timeout=OWNER_TIMEOUT)
+
+def is_owner(progress_id, user_id):
+    return cache.get(_key(progress_id, 'owner')) == user_id
+
+def record(progress_id, time_spent=0, **fields):
+    """
+    Buffer a heartbeat for a progress row.
+
+    ``time_spent`` is the number of seconds played since the previous
+    heartbeat; other keyword arguments are last-write-wins field values.
+    """
+    progress_id = int(progress_id)
+    if not buffering_enabled():
+        _write_through(progress_id, time_spent, fields)
+        return
+
+    values = {
+        _key(progress_id, name): value
+        for name, value in fields.items()
+        if name in LWW_FIELDS and value is not None
+    }
+    values[_key(progress_id, 'last_played')] = timezone.now()
+    cache.set_many(values, timeout=BUFFER_TIMEOUT)
+
+    if time_spent:
+        delta_key = _key(progress_id, 'time_spent')
+        _ensure_counter(delta_key)
+        cache.incr(delta_key, int(time_spent))
+
+    # Log the row once per flush cycle; add() is atomic
+    if cache.add(_key(progress_id, 'pending'), True, timeout=BUFFER_TIMEOUT):
+        seq_key = f"{PREFIX}:seq"
+        _ensure_counter(seq_key)
+        seq = cache.incr(seq_key)
+        cache.set(f"{PREFIX}:log:{seq}", progress_id, timeout=BUFFER_TIMEOUT)
+
+def _write_through(progress_id, time_spent, fields):
+    values = {
+        name: value
+        for name, value in fields.items()
+        if name in LWW_FIELDS and value is not None
+    }
+    if time_spent:
+        values['time_spent'] = F('time_spent') + int(time_spent)
+    GameProgress.objects.filter(pk=progress_id).update(last_played=timezone.now(), **values)
+
+def pending(progress_ids):
+    """Return buffered changes for the given rows as {id: {field: value}}."""
+    names = LWW_FIELDS + ('time_spent', 'last_played')
+    keys = {
+        _key(progress_id, name): (progress_id, name)
+        for progress_id in progress_ids
+        for name in names
+    }
+    changes = {}
+    for key, value in cache.get_many(keys).items():
+        progress_id, name = keys[key]
+        if name == 'time_spent' and not value:
+            continue
+        changes.setdefault(progress_id, {})[name] = value
+    return changes
+
+def overlay(instances):
+    """Apply buffered changes to GameProgress instances in place."""
+    instances = list(instances)
+    changes = pending([instance.pk for instance in instances])
+    for instance in instances:
+        for name, value in changes.get(instance.pk, {}).items():
+            if name == 'time_spent':
+                instance.time_spent += value
+            else:
+                setattr(instance, name, value)
+    return instances
+
+def _take(progress_ids):
+    """
+    Claim buffered changes for writing. Additive deltas are consumed with
+    ``decr`` by the amount read, so heartbeats that land mid-flush are kept
+    for the next cycle instead of being lost.
+    """
+    cache.delete_many([_key(progress_id, 'pending') for progress_id in progress_ids])
+    changes = pending(progress_ids)
+
+    # Only clear last-write-wins values that were not overwritten meanwhile
+    taken = {
+        _key(progress_id, name): value
+        for progress_id, fields in changes.items()
+        for name, value in fields.items()
+        if name != 'time_spent'
+    }
+    current = cache.get_many(list(taken))
+    cache.delete_many([key for key, value in current.items() if taken[key] == value])
+    for progress_id, fields in changes.items():
+        if fields.get('time_spent'):
+            cache.decr(_key(progress_id, 'time_spent'), fields['time_spent'])
+    return changes
+
+def _write(changes):
+    rows = GameProgress.objects.in_bulk(list(changes))
+    updated = []
+    fields = set()
+    for progress_id, values in changes.items():
+        progress = rows.get(progress_id)
+        if progress is None:
+            continue
+        for name, value in values.items():
+            if name == 'time_spent':
+                progress.time_spent = F('time_spent') + value
+            else:
+                setattr(progress, name, value)
+            fields.add(name)
+        updated.append(progress)
+    if updated:
+        GameProgress.objects.bulk_update(updated, sorted(fields), batch_size=FLUSH_BATCH_SIZE)
+    return len(updated)
+
+def flush_ids(progress_ids):
+    """Write any buffered changes for specific rows straight away."""
+    changes = _take(list(progress_ids))
+    if not changes:
+        return 0
+    try:
+        return _write(changes)
+    except Exception:
+        # Put the claimed changes back so the next flush retries them
+        for progress_id, fields in changes.items():
+            fields = dict(fields)
+            fields.pop('last_played', None)
+            record(progress_id, **fields)
+        raise
+
+def flush(batch_size=FLUSH_BATCH_SIZE):
+    """
+    Write every buffered row to the database in batches. Returns the
+    number of rows updated.
+    """
+    lock_key = f"{PREFIX}:flush_lock"
+    if not cache.add(lock_key, True, timeout=FLUSH_LOCK_TIMEOUT):
+        return 0  # another worker is flushing
+
+    try:
+        return _flush_log(batch_size)
+    finally:
+        cache.delete(lock_key)
+
+def _flush_log(batch_size):
+    seq_key = f"{PREFIX}:seq"
+    flushed_key = f"{PREFIX}:flushed"
+    _ensure_counter(flushed_key)
+    start = cache.get(flushed_key, 0) + 1
+    end = cache.get(seq_key, 0)
+
+    written = 0
+    for batch_start in range(start, end + 1, batch_size):
+        batch_end = min(batch_start + batch_size - 1, end)
+        log_keys = [f"{PREFIX}:log:{seq}" for seq in range(batch_start, batch_end + 1)]
+        entries = cache.get_many(log_keys)
+
+        if batch_end == end and len(entries) < len(log_keys):
+            # The newest sequence numbers may be claimed but not written yet;
+            # only flush up to the first such gap so the next run picks them up.
+            gap = _first_open_gap(log_keys, entries)
+            if gap is not None:
+                log_keys = log_keys[:gap]
+                entries = {key: entries[key] for key in log_keys}
+                batch_end = batch_start + gap - 1
+
+        if entries:
+            written += flush_ids(set(entries.values()))
+        cache.delete_many(log_keys + [f"{key}:missing" for key in log_keys if key not in entries])
+        cache.set(flushed_key, batch_end, timeout=None)
+    return written
+
+def _first_open_gap(log_keys, entries):
+    """
+    Index of the first missing log entry that may still be written, or
+    None. Entries missing for longer than ``LOG_GAP_GRACE`` are skipped.
+    """
+    now = time.time()
+    for index, key in enumerate(log_keys):
+        if key in entries:
+            continue
+        first_seen = cache.get(f"{key}:missing")
+        if first_seen is None:
+            cache.set(f"{key}:missing", now, timeout=BUFFER_TIMEOUT)
+            return index
+        if now - first_seen < LOG_GAP_GRACE:
+            return index
+    return None
@@ -0,0 +1,140 @@
+# Backend/Apps/Games/registry.py
+
+"""
+Process-local catalog of active games and game configurations.
+
+The catalog changes rarely but is read on almost every request, so each
+worker loads all active ``Game`` and ``GameConfig`` rows once and serves
+lookups from memory. Invalidation across workers goes through a version
+token in the shared cache: saving or deleting a row replaces the token
+(see ``signals``), and any worker whose snapshot was built for another
+token reloads on its next lookup.
+
+Snapshots are shared between requests and must be treated as read-only.
+
+A game is mapped to its ``GameConfig`` explicitly by ``game.config['game_id']``,
+falling back to the game's primary key. Active games with no matching
+config are logged on every reload, since they are served without a score
+range.
+"""
+
+import logging
+import threading
+import uuid
+from dataclasses import dataclass, field
+
+from django.core.cache import cache
+
+from .models import Game, GameConfig
+
+logger = logging.getLogger(__name__)
+
+VERSION_KEY = 'games_registry:version'
+
+@dataclass(frozen=True)
+class Snapshot:
+    """Immutable view of the catalog for one registry version."""
+    version: str = ''
+    games: dict = field(default_factory=dict)  # {id: Game}, active only
+    game_list: tuple = ()  # ordered by title
+    configs: dict = field(default_factory=dict)  # {id: GameConfig}
+    config_list: tuple = ()  # ordered by id
+    configs_by_game_id: dict = field(default_factory=dict)  # {game_id: GameConfig}
+
+_snapshot = Snapshot()
+_lock = threading.Lock()
+
+def version() -> str:
+    """Return the shared catalog version, creating it if missing."""
+    current = cache.get(VERSION_KEY)
+    if current is None:
+        cache.add(VERSION_KEY, uuid.uuid4().hex, timeout=None)
+        current = cache.get(VERSION_KEY)
+    return current
+
+def invalidate():
+    """Force every worker to reload the catalog on its next lookup."""
+    global _snapshot
+    cache.set(VERSION_KEY, uuid.uuid4().hex, timeout=None)
+    _snapshot = Snapshot()
+
+def config_key(game) -> str:
+    """The ``GameConfig.game_id`` a game maps to."""
+    return str((game.config or {}).get('game_id', game.pk))
+
+def _load(current_version) -> Snapshot:
+    game_list = tuple(Game.objects.filter(is_active=True).order_by('title', 'id'))
+    config_list = tuple(GameConfig.objects.order_by('id'))
+    configs_by_game_id = {config.game_id: config for config in config_list}
+
+    unmatched = [game for game in game_list if config_key(game) not in configs_by_game_id]
+    if unmatched:
+        logger.warning(
+            "Active games without a GameConfig, served without score ranges "
+            "(set config['game_id'] to the config's game_id): %s",
+            ', '.join(f"{game.title!r} (id {game.pk}, maps to {config_key(game)!r})" for game in unmatched)
+        )
+
+    return Snapshot(
+        version=current_version,
+        games={game.pk: game for game in game_list},
+        game_list=game_list,
+        configs={config.pk: config for config in config_list},
+        config_list=config_list,
+        configs_by_game_id=configs_by_game_id,
+    )
+
+def snapshot() -> Snapshot:
+    """Return the current catalog, reloading it if another worker changed it."""
+    global _snapshot
+    current_version = version()
+    if _snapshot.version == current_version:
+        return _snapshot
+
+    with _lock:
+        if _snapshot.version != current_version:
+            _snapshot = _load(current_version)
+        return _snapshot
+
+def games() -> dict:
+    return snapshot().games
+
+def game_list(category=None) -> list:
+    """Active games ordered by title, optionally filtered by config category."""
+    games = snapshot().game_list
+    if category:
+        return [game for game in games if (game.config or {}).get('category') == category]
+    return list(games)
+
+def get_game(pk):
+    try:
+        return snapshot().games.get(int(pk))
+    except (TypeError, ValueError):
+        return None
+
+def config_list() -> list:
+    return list(snapshot().config_list)
+
+def get_config(pk):
+    try:
+        return snapshot().configs.get(int(pk))
+    except (TypeError, ValueError):
+        return None
+
+def get_config_by_game_id(game_id):
+    return snapshot().configs_by_game_id.get(str(game_id))
+
+def config_for_game(game):
+    """
+    The ``GameConfig`` of a game, matched on ``game.config['game_id']``
+    when set and on the game's primary key otherwise. None when there is
+    no match, which ``_load`` logs.
+    """
+    return get_config_by_game_id(config_key(game))
+
+def score_range(game):
+    """Return (min_score, max_score) for a game, or None when unconfigured."""
+    config = config_for_game(game)
+    if config is None:
+        return None
+    return config.min_score, config.max_score
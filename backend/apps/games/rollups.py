@@ -0,0 +1,184 @@
+# Backend/Apps/Games/rollups.py
+
+"""
+Materialized rollups of completed game scores.
+
+``GameDailyRollup`` (per game and day) and ``UserGameRollup`` (per user and
+game) are incremented with atomic ``F()`` updates as scores are completed,
+so analytics reads cost one row lookup instead of re-aggregating raw
+scores. ``reconcile_days`` and ``reconcile_users`` recompute rows from the
+raw table to repair drift and to backfill existing history in chunks.
+
+Per-user rows also carry the order-dependent fields of ``running_stats``,
+so their update runs under a row lock.
+"""
+
+from collections import defaultdict
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import BigIntegerField, Count, F, Max, Min, Sum, Value
+from django.db.models.functions import Cast, Coalesce, Greatest, Least, TruncDate
+from django.utils import timezone
+
+from . import running_stats
+from .models import GameDailyRollup, GameScore, UserGameRollup
+
+ROLLUP_FIELDS = ['count', 'best_score', 'score_sum', 'score_sq_sum', 'total_completion_time']
+
+def _aggregates():
+    score = Cast('score', BigIntegerField())
+    return {
+        'count': Count('id'),
+        'best_score': Max('score'),
+        'score_sum': Sum('score'),
+        'score_sq_sum': Sum(score * score, output_field=BigIntegerField()),
+        'total_completion_time': Coalesce(Sum('completion_time'), Value(timedelta(0))),
+    }
+
+def _summarize(scores):
+    times = [score.completion_time for score in scores if score.completion_time]
+    return {
+        'count': len(scores),
+        'best_score': max(score.score for score in scores),
+        'score_sum': sum(score.score for score in scores),
+        'score_sq_sum': sum(score.score * score.score for score in scores),
+        'total_completion_time': sum(times, timedelta(0)),
+        'first_played_at': min(score.played_at for score in scores),
+        'last_played_at': max(score.played_at for score in scores),
+    }
+
+def _increments(summary):
+    return {
+        'count': F('count') + summary['count'],
+        'best_score': Greatest(
+            Coalesce(F('best_score'), Value(summary['best_score'])),
+            Value(summary['best_score'])
+        ),
+        'score_sum': F('score_sum') + summary['score_sum'],
+        'score_sq_sum': F('score_sq_sum') + summary['score_sq_sum'],
+        'total_completion_time': F('total_completion_time') + summary['total_completion_time'],
+        'updated_at': timezone.now(),
+    }
+
+def record_scores(scores):
+    """Add newly completed scores to the daily and per-user rollups."""
+    by_day = defaultdict(list)
+    by_user = defaultdict(list)
+    for score in scores:
+        by_day[(score.game_id, timezone.localdate(score.played_at))].append(score)
+        by_user[(score.user_id, score.game_id)].append(score)
+
+    for (game_id, day), group in by_day.items():
+        summary = _summarize(group)
+        rollup, _ = GameDailyRollup.objects.get_or_create(game_id=game_id, day=day)
+        GameDailyRollup.objects.filter(pk=rollup.pk).update(**_increments(summary))
+
+    for (user_id, game_id), group in by_user.items():
+        group.sort(key=lambda score: (score.played_at, score.pk or 0))
+        summary = _summarize(group)
+        with transaction.atomic():
+            rollup, _ = UserGameRollup.objects.select_for_update().get_or_create(
+                user_id=user_id,
+                game_id=game_id
+            )
+            for score in group:
+                running_stats.apply(rollup, score.score, timezone.localdate(score.played_at))
+            UserGameRollup.objects.filter(pk=rollup.pk).update(
+                first_played_at=Least(
+                    Coalesce(F('first_played_at'), Value(summary['first_played_at'])),
+                    Value(summary['first_played_at'])
+                ),
+                last_played_at=Greatest(
+                    Coalesce(F('last_played_at'), Value(summary['last_played_at'])),
+                    Value(summary['last_played_at'])
+                ),
+                **{name: getattr(rollup, name) for name in running_stats.RUNNING_FIELDS},
+                **_increments(summary)
+            )
+
+def reconcile_days(start, end, batch_size=1000):
+    """
+    Recompute daily rollups for days in [start, end] from raw scores,
+    overwriting drifted rows and removing rows that have no scores left.
+    Returns the number of rows written.
+    """
+    rows = (
+        GameScore.objects.filter(completed=True, played_at__date__gte=start, played_at__date__lte=end)
+        .annotate(day=TruncDate('played_at'))
+        .values('game_id', 'day')
+        .annotate(**_aggregates())
+        .order_by()
+    )
+    rollups = [GameDailyRollup(**row) for row in rows]
+    GameDailyRollup.objects.bulk_create(
+        rollups,
+        batch_size=batch_size,
+        update_conflicts=True,
+        unique_fields=['game', 'day'],
+        update_fields=ROLLUP_FIELDS
+    )
+
+    kept = {(rollup.game_id, rollup.day) for rollup in rollups}
+    GameDailyRollup.objects.filter(
+        pk__in=[
+            pk for pk, game_id, day in
+            GameDailyRollup.objects.filter(day__gte=start, day__lte=end).values_list('pk', 'game_id', 'day')
+            if (game_id, day) not in kept
+        ]
+    ).delete()
+    return len(rollups)
+
+def reconcile_users(user_ids, batch_size=1000):
+    """
+    Recompute per-(user, game) rollups for the given users from raw scores.
+    Returns the number of rows written.
+    """
+    user_ids = list(user_ids)
+    rows = (
+        GameScore.objects.filter(completed=True, user_id__in=user_ids)
+        .values('user_id', 'game_id')
+        .annotate(
+            first_played_at=Min('played_at'),
+            last_played_at=Max('played_at'),
+            **_aggregates()
+        )
+        .order_by()
+    )
+    rollups = [UserGameRollup(**row) for row in rows]
+    UserGameRollup.objects.bulk_create(
+        rollups,
+        batch_size=batch_size,
+        update_conflicts=True,
+        unique_fields=['user', 'game'],
+        update_fields=ROLLUP_FIELDS + ['first_played_at', 'last_played_at']
+    )
+
+    kept = {(rollup.user_id, rollup.game_id) for rollup in rollups}
+    UserGameRollup.objects.filter(
+        pk__in=[
+            pk for pk, user_id, game_id in
+            UserGameRollup.objects.filter(user_id__in=user_ids).values_list('pk', 'user_id', 'game_id')
+            if (user_id, game_id) not in kept
+        ]
+    ).delete()
+    return len(rollups)
+
+def reconcile_recent(days=2, user_chunk_size=500):
+    """
+    Nightly drift repair: recompute the last ``days`` full days of daily
+    rollups and the per-user rollups of everyone who played in that window.
+    """
+    today = timezone.localdate()
+    start, end = today - timedelta(days=days), today - timedelta(days=1)
+    written = reconcile_days(start, end)
+
+    user_ids = list(
+        GameScore.objects.filter(completed=True, played_at__date__gte=start, played_at__date__lte=end)
+        .order_by()
+        .values_list('user_id', flat=True)
+        .distinct()
+    )
+    for offset in range(0, len(user_ids), user_chunk_size):
+        written += reconcile_users(user_ids[offset:offset + user_chunk_size])
+    return written
@@ -0,0 +1,62 @@
+# Backend/Apps/Games/running_stats.py
+
+"""
+Order-dependent running statistics of a user's scores on a game.
+
+Count, best score, mean and variance are additive and live in the
+``UserGameRollup`` columns maintained by ``apps.games.rollups``. The
+latest score, an exponential moving average and a consecutive-day streak
+depend on the order scores arrive in, so ``rollups.record_scores`` folds
+each new score in with ``apply`` under the row lock it already takes.
+Profile and analysis code read the rollup row directly instead of
+aggregating the user's score history.
+"""
+
+from datetime import timedelta
+
+from django.db import transaction
+from django.utils import timezone
+
+from .models import GameScore, UserGameRollup
+
+# Weight of the newest score in the exponential moving average
+EMA_ALPHA = 0.2
+
+RUNNING_FIELDS = ['last_score', 'score_ema', 'current_streak', 'longest_streak', 'last_played_on']
+
+def apply(rollup, score, played_on):
+    """Fold one score into the running fields of a ``UserGameRollup`` in place."""
+    if rollup.score_ema is None:
+        rollup.score_ema = float(score)
+    else:
+        rollup.score_ema += EMA_ALPHA * (score - rollup.score_ema)
+    rollup.last_score = score
+
+    last = rollup.last_played_on
+    if last is None or played_on > last:
+        rollup.current_streak = rollup.current_streak + 1 if last == played_on - timedelta(days=1) else 1
+        rollup.longest_streak = max(rollup.longest_streak, rollup.current_streak)
+        rollup.last_played_on = played_on
+    return rollup
+
+def rebuild(user_id, game_id):
+    """
+    Recompute a user's running statistics for a game by replaying their
+    completed scores in play order. Returns the rollup, or None if the user
+    has no rollup row for the game.
+    """
+    rows = (
+        GameScore.objects.filter(user_id=user_id, game_id=game_id, completed=True)
+        .order_by('played_at', 'id')
+        .values_list('score', 'played_at')
+    )
+    with transaction.atomic():
+        rollup = UserGameRollup.objects.select_for_update().filter(user_id=user_id, game_id=game_id).first()
+        if rollup is None:
+            return None
+        for name in RUNNING_FIELDS:
+            setattr(rollup, name, UserGameRollup._meta.get_field(name).get_default())
+        for score, played_at in rows.iterator():
+            apply(rollup, score, timezone.localdate(played_at))
+        rollup.save(update_fields=RUNNING_FIELDS)
+    return rollup
@@ -1,5 +1,9 @@
 from rest_framework import serializers
-from .models import Game, GameScore, GameProgress, GameConfig
+from rest_framework.exceptions import ValidationError
+from . import registry, trials as trial_store
+from .models import (
+    Game, GameScore, GameProgress, GameConfig, GameDailyRollup, UserGameRollup, GameTrialSet
+)
 from drf_spectacular.utils import extend_schema
 from rest_framework import viewsets
 
@@ -11,14 +15,132 @@ class GameSerializer(serializers.ModelSerializer):
         model = Game
         fields = '__all__'
 
+class GamePrimaryKeyField(serializers.PrimaryKeyRelatedField):
+    """
+    Game foreign key that resolves against a preloaded ``games`` mapping in
+    the serializer context when present, so a batch of rows costs a single
+    lookup query instead of one per row.
+    """
+    def to_internal_value(self, data):
+        games = self.context.get('games')
+        if games is None:
+            return super().to_internal_value(data)
+
+        if isinstance(data, bool):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        try:
+            pk = int(data)
+        except (TypeError, ValueError):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+
+        game = games.get(pk)
+        if game is None:
+            self.fail('does_not_exist', pk_value=data)
+        return game
+
+class GameTrialsSerializer(serializers.Serializer):
+    """
+    Per-trial telemetry submitted with a score. Stored packed in
+    ``GameTrialSet`` rather than in the score metadata.
+    """
+    reaction_times = serializers.ListField(
+        child=serializers.FloatField(min_value=0),
+        max_length=trial_store.MAX_TRIALS
+    )
+    correct = serializers.ListField(
+        child=serializers.BooleanField(),
+        max_length=trial_store.MAX_TRIALS
+    )
+
+    def validate(self, data):
+        if len(data['reaction_times']) != len(data['correct']):
+            raise serializers.ValidationError(
+                "reaction_times and correct must have the same length"
+            )
+        return data
+
+class GameScoreListSerializer(serializers.ListSerializer):
+    """
+    List serializer for batch score ingestion.
+
+    Each row is validated on its own so a bad row does not reject the whole
+    batch. Per-row errors are kept in ``row_errors`` (aligned with the input)
+    and the valid rows are written with a single ``bulk_create``.
+    """
+    def to_internal_value(self, data):
+        if not isinstance(data, list):
+            raise ValidationError({
+                'non_field_errors': ['Expected a list of score rows.']
+            })
+        if self.max_length is not None and len(data) > self.max_length:
+            raise ValidationError({
+                'non_field_errors': [f'Ensure this batch has no more than {self.max_length} rows.']
+            })
+
+        self.row_errors = []
+        valid_rows = []
+        for item in data:
+            try:
+                valid_rows.append(self.run_child_validation(item))
+                self.row_errors.append({})
+            except ValidationError as exc:
+                self.row_errors.append(exc.detail)
+        return valid_rows
+
+    def create(self, validated_data):
+        trials = [row.pop('trials', None) for row in validated_data]
+        scores = GameScore.objects.bulk_create(
+            [GameScore(**row) for row in validated_data],
+            batch_size=500
+        )
+        trial_sets = [
+            trial_store.build(score, **row_trials)
+            for score, row_trials in zip(scores, trials)
+            if row_trials
+        ]
+        if trial_sets:
+            GameTrialSet.objects.bulk_create(trial_sets, batch_size=500)
+        return scores
+
 class GameScoreSerializer(serializers.ModelSerializer):
     """
     Serializer for GameScore model to handle game results.
     """
+    game = GamePrimaryKeyField(queryset=Game.objects.all())
+    trials = GameTrialsSerializer(write_only=True, required=False)
+
     class Meta:
         model = GameScore
-        fields = ['id', 'user', 'game', 'score', 'completion_time', 'metadata', 'completed', 'played_at']
+        fields = ['id', 'user', 'game', 'score', 'completion_time', 'metadata', 'completed', 'played_at',
+                 'trials']
         read_only_fields = ['user', 'played_at']
+        list_serializer_class = GameScoreListSerializer
+
+    def validate(self, data):
+        # Scores posted to a game's endpoint belong to that game
+        game = self.context.get('game')
+        if game is not None:
+            if 'game' in data and data['game'].pk != game.pk:
+                raise serializers.ValidationError({
+                    'game': ["Game does not match the game being scored."]
+                })
+            data['game'] = game
+
+        score_range = registry.score_range(data['game']) if 'game' in data else None
+        if score_range and 'score' in data:
+            min_score, max_score = score_range
+            if not min_score <= data['score'] <= max_score:
+                raise serializers.ValidationError({
+                    'score': [f"Score must be between {min_score} and {max_score}."]
+                })
+        return data
+
+    def create(self, validated_data):
+        trials = validated_data.pop('trials', None)
+        score = super().create(validated_data)
+        if trials:
+            trial_store.save(score, **trials)
+        return score
 
 class GameProgressSerializer(serializers.ModelSerializer):
     """
@@ -30,6 +152,41 @@ class GameProgressSerializer(serializers.ModelSerializer):
                  'time_spent', 'last_played', 'completed']
 
 
+class GameProgressHeartbeatSerializer(serializers.Serializer):
+    """
+    Serializer for buffered progress heartbeats. ``time_spent`` is the
+    number of seconds played since the previous heartbeat.
+    """
+    time_spent = serializers.IntegerField(min_value=0, default=0)
+    current_score = serializers.IntegerField(required=False)
+    current_level = serializers.IntegerField(min_value=1, required=False)
+    completed = serializers.BooleanField(required=False)
+
+class GameDailyRollupSerializer(serializers.ModelSerializer):
+    """
+    Serializer for per-day game score rollups.
+    """
+    mean_score = serializers.ReadOnlyField()
+    score_variance = serializers.ReadOnlyField()
+
+    class Meta:
+        model = GameDailyRollup
+        fields = ['day', 'count', 'best_score', 'mean_score', 'score_variance',
+                 'total_completion_time']
+
+class UserGameRollupSerializer(serializers.ModelSerializer):
+    """
+    Serializer for a user's aggregate results on a game.
+    """
+    mean_score = serializers.ReadOnlyField()
+    score_variance = serializers.ReadOnlyField()
+
+    class Meta:
+        model = UserGameRollup
+        fields = ['game', 'count', 'best_score', 'mean_score', 'score_variance',
+                 'total_completion_time', 'first_played_at', 'last_played_at',
+                 'last_score', 'score_ema', 'current_streak', 'longest_streak', 'last_played_on']
+
 class GameConfigSerializer(serializers.ModelSerializer):
     """
     Serializer for GameConfig model to handle game settings.
@@ -1,10 +1,62 @@
-from django.db.models.signals import post_save
+import logging
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
-from .models import GameScore
+from .models import Game, GameConfig, GameScore
+from . import leaderboards, registry, rollups
+
+logger = logging.getLogger(__name__)
+
+def process_completed_scores(scores):
+    """
+    Run game completion logic for a batch of newly created, completed scores.
+
+    Shared by the ``post_save`` handler (one score) and batch ingestion,
+    which bypasses ``post_save`` because ``bulk_create`` does not send it.
+    """
+    scores = [score for score in scores if score.completed]
+    if not scores:
+        return
+
+    rollups.record_scores(scores)
+
+    try:
+        leaderboards.record_scores(scores)
+    except Exception as e:
+        # Leaderboards can be rebuilt from the database, never fail the write
+        logger.error(f"Leaderboard update failed: {str(e)}")
+
+def process_committed_scores(scores):
+    """
+    ``process_completed_scores`` for rows that are already committed, e.g.
+    from ``transaction.on_commit``. Errors are logged instead of raised,
+    since failing the request would make clients resubmit saved scores;
+    rollups are repaired by the nightly reconciliation.
+    """
+    try:
+        process_completed_scores(scores)
+    except Exception:
+        logger.exception(f"Completion processing failed for {len(scores)} committed scores")
 
 @receiver(post_save, sender=GameScore)
 def handle_game_completion(sender, instance, created, **kwargs):
     """Signal to handle game completion"""
     if created and instance.completed:
-        # Add game completion logic here
-        pass 
\ No newline at end of file
+        # The score row is saved either way; a savepoint keeps a failed
+        # rollup from aborting the caller's transaction
+        try:
+            with transaction.atomic():
+                process_completed_scores([instance])
+        except Exception:
+            logger.exception(f"Completion processing failed for score {instance.pk}")
+
+@receiver(post_save, sender=Game)
+@receiver(post_delete, sender=Game)
+@receiver(post_save, sender=GameConfig)
+@receiver(post_delete, sender=GameConfig)
+def invalidate_game_registry(sender, **kwargs):
+    """Signal to reload the game catalog in every worker"""
+    registry.invalidate()
+    # Workers may reload the old rows before the transaction commits,
+    # so bump the version again once the change is visible
+    transaction.on_commit(registry.invalidate)
@@ -0,0 +1,38 @@
+# Backend/Apps/Games/tasks.py
+
+from celery import shared_task
+from celery.utils.log import get_task_logger
+from . import norms, progress_buffer, rollups
+
+logger = get_task_logger(__name__)
+
+@shared_task
+def compute_game_norms():
+    """
+    Periodic task to recompute population norms for all active games.
+    Intended to run nightly.
+    """
+    created = norms.compute_all_norms()
+    logger.info(f"Computed {len(created)} game norm tables")
+    return len(created)
+
+@shared_task
+def flush_game_progress():
+    """
+    Periodic task to write buffered progress heartbeats to the database.
+    Intended to run every few seconds.
+    """
+    written = progress_buffer.flush()
+    if written:
+        logger.info(f"Flushed {written} buffered game progress rows")
+    return written
+
+@shared_task
+def reconcile_score_rollups():
+    """
+    Nightly task to recompute recent score rollups from raw scores,
+    repairing any drift in the incrementally maintained rows.
+    """
+    written = rollups.reconcile_recent()
+    logger.info(f"Reconciled {written} score rollup rows")
+    return written
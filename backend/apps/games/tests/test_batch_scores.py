@@ -0,0 +1,81 @@
+import pytest
+from django.urls import reverse
+from rest_framework import status
+from apps.games.models import Game, GameScore
+
+pytestmark = pytest.mark.django_db
+
+@pytest.fixture
+def game():
+    return Game.objects.create(title='Memory Match')
+
+class TestBatchScoreIngestion:
+    def test_batch_creates_all_valid_rows(self, auth_client, game):
+        client, user = auth_client
+        url = reverse('games:game-record-scores')
+        rows = [
+            {'game': game.id, 'score': score, 'completed': True}
+            for score in range(5)
+        ]
+        response = client.post(url, {'scores': rows}, format='json')
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.data['metadata'] == {'created': 5, 'failed': 0}
+        assert GameScore.objects.filter(user=user, game=game).count() == 5
+
+    def test_batch_reports_per_row_errors(self, auth_client, game):
+        client, user = auth_client
+        url = reverse('games:game-record-scores')
+        rows = [
+            {'game': game.id, 'score': 10},
+            {'game': game.id},
+            {'game': 999999, 'score': 5},
+        ]
+        response = client.post(url, rows, format='json')
+
+        assert response.status_code == status.HTTP_201_CREATED
+        results = response.data['data']['results']
+        assert [row['success'] for row in results] == [True, False, False]
+        assert 'score' in results[1]['errors']
+        assert 'game' in results[2]['errors']
+        assert GameScore.objects.filter(user=user).count() == 1
+
+    def test_batch_with_no_valid_rows_is_rejected(self, auth_client, game):
+        client, user = auth_client
+        url = reverse('games:game-record-scores')
+        response = client.post(url, [{'game': game.id}], format='json')
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert not GameScore.objects.exists()
+
+    def test_completion_errors_do_not_fail_saved_batch(self, auth_client, game, monkeypatch,
+                                                       django_capture_on_commit_callbacks):
+        client, user = auth_client
+
+        def fail(scores):
+            raise RuntimeError('rollup store unavailable')
+        monkeypatch.setattr('apps.games.signals.process_completed_scores', fail)
+
+        rows = [{'game': game.id, 'score': 10, 'completed': True}]
+        with django_capture_on_commit_callbacks(execute=True) as callbacks:
+            response = client.post(reverse('games:game-record-scores'), {'scores': rows}, format='json')
+
+        assert len(callbacks) == 1
+        assert response.status_code == status.HTTP_201_CREATED
+        assert GameScore.objects.filter(user=user, game=game).count() == 1
+
+    def test_completion_errors_do_not_fail_saved_score(self, auth_client, game, monkeypatch):
+        client, user = auth_client
+
+        def fail(scores):
+            raise RuntimeError('rollup store unavailable')
+        monkeypatch.setattr('apps.games.rollups.record_scores', fail)
+
+        response = client.post(
+            reverse('games:game-record-score', args=[game.id]),
+            {'game': game.id, 'score': 10, 'completed': True},
+            format='json'
+        )
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert GameScore.objects.filter(user=user, game=game).count() == 1
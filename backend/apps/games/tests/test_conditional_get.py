@@ -0,0 +1,59 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from apps.games.models import Game, GameConfig
+
+pytestmark = pytest.mark.django_db
+
+@pytest.fixture
+def game():
+    return Game.objects.create(title='N-Back')
+
+class TestConditionalGet:
+    def test_game_list_not_modified(self, api_client, game):
+        url = reverse('games:game-list')
+        response = api_client.get(url)
+        etag = response['ETag']
+        assert response.status_code == status.HTTP_200_OK
+        assert 'Last-Modified' not in response
+
+        with CaptureQueriesContext(connection) as queries:
+            cached = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert cached.status_code == status.HTTP_304_NOT_MODIFIED
+        assert cached['ETag'] == etag
+        assert not cached.content
+        assert len(queries) == 0
+
+    def test_etag_changes_with_content_and_query(self, api_client, game):
+        url = reverse('games:game-list')
+        etag = api_client.get(url)['ETag']
+        assert api_client.get(url, {'category': 'memory'})['ETag'] != etag
+
+        game.title = 'Dual N-Back'
+        game.save()
+        response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
+        assert response['ETag'] != etag
+
+    def test_if_modified_since_alone_is_not_trusted(self, api_client, game):
+        url = reverse('games:game-list')
+        Game.objects.create(title='Stroop').delete()
+        response = api_client.get(url, HTTP_IF_MODIFIED_SINCE='Fri, 01 Jan 2100 00:00:00 GMT')
+        assert response.status_code == status.HTTP_200_OK
+
+    def test_game_config_list_not_modified(self, auth_client):
+        client, user = auth_client
+        GameConfig.objects.create(
+            game_id='n-back', title='N-Back', description='', instructions='',
+            max_score=10, difficulty='easy', category='memory'
+        )
+        url = reverse('games:game-config-list')
+        etag = client.get(url)['ETag']
+
+        assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == status.HTTP_304_NOT_MODIFIED
+        config = GameConfig.objects.get()
+        config.max_score = 20
+        config.save()
+        assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == status.HTTP_200_OK
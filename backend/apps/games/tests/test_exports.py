@@ -0,0 +1,70 @@
+import csv
+import gzip
+import io
+import json
+from datetime import timedelta
+
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from apps.games import exports
+from apps.games.models import Game, GameScore
+
+pytestmark = pytest.mark.django_db
+
+@pytest.fixture
+def scores(test_user):
+    game = Game.objects.create(title='Stroop')
+    other = Game.objects.create(title='N-Back')
+    now = timezone.now()
+    GameScore.objects.bulk_create([
+        GameScore(user=test_user, game=game, score=10, completed=True,
+                  completion_time=timedelta(seconds=42), played_at=now - timedelta(days=3)),
+        GameScore(user=test_user, game=game, score=20, completed=False, played_at=now),
+        GameScore(user=test_user, game=other, score=30, completed=True,
+                  metadata={'level': 2}, played_at=now),
+    ])
+    return game, other
+
+@pytest.fixture
+def staff_client(auth_client):
+    client, user = auth_client
+    user.is_staff = True
+    user.save()
+    return client
+
+class TestScoreExport:
+    def test_ndjson_export(self, scores):
+        lines = b''.join(exports.stream_export(exports.export_queryset())).decode().splitlines()
+        rows = [json.loads(line) for line in lines]
+        assert [row['score'] for row in rows] == [10, 20, 30]
+        assert rows[0]['completion_time'] == 42.0
+        assert rows[2]['metadata'] == {'level': 2}
+
+    def test_gzipped_csv_export(self, scores):
+        data = b''.join(exports.stream_export(
+            exports.export_queryset(completed=True),
+            fmt=exports.FORMAT_CSV,
+            compress=True
+        ))
+        rows = list(csv.DictReader(io.StringIO(gzip.decompress(data).decode())))
+        assert [row['score'] for row in rows] == ['10', '30']
+
+    def test_filters(self, scores):
+        game, other = scores
+        since = timezone.now() - timedelta(days=1)
+        queryset = exports.export_queryset(game_ids=[game.id], since=since)
+        assert [row[3] for row in queryset] == [20]
+
+    def test_export_endpoint(self, staff_client, scores):
+        url = reverse('games:score-export')
+        response = staff_client.get(url, {'output': 'csv', 'completed': 'true'})
+        assert response.status_code == status.HTTP_200_OK
+        body = b''.join(response.streaming_content).decode()
+        assert len(body.splitlines()) == 3
+
+    def test_export_requires_staff(self, auth_client, scores):
+        client, user = auth_client
+        response = client.get(reverse('games:score-export'))
+        assert response.status_code == status.HTTP_403_FORBIDDEN
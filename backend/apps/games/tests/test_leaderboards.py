@@ -0,0 +1,93 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework import status
+from apps.games import leaderboards
+from apps.games.models import Game, GameScore
+from mindmodel.core.utils import LocalRedis
+
+pytestmark = pytest.mark.django_db
+
+User = get_user_model()
+
+@pytest.fixture(autouse=True)
+def local_redis(monkeypatch):
+    client = LocalRedis()
+    monkeypatch.setattr(leaderboards, '_client', client)
+    return client
+
+@pytest.fixture
+def game():
+    return Game.objects.create(title='Reaction Time')
+
+@pytest.fixture
+def players(game):
+    users = []
+    for index, score in enumerate([40, 90, 70, 10, 60]):
+        user = User.objects.create_user(
+            username=f'player{index}',
+            email=f'player{index}@example.com',
+            password='testpass123'
+        )
+        GameScore.objects.create(user=user, game=game, score=score, completed=True)
+        users.append(user)
+    return users
+
+class TestLeaderboards:
+    def test_completed_scores_are_ranked(self, game, players):
+        entries = leaderboards.top(game.id, limit=3)
+        assert [entry['score'] for entry in entries] == [90, 70, 60]
+        assert [entry['rank'] for entry in entries] == [1, 2, 3]
+
+    def test_only_best_score_is_kept(self, game, players):
+        GameScore.objects.create(user=players[3], game=game, score=5, completed=True)
+        GameScore.objects.create(user=players[3], game=game, score=80, completed=True)
+        position = leaderboards.rank(game.id, players[3].id)
+        assert position['score'] == 80
+        assert position['rank'] == 2
+
+    def test_incomplete_scores_are_ignored(self, game, players):
+        GameScore.objects.create(user=players[0], game=game, score=999, completed=False)
+        assert leaderboards.rank(game.id, players[0].id)['score'] == 40
+
+    def test_around_returns_neighbours(self, game, players):
+        entries = leaderboards.around(game.id, players[4].id, radius=1)
+        assert [entry['score'] for entry in entries] == [70, 60, 40]
+
+    def test_daily_window(self, game, players):
+        entries = leaderboards.top(game.id, window=leaderboards.WINDOW_DAILY)
+        assert len(entries) == 5
+
+    def test_rebuild_restores_sets(self, game, players, local_redis):
+        local_redis.flushall()
+        assert leaderboards.top(game.id) == []
+
+        call_command('rebuild_leaderboards')
+        assert [entry['score'] for entry in leaderboards.top(game.id, limit=2)] == [90, 70]
+        assert leaderboards.rank(game.id, players[3].id)['rank'] == 5
+
+    def test_leaderboard_endpoints(self, auth_client, game, players):
+        client, user = auth_client
+        GameScore.objects.create(user=user, game=game, score=65, completed=True)
+
+        response = client.get(reverse('games:game-leaderboard', args=[game.id]), {'limit': 2})
+        assert response.status_code == status.HTTP_200_OK
+        assert [entry['username'] for entry in response.data['data']] == ['player1', 'player2']
+
+        response = client.get(reverse('games:game-leaderboard-me', args=[game.id]), {'radius': 1})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['data']['position']['rank'] == 3
+        assert len(response.data['data']['neighbours']) == 3
+
+    def test_ties_are_ordered_like_redis(self, local_redis):
+        local_redis.zadd('board', {'1': 50, '2': 50, '3': 70})
+        assert local_redis.zrevrange('board', 0, -1) == ['3', '2', '1']
+        assert local_redis.zrevrank('board', '2') == 1
+        assert local_redis.zrevrange('board', 1, 1) == ['2']
+
+    def test_rebuild_drops_sets_without_rows(self, game, players):
+        GameScore.objects.filter(game=game).delete()
+        leaderboards.rebuild()
+        assert leaderboards.top(game.id) == []
+        assert leaderboards.top(game.id, window=leaderboards.WINDOW_DAILY) == []
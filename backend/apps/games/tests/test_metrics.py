@@ -0,0 +1,92 @@
+from datetime import timedelta
+
+import numpy as np
+import pytest
+from django.utils import timezone
+from apps.games import metrics, trials
+from apps.games.models import Game, GameScore
+
+pytestmark = pytest.mark.django_db
+
+def _synthetic(seed=3, n_groups=40):
+    rng = np.random.default_rng(seed)
+    session_group = rng.integers(0, n_groups, 400)
+    trial_group = np.repeat(session_group, 25)
+    return metrics.SessionArrays(
+        n_groups=n_groups,
+        session_group=session_group,
+        session_time=rng.uniform(0, 1e6, session_group.size),
+        session_score=rng.integers(0, 100, session_group.size).astype(float),
+        trial_group=trial_group,
+        reaction_times=rng.uniform(200, 900, trial_group.size).astype(np.float32),
+        correct=rng.random(trial_group.size) < 0.8,
+    )
+
+class TestMetricsEngine:
+    def test_matches_per_group_reference(self):
+        data = _synthetic()
+        results = metrics.compute(data)
+
+        for group in range(data.n_groups):
+            in_group = data.trial_group == group
+            rt = data.reaction_times[in_group & data.correct].astype(float)
+            accuracy = data.correct[in_group].mean()
+            q25, median, q75 = np.percentile(rt, [25, 50, 75])
+            assert results['accuracy'][group] == pytest.approx(accuracy)
+            assert results['median_rt'][group] == pytest.approx(median)
+            assert results['rt_iqr'][group] == pytest.approx(q75 - q25)
+            assert results['inverse_efficiency'][group] == pytest.approx(rt.mean() / accuracy)
+            assert results['rt_variability'][group] == pytest.approx(rt.std() / rt.mean())
+
+            sessions = np.flatnonzero(data.session_group == group)
+            scores = data.session_score[sessions[np.argsort(data.session_time[sessions])]]
+            slope = np.polyfit(np.arange(scores.size), scores, 1)[0]
+            assert results['learning_slope'][group] == pytest.approx(slope)
+
+    def test_groups_without_data_are_nan(self):
+        data = metrics.SessionArrays(
+            n_groups=2,
+            session_group=np.array([0]),
+            session_time=np.array([0.0]),
+            session_score=np.array([10.0]),
+            trial_group=np.array([0, 0]),
+            reaction_times=np.array([300, 400], dtype=np.float32),
+            correct=np.array([False, False]),
+        )
+        results = metrics.compute(data)
+        assert results['accuracy'][0] == 0
+        assert np.isnan(results['median_rt'][0])
+        assert np.isnan(results['learning_slope'][0])
+        assert results['sessions'][1] == 0
+        assert metrics.metrics_row(results, 1)['accuracy'] is None
+
+class TestUserMetrics:
+    def test_user_history_across_games(self, test_user):
+        reaction, memory = Game.objects.create(title='Reaction'), Game.objects.create(title='Memory')
+        start = timezone.now() - timedelta(days=10)
+        for day, score in enumerate([10, 20, 30]):
+            session = GameScore.objects.create(
+                user=test_user, game=reaction, score=score, completed=True
+            )
+            GameScore.objects.filter(pk=session.pk).update(played_at=start + timedelta(days=day))
+            trials.save(session, [300.0, 400.0, 500.0, 600.0], [True, True, True, False])
+        GameScore.objects.create(user=test_user, game=memory, score=7, completed=True)
+        GameScore.objects.create(user=test_user, game=memory, score=99, completed=False)
+
+        results = metrics.user_metrics(test_user.id)
+
+        assert results[reaction.id]['sessions'] == 3
+        assert results[reaction.id]['accuracy'] == 0.75
+        assert results[reaction.id]['median_rt'] == 400.0
+        assert results[reaction.id]['learning_slope'] == 10.0
+        assert results[memory.id]['sessions'] == 1
+        assert results[memory.id]['mean_score'] == 7.0
+        assert results[memory.id]['median_rt'] is None
+
+    def test_cohort_keys(self, test_user):
+        game = Game.objects.create(title='Reaction')
+        GameScore.objects.create(user=test_user, game=game, score=5, completed=True)
+
+        keys, results = metrics.cohort_metrics(game_ids=[game.id])
+        assert keys == [(test_user.id, game.id)]
+        assert results['sessions'].tolist() == [1]
@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.urls import reverse
+from apps.games import norms
+from apps.games.models import Game, GameNorm, GameScore
+
+User = get_user_model()
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+
+class TestPercentileTable:
+    def test_uniform_scores(self):
+        table = norms.build_table(np.arange(100))
+        assert norms.percentile_from_table(table, 0) == 0
+        assert norms.percentile_from_table(table, 50) == 50
+        assert norms.percentile_from_table(table, 99) == 100
+
+    def test_out_of_range_scores_are_clamped(self):
+        table = norms.build_table([10, 20, 30])
+        assert norms.percentile_from_table(table, -5) == 0
+        assert norms.percentile_from_table(table, 500) == 100
+
+    def test_wide_ranges_use_wider_bins(self):
+        table = norms.build_table([0, 1_000_000], max_bins=100)
+        assert len(table['percentiles']) <= 100
+        assert table['bin_width'] > 1
+
+@pytest.mark.django_db
+class TestGameNorms:
+    @pytest.fixture
+    def game(self, test_user):
+        game = Game.objects.create(title='Digit Span')
+        GameScore.objects.bulk_create([
+            GameScore(
+                user=test_user,
+                game=game,
+                score=score,
+                completed=True,
+                metadata={'difficulty': 'hard' if score % 2 else 'easy'}
+            )
+            for score in range(100)
+        ])
+        return game
+
+    def test_compute_creates_versioned_norms(self, game):
+        created = norms.compute_game_norms(game, min_sample_size=10)
+        assert {norm.difficulty for norm in created} == {'', 'easy', 'hard'}
+
+        norms.compute_game_norms(game, min_sample_size=10)
+        versions = GameNorm.objects.filter(game=game, difficulty='').values_list('version', flat=True)
+        assert sorted(versions) == [1, 2]
+
+    def test_percentile_lookup(self, game):
+        norms.compute_game_norms(game, min_sample_size=10)
+        assert norms.get_percentile(game.id, 73) == 74
+        assert norms.get_percentile(game.id, 73, 'medium') == 74
+
+    def test_missing_norms(self, game):
+        assert norms.get_percentile(game.id, 50) is None
+
+    def test_record_score_with_non_object_metadata(self, auth_client, game):
+        client, _ = auth_client
+        norms.compute_game_norms(game, min_sample_size=10)
+        response = client.post(
+            reverse('games:game-record-score', args=[game.id]),
+            {'game': game.id, 'score': 73, 'completed': True, 'metadata': [1, 2]},
+            format='json'
+        )
+        assert response.status_code == 201
+        assert response.data['metadata']['percentile'] == 74
@@ -0,0 +1,117 @@
+import pytest
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework import status
+from apps.games import progress_buffer
+from apps.games.models import GameProgress
+
+pytestmark = pytest.mark.django_db
+
+@pytest.fixture(autouse=True)
+def clear_cache(settings):
+    # The test cache is process-local; buffer anyway to exercise flushing
+    settings.GAME_PROGRESS_BUFFER = True
+    cache.clear()
+
+@pytest.fixture
+def progress(test_user):
+    return GameProgress.objects.create(user=test_user, game_id='memory', time_spent=100)
+
+class TestProgressBuffer:
+    def test_heartbeats_are_coalesced(self, progress):
+        progress_buffer.record(progress.id, time_spent=5, current_score=10)
+        progress_buffer.record(progress.id, time_spent=7, current_score=30, current_level=2)
+
+        progress.refresh_from_db()
+        assert progress.time_spent == 100
+
+        assert progress_buffer.flush() == 1
+        progress.refresh_from_db()
+        assert progress.time_spent == 112
+        assert progress.current_score == 30
+        assert progress.current_level == 2
+
+    def test_flush_is_idempotent(self, progress):
+        progress_buffer.record(progress.id, time_spent=5)
+        progress_buffer.flush()
+        assert progress_buffer.flush() == 0
+        progress.refresh_from_db()
+        assert progress.time_spent == 105
+
+    def test_heartbeats_after_flush_are_kept(self, progress):
+        progress_buffer.record(progress.id, time_spent=5)
+        progress_buffer.flush()
+        progress_buffer.record(progress.id, time_spent=3)
+        progress_buffer.flush()
+        progress.refresh_from_db()
+        assert progress.time_spent == 108
+
+    def test_stale_log_gap_does_not_block_flush(self, progress, monkeypatch):
+        # A writer that claimed sequence number 1 and died before logging it
+        cache.set(f"{progress_buffer.PREFIX}:seq", 1, timeout=None)
+        progress_buffer.record(progress.id, time_spent=5)
+
+        assert progress_buffer.flush() == 0
+        monkeypatch.setattr(progress_buffer, 'LOG_GAP_GRACE', 0)
+        assert progress_buffer.flush() == 1
+        progress.refresh_from_db()
+        assert progress.time_spent == 105
+
+    def test_process_local_cache_writes_through(self, progress, settings):
+        settings.GAME_PROGRESS_BUFFER = None
+        assert not progress_buffer.buffering_enabled()
+        progress_buffer.record(progress.id, time_spent=5, current_score=10)
+        progress.refresh_from_db()
+        assert progress.time_spent == 105
+        assert progress.current_score == 10
+        assert progress_buffer.flush() == 0
+
+    def test_shared_cache_enables_buffering(self, settings):
+        settings.GAME_PROGRESS_BUFFER = None
+        settings.CACHES = {'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': 'redis://localhost:6379/1',
+        }}
+        assert progress_buffer.buffering_enabled()
+
+    def test_overlay_merges_pending_state(self, progress):
+        progress_buffer.record(progress.id, time_spent=20, completed=True)
+        merged = progress_buffer.overlay([progress])[0]
+        assert merged.time_spent == 120
+        assert merged.completed is True
+
+class TestProgressHeartbeatEndpoint:
+    def test_heartbeat_then_read(self, auth_client, progress):
+        client, user = auth_client
+        url = reverse('games:game-progress-heartbeat', args=[progress.id])
+        response = client.post(url, {'time_spent': 15, 'current_score': 40}, format='json')
+        assert response.status_code == status.HTTP_202_ACCEPTED
+
+        response = client.get(reverse('games:game-progress-detail', args=[progress.id]))
+        assert response.data['time_spent'] == 115
+        assert response.data['current_score'] == 40
+
+        response = client.get(reverse('games:game-progress-list'))
+        assert response.data['data']['items'][0]['time_spent'] == 115
+
+    def test_update_flushes_buffer_first(self, auth_client, progress):
+        client, user = auth_client
+        progress_buffer.record(progress.id, time_spent=15)
+        url = reverse('games:game-progress-detail', args=[progress.id])
+        response = client.patch(url, {'current_level': 3}, format='json')
+        assert response.status_code == status.HTTP_200_OK
+
+        progress.refresh_from_db()
+        assert progress.time_spent == 115
+        assert progress.current_level == 3
+        assert progress_buffer.flush() == 0
+
+    def test_heartbeat_for_other_users_row(self, auth_client, django_user_model):
+        client, user = auth_client
+        other = django_user_model.objects.create_user(
+            username='other', email='other@example.com', password='testpass123'
+        )
+        progress = GameProgress.objects.create(user=other, game_id='memory')
+        url = reverse('games:game-progress-heartbeat', args=[progress.id])
+        response = client.post(url, {'time_spent': 15}, format='json')
+        assert response.status_code == status.HTTP_404_NOT_FOUND
@@ -0,0 +1,95 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from apps.games import registry
+from apps.games.models import Game, GameConfig, GameScore
+
+pytestmark = pytest.mark.django_db
+
+@pytest.fixture
+def game():
+    return Game.objects.create(title='Stroop', config={'category': 'attention'})
+
+@pytest.fixture
+def game_config(game):
+    return GameConfig.objects.create(
+        game_id=str(game.id),
+        title='Stroop',
+        description='Colour words',
+        instructions='Name the ink colour',
+        min_score=0,
+        max_score=100,
+        difficulty='easy',
+        category='attention'
+    )
+
+class TestGameRegistry:
+    def test_lookups_after_load_are_query_free(self, game, game_config):
+        registry.snapshot()
+        with CaptureQueriesContext(connection) as queries:
+            assert registry.get_game(game.id) == game
+            assert registry.get_config_by_game_id(game.id) == game_config
+            assert registry.score_range(game) == (0, 100)
+        assert len(queries) == 0
+
+    def test_explicit_mapping_and_unmatched_games_are_logged(self, game, game_config, caplog):
+        renamed = Game.objects.create(title='Stroop v2', config={'game_id': game_config.game_id})
+        orphan = Game.objects.create(title='Flanker')
+
+        with caplog.at_level('WARNING', logger='apps.games.registry'):
+            assert registry.config_for_game(renamed) == game_config
+            assert registry.config_for_game(orphan) is None
+
+        [record] = caplog.records
+        assert "'Flanker'" in record.getMessage()
+        assert 'Stroop' not in record.getMessage()
+
+    def test_save_and_delete_invalidate(self, game):
+        assert registry.get_game(game.id).title == 'Stroop'
+
+        game.title = 'Stroop Task'
+        game.save()
+        assert registry.get_game(game.id).title == 'Stroop Task'
+
+        game.delete()
+        assert registry.get_game(game.id) is None
+
+    def test_version_change_from_another_worker_reloads(self, game):
+        registry.snapshot()
+        Game.objects.filter(pk=game.pk).update(is_active=False)
+        assert registry.get_game(game.id) is not None
+
+        registry.cache.set(registry.VERSION_KEY, 'changed-elsewhere')
+        assert registry.get_game(game.id) is None
+
+    def test_list_and_retrieve_are_query_free(self, api_client, game):
+        api_client.get(reverse('games:game-list'))
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.get(reverse('games:game-list'), {'category': 'attention'})
+            detail = api_client.get(reverse('games:game-detail', args=[game.id]))
+
+        assert len(queries) == 0
+        assert [row['id'] for row in response.data['data']] == [game.id]
+        assert detail.data['title'] == 'Stroop'
+
+    def test_record_score_outside_config_range(self, auth_client, game, game_config):
+        client, user = auth_client
+        url = reverse('games:game-record-score', args=[game.id])
+
+        response = client.post(url, {'game': game.id, 'score': 101}, format='json')
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert not GameScore.objects.exists()
+
+        response = client.post(url, {'game': game.id, 'score': 100}, format='json')
+        assert response.status_code == status.HTTP_201_CREATED
+
+    def test_record_score_for_another_game_is_rejected(self, auth_client, game, game_config):
+        client, user = auth_client
+        other = Game.objects.create(title='Flanker')
+        url = reverse('games:game-record-score', args=[game.id])
+
+        response = client.post(url, {'game': other.id, 'score': 5000}, format='json')
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert not GameScore.objects.exists()
@@ -0,0 +1,87 @@
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from apps.games import rollups
+from apps.games.models import Game, GameDailyRollup, GameScore, UserGameRollup
+
+pytestmark = pytest.mark.django_db
+
+@pytest.fixture
+def game():
+    return Game.objects.create(title='Trail Making')
+
+def record(user, game, score, **kwargs):
+    return GameScore.objects.create(user=user, game=game, score=score, completed=True, **kwargs)
+
+class TestScoreRollups:
+    def test_incremental_updates(self, test_user, game):
+        record(test_user, game, 10, completion_time=timedelta(seconds=30))
+        record(test_user, game, 20, completion_time=timedelta(seconds=40))
+        record(test_user, game, 30)
+
+        rollup = UserGameRollup.objects.get(user=test_user, game=game)
+        assert rollup.count == 3
+        assert rollup.best_score == 30
+        assert rollup.mean_score == 20
+        assert rollup.score_variance == pytest.approx(200 / 3)
+        assert rollup.total_completion_time == timedelta(seconds=70)
+
+        daily = GameDailyRollup.objects.get(game=game, day=timezone.localdate())
+        assert daily.count == 3
+
+    def test_variance_of_large_scores_is_exact(self, test_user, game):
+        # A float sum of squares cancels to garbage at this magnitude
+        base = 10 ** 8
+        for offset in (0, 1, 2):
+            record(test_user, game, base + offset)
+
+        assert UserGameRollup.objects.get(user=test_user, game=game).score_variance == 2 / 3
+
+        rollups.reconcile_users([test_user.id])
+        assert UserGameRollup.objects.get(user=test_user, game=game).score_variance == 2 / 3
+
+    def test_incomplete_scores_are_ignored(self, test_user, game):
+        GameScore.objects.create(user=test_user, game=game, score=99, completed=False)
+        assert not UserGameRollup.objects.exists()
+
+    def test_reconcile_repairs_drift(self, test_user, game):
+        yesterday = timezone.now() - timedelta(days=1)
+        record(test_user, game, 10, played_at=yesterday)
+        record(test_user, game, 50, played_at=yesterday)
+        GameDailyRollup.objects.update(count=99, best_score=1)
+        UserGameRollup.objects.update(count=99)
+
+        rollups.reconcile_recent()
+        daily = GameDailyRollup.objects.get(game=game)
+        assert (daily.count, daily.best_score, daily.mean_score) == (2, 50, 30)
+        assert UserGameRollup.objects.get(user=test_user, game=game).count == 2
+
+    def test_backfill_matches_incremental(self, test_user, game):
+        now = timezone.now()
+        GameScore.objects.bulk_create([
+            GameScore(user=test_user, game=game, score=score, completed=True,
+                      played_at=now - timedelta(days=score))
+            for score in range(1, 11)
+        ])
+        assert not GameDailyRollup.objects.exists()
+
+        call_command('backfill_rollups', chunk_days=3, chunk_users=1)
+        assert GameDailyRollup.objects.count() == 10
+        rollup = UserGameRollup.objects.get(user=test_user, game=game)
+        assert (rollup.count, rollup.best_score, rollup.score_sum) == (10, 10, 55)
+
+    def test_stats_endpoints(self, auth_client, game):
+        client, user = auth_client
+        record(user, game, 40)
+
+        response = client.get(reverse('games:game-stats', args=[game.id]), {'days': 7})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['data'][0]['count'] == 1
+
+        response = client.get(reverse('games:game-stats-me', args=[game.id]))
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['data']['best_score'] == 40
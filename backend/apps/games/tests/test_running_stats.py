@@ -0,0 +1,76 @@
+from datetime import timedelta
+
+import numpy as np
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from apps.games import running_stats
+from apps.games.models import Game, GameScore, UserGameRollup
+
+pytestmark = pytest.mark.django_db
+
+@pytest.fixture
+def game():
+    return Game.objects.create(title='Digit Span')
+
+def record(user, game, score, days_ago=0):
+    return GameScore.objects.create(
+        user=user,
+        game=game,
+        score=score,
+        completed=True,
+        played_at=timezone.now() - timedelta(days=days_ago)
+    )
+
+class TestRunningStats:
+    def test_running_fields_match_batch_statistics(self, test_user, game):
+        scores = [12, 7, 30, 18, 25, 9]
+        for score in scores:
+            record(test_user, game, score)
+
+        stats = UserGameRollup.objects.get(user=test_user, game=game)
+        assert stats.count == len(scores)
+        assert stats.mean_score == pytest.approx(np.mean(scores))
+        assert stats.score_variance == pytest.approx(np.var(scores))
+        assert stats.best_score == 30
+        assert stats.last_score == 9
+
+        ema = scores[0]
+        for score in scores[1:]:
+            ema += running_stats.EMA_ALPHA * (score - ema)
+        assert stats.score_ema == pytest.approx(ema)
+
+    def test_daily_streak(self, test_user, game):
+        for days_ago in (5, 3, 2, 2, 1, 0):
+            record(test_user, game, 10, days_ago=days_ago)
+
+        stats = UserGameRollup.objects.get(user=test_user, game=game)
+        assert stats.current_streak == 4
+        assert stats.longest_streak == 4
+        assert stats.last_played_on == timezone.localdate()
+
+    def test_incomplete_scores_are_ignored(self, test_user, game):
+        GameScore.objects.create(user=test_user, game=game, score=5, completed=False)
+        assert not UserGameRollup.objects.exists()
+
+    def test_rebuild_matches_incremental(self, test_user, game):
+        for days_ago, score in ((4, 10), (3, 20), (1, 15)):
+            record(test_user, game, score, days_ago=days_ago)
+        incremental = UserGameRollup.objects.get(user=test_user, game=game)
+
+        UserGameRollup.objects.update(score_ema=None, current_streak=0, longest_streak=0)
+        rebuilt = running_stats.rebuild(test_user.id, game.id)
+        assert rebuilt.last_score == 15
+        assert rebuilt.score_ema == pytest.approx(incremental.score_ema)
+        assert rebuilt.current_streak == 1
+        assert rebuilt.longest_streak == 2
+
+    def test_stats_me_includes_running_stats(self, auth_client, game):
+        client, user = auth_client
+        record(user, game, 40)
+
+        response = client.get(reverse('games:game-stats-me', args=[game.id]))
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['data']['score_ema'] == 40.0
+        assert response.data['data']['current_streak'] == 1
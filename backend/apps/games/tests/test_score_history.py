@@ -0,0 +1,68 @@
+from datetime import timedelta
+
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from apps.games.models import Game, GameScore
+
+pytestmark = pytest.mark.django_db
+
+@pytest.fixture
+def history(test_user):
+    game = Game.objects.create(title='Go/No-Go')
+    played_at = timezone.now()
+    # Pairs share a timestamp so paging must tie-break on id
+    GameScore.objects.bulk_create([
+        GameScore(user=test_user, game=game, score=score,
+                  played_at=played_at - timedelta(minutes=score // 2))
+        for score in range(25)
+    ])
+    return game
+
+def fetch_all(client, url, params, direction='next', cursor=None):
+    pages = []
+    while True:
+        query = dict(params, cursor=cursor) if cursor else params
+        response = client.get(url, query)
+        assert response.status_code == status.HTTP_200_OK
+        pages.append([item['score'] for item in response.data['data']['items']])
+        cursor = response.data['data']['pagination'][direction]
+        if cursor is None:
+            return pages, response
+
+class TestScoreHistoryPagination:
+    def test_pages_cover_history_without_overlap(self, auth_client, history):
+        client, user = auth_client
+        url = reverse('games:game-score-list')
+        pages, _ = fetch_all(client, url, {'page_size': 10})
+
+        assert [len(page) for page in pages] == [10, 10, 5]
+        scores = [score for page in pages for score in page]
+        expected = list(
+            GameScore.objects.filter(user=user)
+            .order_by('-played_at', '-id')
+            .values_list('score', flat=True)
+        )
+        assert scores == expected
+
+    def test_previous_cursor_walks_back(self, auth_client, history):
+        client, user = auth_client
+        url = reverse('games:game-score-list')
+        forward, last = fetch_all(client, url, {'page_size': 10})
+        previous = last.data['data']['pagination']['previous']
+
+        backward, _ = fetch_all(client, url, {'page_size': 10}, 'previous', previous)
+        assert backward == [forward[1], forward[0]]
+
+    def test_first_page_has_no_previous(self, auth_client, history):
+        client, user = auth_client
+        response = client.get(reverse('games:game-score-list'))
+        pagination = response.data['data']['pagination']
+        assert pagination['previous'] is None
+        assert pagination['per_page'] == 10
+
+    def test_invalid_cursor(self, auth_client, history):
+        client, user = auth_client
+        response = client.get(reverse('games:game-score-list'), {'cursor': 'garbage'})
+        assert response.status_code == status.HTTP_404_NOT_FOUND
@@ -0,0 +1,83 @@
+import numpy as np
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework import status
+from apps.games import trials
+from apps.games.models import Game, GameScore, GameTrialSet
+
+pytestmark = pytest.mark.django_db
+
+@pytest.fixture
+def game():
+    return Game.objects.create(title='Flanker')
+
+class TestTrialStore:
+    def test_pack_round_trip(self):
+        reaction_times = np.random.default_rng(1).uniform(200, 900, size=333)
+        correct = reaction_times > 500
+        packed = trials.pack(reaction_times, correct)
+
+        assert len(packed['reaction_times']) == 333 * 4
+        assert len(packed['correct']) == 42
+
+        unpacked = trials.unpack(packed['trial_count'], packed['reaction_times'], packed['correct'])
+        np.testing.assert_allclose(unpacked.reaction_times, reaction_times, rtol=1e-6)
+        np.testing.assert_array_equal(unpacked.correct, correct)
+
+    def test_mismatched_lengths(self):
+        with pytest.raises(ValueError):
+            trials.pack([1.0, 2.0], [True])
+
+    def test_load_many_sessions(self, test_user, game):
+        scores = [GameScore.objects.create(user=test_user, game=game, score=i) for i in range(3)]
+        for score in scores[:2]:
+            trials.save(score, [300.0, 450.5], [True, False])
+
+        loaded = trials.load([score.id for score in scores])
+        assert set(loaded) == {scores[0].id, scores[1].id}
+        assert loaded[scores[0].id].reaction_times.dtype == np.float32
+        assert loaded[scores[0].id].correct.tolist() == [True, False]
+
+    def test_record_score_with_trials(self, auth_client, game):
+        client, user = auth_client
+        url = reverse('games:game-record-score', args=[game.id])
+        data = {
+            'game': game.id,
+            'score': 12,
+            'trials': {'reaction_times': [310.5, 290.0, 505.25], 'correct': [True, True, False]},
+        }
+        response = client.post(url, data, format='json')
+        assert response.status_code == status.HTTP_201_CREATED
+
+        score = GameScore.objects.get(user=user)
+        loaded = trials.load([score.id])[score.id]
+        assert loaded.reaction_times.tolist() == [310.5, 290.0, 505.25]
+        assert score.metadata is None
+
+    def test_batch_with_trials(self, auth_client, game):
+        client, user = auth_client
+        rows = [
+            {'game': game.id, 'score': 1, 'trials': {'reaction_times': [400], 'correct': [True]}},
+            {'game': game.id, 'score': 2},
+        ]
+        response = client.post(reverse('games:game-record-scores'), rows, format='json')
+        assert response.status_code == status.HTTP_201_CREATED
+        assert GameTrialSet.objects.count() == 1
+
+    def test_migrate_trial_metadata(self, test_user, game):
+        score = GameScore.objects.create(
+            user=test_user, game=game, score=5,
+            metadata={'level': 3, 'trials': [
+                {'reaction_time': 350, 'correct': True},
+                {'reaction_time': None, 'correct': False},
+            ]}
+        )
+        call_command('migrate_trial_metadata')
+
+        score.refresh_from_db()
+        assert score.metadata == {'level': 3}
+        loaded = trials.load([score.id])[score.id]
+        assert loaded.reaction_times[0] == 350
+        assert np.isnan(loaded.reaction_times[1])
+        assert loaded.correct.tolist() == [True, False]
@@ -0,0 +1,99 @@
+# Backend/Apps/Games/trials.py
+
+"""
+Compact trial-level telemetry.
+
+Each session's trials are stored in ``GameTrialSet`` as packed typed
+arrays: float32 reaction times and a one-bit-per-trial correctness bitmap.
+Reading them back is a ``np.frombuffer`` view over the column bytes, so
+analysis code can load thousands of sessions without any JSON parsing.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from .models import GameTrialSet
+
+FORMAT_VERSION = 1
+REACTION_TIME_DTYPE = np.dtype('<f4')
+
+# Upper bound on trials accepted for a single session
+MAX_TRIALS = 10000
+
+@dataclass
+class Trials:
+    """Trial arrays for one session."""
+    reaction_times: np.ndarray  # float32 milliseconds
+    correct: np.ndarray  # bool
+
+    def __len__(self):
+        return len(self.reaction_times)
+
+def pack(reaction_times, correct) -> dict:
+    """
+    Pack trial sequences into ``GameTrialSet`` field values.
+    Raises ValueError if the sequences differ in length.
+    """
+    reaction_times = np.asarray(reaction_times, dtype=REACTION_TIME_DTYPE)
+    correct = np.asarray(correct, dtype=bool)
+    if reaction_times.ndim != 1 or reaction_times.shape != correct.shape:
+        raise ValueError("reaction_times and correct must be flat sequences of equal length")
+    return {
+        'trial_count': int(reaction_times.size),
+        'reaction_times': reaction_times.tobytes(),
+        'correct': np.packbits(correct).tobytes(),
+        'format_version': FORMAT_VERSION,
+    }
+
+def unpack(trial_count, reaction_times, correct) -> Trials:
+    """
+    Read packed column values as NumPy arrays. Reaction times are a
+    zero-copy view over the stored bytes.
+    """
+    return Trials(
+        reaction_times=np.frombuffer(reaction_times, dtype=REACTION_TIME_DTYPE, count=trial_count),
+        correct=np.unpackbits(
+            np.frombuffer(correct, dtype=np.uint8),
+            count=trial_count
+        ).astype(bool)
+    )
+
+def build(score, reaction_times, correct) -> GameTrialSet:
+    """Build an unsaved trial set for a score."""
+    return GameTrialSet(score=score, **pack(reaction_times, correct))
+
+def save(score, reaction_times, correct) -> GameTrialSet:
+    """Store (or replace) the trials of a score."""
+    trial_set, _ = GameTrialSet.objects.update_or_create(
+        score=score,
+        defaults=pack(reaction_times, correct)
+    )
+    return trial_set
+
+def load(score_ids, chunk_size=2000) -> dict:
+    """
+    Load trials for many sessions with one streamed query.
+    Returns {score_id: Trials}; sessions without trials are omitted.
+    """
+    rows = (
+        GameTrialSet.objects.filter(score_id__in=list(score_ids))
+        .values_list('score_id', 'trial_count', 'reaction_times', 'correct')
+        .iterator(chunk_size=chunk_size)
+    )
+    return {
+        score_id: unpack(trial_count, reaction_times, correct)
+        for score_id, trial_count, reaction_times, correct in rows
+    }
+
+def from_metadata(trials) -> tuple:
+    """
+    Split legacy ``metadata['trials']`` entries of the form
+    ``{"reaction_time": ms, "correct": bool}`` into two sequences.
+    """
+    reaction_times = [
+        np.nan if trial.get('reaction_time') is None else trial['reaction_time']
+        for trial in trials
+    ]
+    correct = [bool(trial.get('correct')) for trial in trials]
+    return reaction_times, correct
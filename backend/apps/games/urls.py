@@ -4,8 +4,10 @@ from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from .views import (
     GameViewSet, 
+    GameScoreViewSet,
     GameProgressViewSet,
-    GameConfigView
+    GameConfigView,
+    GameScoreExportView
 )
 
 app_name = 'games'
@@ -13,9 +15,11 @@ app_name = 'games'
 # Create a router for viewsets
 router = DefaultRouter()
 router.register(r'games', GameViewSet, basename='game')
+router.register(r'scores', GameScoreViewSet, basename='game-score')
 router.register(r'progress', GameProgressViewSet, basename='game-progress')
 router.register(r'config', GameConfigView, basename='game-config')
 
 urlpatterns = [
+    path('scores/export/', GameScoreExportView.as_view(), name='score-export'),
     path('', include(router.urls)),  # Include all viewset URLs
 ]
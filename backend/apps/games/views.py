@@ -3,15 +3,68 @@
 from drf_spectacular.utils import extend_schema, OpenApiParameter
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
-from rest_framework.permissions import IsAuthenticated, AllowAny
-from .models import Game, GameScore, GameProgress, GameConfig
+from rest_framework.permissions import IsAuthenticated, AllowAny, IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from django.db import transaction
+from django.http import Http404, StreamingHttpResponse
+from django.utils import timezone
+from datetime import timedelta
+from django.contrib.auth import get_user_model
+from .models import (
+    Game, GameScore, GameProgress, GameConfig, GameDailyRollup, UserGameRollup
+)
 from .serializers import (
     GameSerializer, 
     GameScoreSerializer, 
     GameProgressSerializer,
-    GameConfigSerializer
+    GameProgressHeartbeatSerializer,
+    GameConfigSerializer,
+    GameDailyRollupSerializer,
+    UserGameRollupSerializer
 )
-from mindmodel.core.utils import APIResponse
+from .signals import process_committed_scores
+from . import exports, leaderboards, norms, progress_buffer, registry
+from mindmodel.core.utils import APIResponse, KeysetPagination, conditional_get
+
+User = get_user_model()
+
+# Upper bound on rows accepted by a single batch score request
+MAX_SCORE_BATCH_SIZE = 1000
+
+# Longest daily stats series served in one request
+MAX_STATS_DAYS = 366
+
+# Leaderboard paging limits
+MAX_LEADERBOARD_LIMIT = 100
+MAX_LEADERBOARD_RADIUS = 25
+
+LEADERBOARD_PARAMETERS = [
+    OpenApiParameter(
+        name='window',
+        type=str,
+        description='Leaderboard window: all, daily or weekly',
+        required=False,
+        enum=list(leaderboards.WINDOWS)
+    ),
+]
+
+def _int_param(value, default, maximum):
+    """Parse a positive integer query parameter, clamped to maximum"""
+    try:
+        return min(max(int(value), 1), maximum)
+    except (TypeError, ValueError):
+        return default
+
+def _with_usernames(entries):
+    """Attach usernames to leaderboard entries with a single query"""
+    names = dict(
+        User.objects.filter(id__in=[entry['user_id'] for entry in entries])
+        .values_list('id', 'username')
+    )
+    for entry in entries:
+        entry['username'] = names.get(entry['user_id'])
+    return entries
 
 @extend_schema(tags=['games'])
 class GameViewSet(viewsets.ModelViewSet):
@@ -20,10 +73,28 @@ class GameViewSet(viewsets.ModelViewSet):
     """
     serializer_class = GameSerializer
     permission_classes = [AllowAny]
+
+    # Read-only actions served from the in-process game registry
+    registry_actions = {'retrieve', 'record_score', 'leaderboard', 'leaderboard_me', 'stats', 'stats_me'}
     
     def get_queryset(self):
         return Game.objects.filter(is_active=True)
 
+    def get_object(self):
+        if self.action not in self.registry_actions:
+            return super().get_object()
+
+        game = registry.get_game(self.kwargs[self.lookup_url_kwarg or self.lookup_field])
+        if game is None:
+            raise Http404
+        self.check_object_permissions(self.request, game)
+        return game
+
+    def get_content_version(self, request):
+        # Only an ETag: the latest updated_at can move backwards when a game
+        # is deleted, which would answer If-Modified-Since with a stale 304
+        return registry.snapshot().version, None
+
     @extend_schema(
         summary="List all available games",
         description="Returns a list of all active cognitive assessment games",
@@ -32,20 +103,16 @@ class GameViewSet(viewsets.ModelViewSet):
             OpenApiParameter(
                 name='category',
                 type=str,
-                description='Filter games by category',
+                description='Filter games by the category in their config',
                 required=False
             ),
         ]
     )
+    @conditional_get
     def list(self, request, *args, **kwargs):
         """Get list of available games with optional category filter"""
-        queryset = self.get_queryset()
-        category = request.query_params.get('category')
-        
-        if category:
-            queryset = queryset.filter(category=category)
-            
-        serializer = self.get_serializer(queryset, many=True)
+        games = registry.game_list(category=request.query_params.get('category'))
+        serializer = self.get_serializer(games, many=True)
         return APIResponse.success(
             data=serializer.data,
             message="Games retrieved successfully"
@@ -61,14 +128,22 @@ class GameViewSet(viewsets.ModelViewSet):
     def record_score(self, request, pk=None):
         """Record user's game score and performance"""
         game = self.get_object()
-        serializer = GameScoreSerializer(data=request.data)
+        serializer = GameScoreSerializer(
+            data=request.data,
+            context={'games': registry.games(), 'game': game}
+        )
         
         if serializer.is_valid():
-            serializer.save(user=request.user, game=game)
+            score = serializer.save(user=request.user, game=game)
+            metadata = score.metadata if isinstance(score.metadata, dict) else {}
+            difficulty = metadata.get('difficulty', '')
             return APIResponse.success(
                 data=serializer.data,
                 message="Score recorded successfully",
-                status_code=status.HTTP_201_CREATED
+                status_code=status.HTTP_201_CREATED,
+                metadata={
+                    'percentile': norms.get_percentile(game.id, score.score, difficulty)
+                }
             )
             
         return APIResponse.error(
@@ -76,26 +151,290 @@ class GameViewSet(viewsets.ModelViewSet):
             errors=serializer.errors
         )
 
+    @extend_schema(
+        summary="Record game scores in bulk",
+        description=(
+            "Save many game scores in one request. Rows are validated "
+            "independently; valid rows are written in a single transaction "
+            "and the response reports a result for every submitted row."
+        ),
+        request=GameScoreSerializer(many=True),
+        responses={201: GameScoreSerializer(many=True)}
+    )
+    @action(detail=False, methods=['post'], url_path='record_scores')
+    def record_scores(self, request):
+        """Record a batch of game scores for the current user"""
+        rows = request.data.get('scores') if isinstance(request.data, dict) else request.data
+        if not isinstance(rows, list) or not rows:
+            return APIResponse.error(
+                message="Expected a non-empty list of score rows",
+                code="validation_error"
+            )
+        if len(rows) > MAX_SCORE_BATCH_SIZE:
+            return APIResponse.error(
+                message=f"A batch may contain at most {MAX_SCORE_BATCH_SIZE} rows",
+                code="validation_error"
+            )
+
+        serializer = GameScoreSerializer(
+            data=rows,
+            many=True,
+            context={'request': request, 'games': registry.games()}
+        )
+        serializer.is_valid()
+        row_errors = serializer.row_errors
+
+        created = []
+        if serializer.validated_data:
+            with transaction.atomic():
+                created = serializer.save(user=request.user)
+                transaction.on_commit(lambda: process_committed_scores(created))
+
+        created_iter = iter(created)
+        results = []
+        for index, errors in enumerate(row_errors):
+            if errors:
+                results.append({'index': index, 'success': False, 'errors': errors})
+            else:
+                score = next(created_iter)
+                results.append({'index': index, 'success': True, 'id': score.id})
+
+        metadata = {'created': len(created), 'failed': len(rows) - len(created)}
+        if not created:
+            return APIResponse.error(
+                message="No valid score rows",
+                errors={'results': results, **metadata},
+                code="validation_error"
+            )
+
+        return APIResponse.success(
+            data={'results': results},
+            message="Scores recorded successfully",
+            status_code=status.HTTP_201_CREATED,
+            metadata=metadata
+        )
+
+    def _leaderboard_window(self, request):
+        window = request.query_params.get('window', leaderboards.WINDOW_ALL)
+        return window if window in leaderboards.WINDOWS else None
+
+    @extend_schema(
+        summary="Get game leaderboard",
+        description="Returns the top scores for a game from the sorted-set leaderboard",
+        parameters=LEADERBOARD_PARAMETERS + [
+            OpenApiParameter(
+                name='limit',
+                type=int,
+                description=f'Number of entries to return (max {MAX_LEADERBOARD_LIMIT})',
+                required=False
+            ),
+        ]
+    )
+    @action(detail=True, methods=['get'])
+    def leaderboard(self, request, pk=None):
+        """Get the top-K entries of a game leaderboard"""
+        game = self.get_object()
+        window = self._leaderboard_window(request)
+        if window is None:
+            return APIResponse.error(message="Invalid leaderboard window", code="validation_error")
+
+        limit = _int_param(request.query_params.get('limit'), 10, MAX_LEADERBOARD_LIMIT)
+        entries = leaderboards.top(game.id, limit=limit, window=window)
+        return APIResponse.success(
+            data=_with_usernames(entries),
+            message="Leaderboard retrieved successfully",
+            metadata={'window': window}
+        )
+
+    @extend_schema(
+        summary="Get my leaderboard position",
+        description="Returns the current user's rank and the entries around it",
+        parameters=LEADERBOARD_PARAMETERS + [
+            OpenApiParameter(
+                name='radius',
+                type=int,
+                description=f'Neighbours to include on each side (max {MAX_LEADERBOARD_RADIUS})',
+                required=False
+            ),
+        ]
+    )
+    @action(detail=True, methods=['get'], url_path='leaderboard/me')
+    def leaderboard_me(self, request, pk=None):
+        """Get the current user's rank and neighbours on a game leaderboard"""
+        game = self.get_object()
+        window = self._leaderboard_window(request)
+        if window is None:
+            return APIResponse.error(message="Invalid leaderboard window", code="validation_error")
+
+        position = leaderboards.rank(game.id, request.user.id, window=window)
+        if position is None:
+            return APIResponse.error(
+                message="No ranked score for this game",
+                code="not_found",
+                status_code=status.HTTP_404_NOT_FOUND
+            )
+
+        radius = _int_param(request.query_params.get('radius'), 5, MAX_LEADERBOARD_RADIUS)
+        neighbours = leaderboards.around(game.id, request.user.id, radius=radius, window=window)
+        return APIResponse.success(
+            data={'position': position, 'neighbours': _with_usernames(neighbours)},
+            message="Leaderboard position retrieved successfully",
+            metadata={'window': window}
+        )
+
+    @extend_schema(
+        summary="Get daily game statistics",
+        description="Returns per-day score aggregates for a game from the rollup table",
+        parameters=[
+            OpenApiParameter(
+                name='days',
+                type=int,
+                description=f'Number of days to return, ending today (max {MAX_STATS_DAYS})',
+                required=False
+            ),
+        ],
+        responses={200: GameDailyRollupSerializer(many=True)}
+    )
+    @action(detail=True, methods=['get'])
+    def stats(self, request, pk=None):
+        """Get per-day score aggregates for a game"""
+        game = self.get_object()
+        days = _int_param(request.query_params.get('days'), 30, MAX_STATS_DAYS)
+        since = timezone.localdate() - timedelta(days=days - 1)
+        rollups = GameDailyRollup.objects.filter(game=game, day__gte=since)
+        return APIResponse.success(
+            data=GameDailyRollupSerializer(rollups, many=True).data,
+            message="Game statistics retrieved successfully"
+        )
+
+    @extend_schema(
+        summary="Get my game statistics",
+        description=(
+            "Returns the current user's aggregate results for a game, including "
+            "running statistics (latest score, moving average, streaks)"
+        ),
+        responses={200: UserGameRollupSerializer}
+    )
+    @action(detail=True, methods=['get'], url_path='stats/me')
+    def stats_me(self, request, pk=None):
+        """Get the current user's aggregate results for a game"""
+        game = self.get_object()
+        rollup = UserGameRollup.objects.filter(user=request.user, game=game).first()
+        if rollup is None:
+            return APIResponse.error(
+                message="No completed scores for this game",
+                code="not_found",
+                status_code=status.HTTP_404_NOT_FOUND
+            )
+        return APIResponse.success(
+            data=UserGameRollupSerializer(rollup).data,
+            message="Game statistics retrieved successfully"
+        )
+
     def get_permissions(self):
-        if self.action in ['list', 'retrieve']:
+        if self.action in ['list', 'retrieve', 'leaderboard', 'stats']:
             permission_classes = [AllowAny]
         else:
             permission_classes = [IsAuthenticated]
         return [permission() for permission in permission_classes]
 
+@extend_schema(tags=['games'])
+class GameScoreViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    Browse the authenticated user's score history, newest first.
+    """
+    serializer_class = GameScoreSerializer
+    permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
+    keyset_ordering = ('-played_at', '-id')
+
+    def get_queryset(self):
+        queryset = GameScore.objects.filter(user=self.request.user)
+        if self.action == 'list':
+            game = self.request.query_params.get('game')
+            if game and game.isdigit():
+                queryset = queryset.filter(game_id=int(game))
+        return queryset
+
+    @extend_schema(
+        summary="List my game scores",
+        description="Returns the user's score history with cursor pagination",
+        parameters=[
+            OpenApiParameter(name='game', type=int, description='Filter by game id', required=False),
+            OpenApiParameter(name='cursor', type=str, description='Pagination cursor', required=False),
+            OpenApiParameter(name='page_size', type=int, description='Items per page (max 100)', required=False),
+        ],
+        responses={200: GameScoreSerializer(many=True)}
+    )
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
 class GameProgressViewSet(viewsets.ModelViewSet):
     """
     Handle game progress operations.
     """
     serializer_class = GameProgressSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
+    keyset_ordering = ('-last_played', '-id')
 
     def get_queryset(self):
         return GameProgress.objects.filter(user=self.request.user)
 
+    def get_object(self):
+        # Merge buffered heartbeats so reads never lag behind the client
+        return progress_buffer.overlay([super().get_object()])[0]
+
+    def paginate_queryset(self, queryset):
+        page = super().paginate_queryset(queryset)
+        return progress_buffer.overlay(page) if page is not None else None
+
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
 
+    def update(self, request, *args, **kwargs):
+        # Write buffered heartbeats first so a full update can't be double counted
+        progress_buffer.flush_ids([self._progress_id()])
+        return super().update(request, *args, **kwargs)
+
+    def _progress_id(self):
+        try:
+            return int(self.kwargs[self.lookup_url_kwarg or self.lookup_field])
+        except (TypeError, ValueError):
+            return None
+
+    @extend_schema(
+        summary="Record progress heartbeat",
+        description=(
+            "Buffer a high-frequency progress update. Time spent is added to "
+            "the stored total; score, level and completion are last-write-wins. "
+            "Buffered updates are flushed to the database periodically."
+        ),
+        request=GameProgressHeartbeatSerializer,
+        responses={202: GameProgressHeartbeatSerializer}
+    )
+    @action(detail=True, methods=['post'])
+    def heartbeat(self, request, pk=None):
+        """Buffer a progress heartbeat without writing the row"""
+        progress_id = self._progress_id()
+        if progress_id is None or not progress_buffer.is_owner(progress_id, request.user.id):
+            progress_id = super().get_object().pk
+            progress_buffer.remember_owner(progress_id, request.user.id)
+
+        serializer = GameProgressHeartbeatSerializer(data=request.data)
+        if not serializer.is_valid():
+            return APIResponse.error(
+                message="Invalid progress data",
+                errors=serializer.errors
+            )
+
+        progress_buffer.record(progress_id, **serializer.validated_data)
+        return APIResponse.success(
+            data=serializer.data,
+            message="Progress update accepted",
+            status_code=status.HTTP_202_ACCEPTED
+        )
+
 class GameConfigView(viewsets.ReadOnlyModelViewSet):
     """
     View game configurations.
@@ -103,3 +442,84 @@ class GameConfigView(viewsets.ReadOnlyModelViewSet):
     serializer_class = GameConfigSerializer
     queryset = GameConfig.objects.all()
     permission_classes = [IsAuthenticated]
+
+    def get_content_version(self, request):
+        # GameConfig has no modification timestamp, so only an ETag is sent
+        return registry.snapshot().version, None
+
+    @conditional_get
+    def list(self, request, *args, **kwargs):
+        configs = registry.config_list()
+        page = self.paginate_queryset(configs)
+        if page is not None:
+            return self.get_paginated_response(self.get_serializer(page, many=True).data)
+        return Response(self.get_serializer(configs, many=True).data)
+
+    def get_object(self):
+        config = registry.get_config(self.kwargs[self.lookup_url_kwarg or self.lookup_field])
+        if config is None:
+            raise Http404
+        self.check_object_permissions(self.request, config)
+        return config
+
+@extend_schema(tags=['games'])
+class GameScoreExportView(APIView):
+    """
+    Stream game scores as NDJSON or CSV for research partners.
+    """
+    permission_classes = [IsAdminUser]
+
+    @extend_schema(
+        summary="Export game scores",
+        description=(
+            "Streams every matching score row without loading the table into "
+            "memory. Supports NDJSON and CSV output with optional gzip."
+        ),
+        parameters=[
+            OpenApiParameter(name='output', type=str, enum=list(exports.FORMATS),
+                             description='Output format (default ndjson)', required=False),
+            OpenApiParameter(name='gzip', type=bool,
+                             description='Gzip-compress the stream', required=False),
+            OpenApiParameter(name='game', type=int, many=True,
+                             description='Filter by game id (repeatable)', required=False),
+            OpenApiParameter(name='since', type=str,
+                             description='Only scores played at or after this ISO date/datetime', required=False),
+            OpenApiParameter(name='until', type=str,
+                             description='Only scores played at or before this ISO date/datetime', required=False),
+            OpenApiParameter(name='completed', type=bool,
+                             description='Filter by completion state', required=False),
+        ],
+        responses={200: None}
+    )
+    def get(self, request):
+        params = request.query_params
+        # 'format' is reserved by DRF for renderer negotiation
+        fmt = params.get('output', exports.FORMAT_NDJSON)
+        if fmt not in exports.FORMATS:
+            return APIResponse.error(message="Invalid export format", code="validation_error")
+
+        try:
+            game_ids = [int(value) for value in params.getlist('game')]
+            since = exports.parse_moment(params.get('since'))
+            until = exports.parse_moment(params.get('until'), end_of_day=True)
+        except ValueError as e:
+            return APIResponse.error(message=str(e), code="validation_error")
+
+        completed = params.get('completed')
+        if completed is not None:
+            completed = completed.lower() in ('1', 'true', 'yes')
+        compress = params.get('gzip', '').lower() in ('1', 'true', 'yes')
+
+        queryset = exports.export_queryset(
+            game_ids=game_ids,
+            since=since,
+            until=until,
+            completed=completed
+        )
+        response = StreamingHttpResponse(
+            exports.stream_export(queryset, fmt=fmt, compress=compress),
+            content_type=exports.CONTENT_TYPES[fmt]
+        )
+        filename = f"game_scores.{fmt}" + ('.gz' if compress else '')
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
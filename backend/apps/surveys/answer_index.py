@@ -0,0 +1,127 @@
+# Backend/Apps/Surveys/answer_index.py
+
+"""
+Normalized answer rows for querying responses by answer value.
+
+``SurveyAnswer`` mirrors each response's answers as one row per
+(response, question), or per selected option for multi-select questions,
+with the value in a typed column. Rows of a response are rewritten
+whenever it is saved: by signal for ordinary saves, and explicitly from
+the bulk import path, which writes with ``bulk_create()``. Autosave
+rewrites only the rows of the questions in its delta (``sync_delta``).
+
+Free text longer than ``SurveyAnswer.TEXT_MAX_LENGTH`` and nested objects
+are not indexed; they are still available in ``SurveyResponse.responses``.
+
+Cohorts are selected with ``SurveyAnswer.objects.answered(...)`` and
+combined with ``cohort``::
+
+    cohort(
+        SurveyAnswer.objects.answered(survey, 'Q7', gte=4),
+        completed_surveys=[baseline],
+    )
+"""
+
+import math
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+
+from .models import SurveyAnswer, SurveyResponse
+
+User = get_user_model()
+
+BATCH_SIZE = 2000
+
+def _typed(value):
+    if isinstance(value, bool):
+        return {'value_bool': value}
+    if isinstance(value, (int, float)):
+        return {'value_number': float(value)} if math.isfinite(value) else None
+    if isinstance(value, str) and value and len(value) <= SurveyAnswer.TEXT_MAX_LENGTH:
+        return {'value_text': value}
+    return None
+
+def answer_rows(response, answers=None):
+    """
+    Build the unsaved ``SurveyAnswer`` rows of a response, or of the
+    given subset of its answers.
+    """
+    rows = []
+    if answers is None:
+        answers = response.responses
+    if not isinstance(answers, dict):
+        answers = {}
+    for question, value in answers.items():
+        if len(question) > SurveyAnswer.TEXT_MAX_LENGTH:
+            continue
+        for item in (value if isinstance(value, list) else [value]):
+            typed = _typed(item)
+            if typed is None:
+                continue
+            rows.append(SurveyAnswer(
+                response_id=response.pk,
+                survey_id=response.survey_id,
+                user_id=response.user_id,
+                completed=response.completed,
+                question=question,
+                **typed
+            ))
+    return rows
+
+def sync(responses):
+    """Replace the answer rows of saved responses."""
+    responses = [response for response in responses if response.pk]
+    if not responses:
+        return
+    rows = [row for response in responses for row in answer_rows(response)]
+    with transaction.atomic():
+        SurveyAnswer.objects.filter(response_id__in=[response.pk for response in responses]).delete()
+        SurveyAnswer.objects.bulk_create(rows, batch_size=BATCH_SIZE)
+
+def sync_delta(response, answers, completed_changed=False):
+    """
+    Update the answer rows of a saved response for an autosave delta: the
+    rows of the delta's questions are replaced, and the others only follow
+    a change of ``completed``. Null answers in the delta clear a question.
+    """
+    current = {question: value for question, value in answers.items() if value is not None}
+    rows = SurveyAnswer.objects.filter(response_id=response.pk)
+    with transaction.atomic():
+        rows.filter(question__in=list(answers)).delete()
+        if completed_changed:
+            rows.update(completed=response.completed)
+        SurveyAnswer.objects.bulk_create(answer_rows(response, current), batch_size=BATCH_SIZE)
+
+def rebuild(survey, chunk_size=BATCH_SIZE) -> int:
+    """Rewrite the answer rows of every response to a survey. Returns the response count."""
+    rebuilt = 0
+    batch = []
+    responses = SurveyResponse.objects.filter(survey=survey) \
+        .only('id', 'user_id', 'survey_id', 'completed', 'responses') \
+        .iterator(chunk_size=chunk_size)
+    for response in responses:
+        batch.append(response)
+        if len(batch) >= chunk_size:
+            sync(batch)
+            rebuilt += len(batch)
+            batch = []
+    if batch:
+        sync(batch)
+        rebuilt += len(batch)
+    return rebuilt
+
+def cohort(*conditions, completed_surveys=()):
+    """
+    Users with an answer in every ``conditions`` queryset (from
+    ``SurveyAnswer.objects.answered``) who also completed each of
+    ``completed_surveys``.
+    """
+    users = User.objects.all()
+    for answers in conditions:
+        users = users.filter(id__in=answers.user_ids())
+    for survey in completed_surveys:
+        users = users.filter(
+            id__in=SurveyResponse.objects.filter(survey=survey, completed=True).values('user_id')
+        )
+    return users
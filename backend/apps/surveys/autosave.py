@@ -0,0 +1,168 @@
+# Backend/Apps/Surveys/autosave.py
+
+"""
+Delta autosave for survey responses.
+
+Autosave requests carry only the answers that changed. The delta is merged
+into ``SurveyResponse.responses`` by the database in a single UPDATE
+(``jsonb ||`` on PostgreSQL), so neither the client nor the server moves
+the full answer set on every save. Each save increments ``revision``; a
+client that sends the revision it last saw gets a conflict instead of
+silently overwriting a newer save from another tab or device.
+
+The answer distributions and the answer index of a response that stays
+completed only change by the delta's questions, so a save reads the old
+values of those questions alone and rewrites their index rows.
+"""
+
+import json
+
+from django.db import IntegrityError, transaction
+from django.db.models import F, Func, JSONField
+from django.db.models.fields.json import KeyTransform
+from django.utils import timezone
+
+from . import answer_index, distributions, validation
+from .models import SurveyResponse
+
+class JSONMerge(Func):
+    """
+    Shallow-merge a JSON object into a JSON column. Top-level keys of the
+    delta replace the stored ones, and keys set to null in the delta are
+    removed, which is how autosave clears an answer. Other nulls, in stored
+    answers or nested in answer values, are kept.
+    """
+    output_field = JSONField()
+
+    def __init__(self, expression, delta: dict, **extra):
+        self.delta = delta
+        super().__init__(expression, **extra)
+
+    def _split(self):
+        kept = {key: value for key, value in self.delta.items() if value is not None}
+        cleared = [key for key, value in self.delta.items() if value is None]
+        return kept, cleared
+
+    def as_sql(self, compiler, connection, **extra_context):
+        # PostgreSQL: jsonb || is a shallow merge, jsonb - text[] drops keys
+        column, params = compiler.compile(self.source_expressions[0])
+        kept, cleared = self._split()
+        return f"(({column} || %s::jsonb) - %s::text[])", (*params, json.dumps(kept), cleared)
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        # json_patch would merge nested objects, so set and remove top-level keys
+        sql, params = compiler.compile(self.source_expressions[0])
+        params = list(params)
+        kept, cleared = self._split()
+        if kept:
+            sql = f"json_set({sql}, {', '.join(['%s, json(%s)'] * len(kept))})"
+            for key, value in kept.items():
+                params += [self._path(key), json.dumps(value)]
+        if cleared:
+            sql = f"json_remove({sql}, {', '.join(['%s'] * len(cleared))})"
+            params += [self._path(key) for key in cleared]
+        return sql, tuple(params)
+
+    @staticmethod
+    def _path(key):
+        return '$."{}"'.format(key)
+
+def stored_answers(rows, keys, field='responses') -> dict:
+    """
+    Read only the given top-level keys of a JSON column of the single row
+    in ``rows``. Keys that are absent or null are left out.
+    """
+    keys = list(keys)
+    if not keys:
+        return {}
+    columns = {f'answer_{position}': KeyTransform(key, field) for position, key in enumerate(keys)}
+    values = rows.annotate(**columns).values_list(*columns).get()
+    return {key: value for key, value in zip(keys, values) if value is not None}
+
+class RevisionConflict(Exception):
+    """The stored revision does not match the one the client saved against."""
+    def __init__(self, revision):
+        super().__init__(f"Response is at revision {revision}")
+        self.revision = revision
+
+class IncompleteResponse(Exception):
+    """A response marked completed fails the survey's required questions."""
+    def __init__(self, errors):
+        super().__init__("Response is incomplete")
+        self.errors = errors
+
+def apply_delta(user, survey, answers, revision=None, completed=None) -> SurveyResponse:
+    """
+    Merge ``answers`` into the user's response to ``survey``, creating it
+    on first save. ``revision`` is the revision the client last saw; when
+    given, the write only happens if it is still current.
+
+    Returns the updated response. Raises ``RevisionConflict`` or
+    ``IncompleteResponse``.
+    """
+    rows = SurveyResponse.objects.filter(user=user, survey=survey)
+    changes = {
+        'responses': JSONMerge(F('responses'), answers),
+        'revision': F('revision') + 1,
+        'updated_at': timezone.now(),
+    }
+    if completed is not None:
+        changes['completed'] = completed
+
+    with transaction.atomic():
+        # Completed responses feed the answer distributions, which need the
+        # answers being replaced: only the delta's, unless the response is
+        # leaving the distributions entirely. Drafts skip reading them
+        was_completed = rows.select_for_update().values_list('completed', flat=True).first()
+        if was_completed and completed is False:
+            previous = rows.values_list('responses', flat=True).get()
+        elif was_completed:
+            previous = stored_answers(rows, answers)
+        else:
+            previous = None
+
+        target = rows if revision is None else rows.filter(revision=revision)
+        updated = target.update(**changes)
+        if not updated:
+            current = rows.values_list('revision', flat=True).first()
+            if current is not None or revision not in (None, 0):
+                raise RevisionConflict(current or 0)
+            try:
+                with transaction.atomic():
+                    SurveyResponse.objects.create(
+                        user=user,
+                        survey=survey,
+                        responses={name: value for name, value in answers.items() if value is not None},
+                        completed=bool(completed),
+                        revision=1
+                    )
+            except IntegrityError:
+                # Another request created the response first
+                raise RevisionConflict(rows.values_list('revision', flat=True).first() or 0)
+
+        fields = ['id', 'user', 'survey', 'revision', 'completed', 'updated_at']
+        if completed:
+            fields.append('responses')  # completion is validated on the full answers
+        response = rows.only(*fields).get()
+        if response.completed:
+            # A completed response must stay complete; when it was already,
+            # the merged values of the required questions are all that can
+            # have changed
+            schema = validation.get_schema(survey)
+            merged = response.responses if completed else stored_answers(rows, schema.required)
+            errors = schema.validate(merged, completed=True)
+            if errors:
+                raise IncompleteResponse(errors)  # rolls back the merge
+
+        # update() bypasses signals; creation above went through them
+        if updated:
+            if not response.completed:
+                counted = None
+            elif was_completed:
+                counted = {name: value for name, value in answers.items() if value is not None}
+            else:
+                counted = response.responses
+            distributions.apply_change(survey.pk, old_answers=previous, new_answers=counted)
+            answer_index.sync_delta(response, answers, completed_changed=bool(was_completed) != response.completed)
+
+        return response
@@ -0,0 +1,33 @@
+# Backend/Apps/Surveys/catalog.py
+
+"""
+Shared version of the survey catalog for conditional GETs.
+
+The version is an opaque token plus a last-modified time kept in the
+shared cache. Signals replace it whenever a survey is saved or deleted,
+so checking whether a client's copy is current costs a cache read
+instead of a query.
+"""
+
+import uuid
+
+from django.core.cache import cache
+from django.db.models import Max
+from django.utils import timezone
+
+from .models import Survey
+
+VERSION_KEY = 'surveys_catalog:version'
+
+def version() -> tuple:
+    """Return (token, last_modified) for the survey catalog."""
+    current = cache.get(VERSION_KEY)
+    if current is None:
+        last_modified = Survey.objects.aggregate(latest=Max('updated_at'))['latest']
+        cache.add(VERSION_KEY, (uuid.uuid4().hex, last_modified), timeout=None)
+        current = cache.get(VERSION_KEY)
+    return current
+
+def invalidate():
+    """Start a new catalog version, modified now."""
+    cache.set(VERSION_KEY, (uuid.uuid4().hex, timezone.now()), timeout=None)
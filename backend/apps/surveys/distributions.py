@@ -0,0 +1,138 @@
+# Backend/Apps/Surveys/distributions.py
+
+"""
+Incrementally maintained answer distributions for survey analytics.
+
+Each survey has one ``SurveyAnswerDistribution`` row holding per-question
+answer counts and numeric sums over its completed responses. When a
+response is saved, the change in its contribution (old answers out, new
+answers in) is applied to that row under a row lock, so dashboards read
+one row instead of tallying every response. ``rebuild`` recomputes a row
+from the responses to repair drift.
+"""
+
+import json
+from collections import Counter, defaultdict
+
+from django.db import transaction
+
+from .models import Survey, SurveyAnswerDistribution, SurveyResponse
+
+def _answer_key(value):
+    # JSON object keys are strings; keep strings as-is and encode the rest
+    return value if isinstance(value, str) else json.dumps(value)
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+def tally(answers, sign=1, counts=None, numeric=None):
+    """
+    Add (or with ``sign=-1`` remove) one response's answers to
+    ``counts`` {question: Counter} and ``numeric`` {question: [n, sum, sq]}.
+    Multi-select answers count each selected option.
+    """
+    counts = counts if counts is not None else defaultdict(Counter)
+    numeric = numeric if numeric is not None else defaultdict(lambda: [0, 0.0, 0.0])
+    for question, value in (answers or {}).items():
+        if value is None or value == '' or isinstance(value, dict):
+            continue
+        for item in (value if isinstance(value, list) else [value]):
+            if not isinstance(item, (dict, list)):
+                counts[question][_answer_key(item)] += sign
+        if _is_number(value):
+            stats = numeric[question]
+            stats[0] += sign
+            stats[1] += sign * value
+            stats[2] += sign * value * value
+    return counts, numeric
+
+def apply_change(survey_id, old_answers=None, new_answers=None):
+    """
+    Replace a response's contribution: ``old_answers`` is what it counted
+    as before (None if it was not counted) and ``new_answers`` what it
+    counts as now (None if it no longer counts).
+    """
+    if old_answers is None and new_answers is None:
+        return
+    counts, numeric = tally(old_answers, sign=-1) if old_answers is not None else tally(None)
+    if new_answers is not None:
+        tally(new_answers, counts=counts, numeric=numeric)
+    response_delta = (new_answers is not None) - (old_answers is not None)
+
+    with transaction.atomic():
+        rows = SurveyAnswerDistribution.objects.select_for_update()
+        distribution = rows.filter(survey_id=survey_id).first()
+        if distribution is None:
+            # Nothing to remove from; also the case while the survey itself
+            # is being deleted, where creating a row would break the cascade
+            if new_answers is None or not Survey.objects.filter(pk=survey_id).exists():
+                return
+            distribution, _ = rows.get_or_create(survey_id=survey_id)
+        distribution.response_count += response_delta
+        merge(distribution, counts, numeric)
+        distribution.save()
+
+def merge(distribution, counts, numeric):
+    """Apply tallied changes to a distribution in place, dropping emptied entries."""
+    for question, changes in counts.items():
+        stored = distribution.counts.setdefault(question, {})
+        for answer, change in changes.items():
+            if not change:
+                continue
+            total = stored.get(answer, 0) + change
+            if total > 0:
+                stored[answer] = total
+            else:
+                stored.pop(answer, None)
+        if not stored:
+            del distribution.counts[question]
+
+    for question, (count, total, squares) in numeric.items():
+        stored = distribution.numeric.get(question, [0, 0.0, 0.0])
+        stored = [stored[0] + count, stored[1] + total, stored[2] + squares]
+        if stored[0] > 0:
+            distribution.numeric[question] = stored
+        else:
+            distribution.numeric.pop(question, None)
+
+def summarize(distribution) -> dict:
+    """Per-question answer counts, plus mean and variance of numeric answers."""
+    questions = {}
+    for question in sorted(distribution.counts.keys() | distribution.numeric.keys()):
+        summary = {'counts': distribution.counts.get(question, {})}
+        if question in distribution.numeric:
+            count, total, squares = distribution.numeric[question]
+            mean = total / count
+            summary.update({
+                'numeric_count': count,
+                'mean': mean,
+                'variance': max(squares / count - mean * mean, 0.0),
+            })
+        questions[question] = summary
+    return {'response_count': distribution.response_count, 'questions': questions}
+
+def get_distribution(survey) -> dict:
+    distribution = SurveyAnswerDistribution.objects.filter(survey=survey).first()
+    if distribution is None:
+        return {'response_count': 0, 'questions': {}}
+    return summarize(distribution)
+
+def rebuild(survey, chunk_size=2000) -> SurveyAnswerDistribution:
+    """Recompute a survey's distribution from its completed responses."""
+    counts, numeric = tally(None)
+    response_count = 0
+    rows = (
+        SurveyResponse.objects.filter(survey=survey, completed=True)
+        .values_list('responses', flat=True)
+        .iterator(chunk_size=chunk_size)
+    )
+    for answers in rows:
+        tally(answers, counts=counts, numeric=numeric)
+        response_count += 1
+
+    distribution = SurveyAnswerDistribution(survey=survey, response_count=response_count)
+    merge(distribution, counts, numeric)
+    with transaction.atomic():
+        SurveyAnswerDistribution.objects.filter(survey=survey).delete()
+        distribution.save()
+    return distribution
@@ -0,0 +1,237 @@
+# Backend/Apps/Surveys/imports.py
+
+"""
+Bulk import of partner-collected survey responses.
+
+Rows are stream-parsed from CSV or JSONL, validated against the survey's
+compiled schema, and written in batches: one query resolves the batch's
+user emails and one ``bulk_create(update_conflicts=True)`` upserts the
+batch on (user, survey). Memory use is bounded by the batch size, not the
+file size.
+
+JSONL rows look like ``{"email": ..., "responses": {...}, "completed":
+true, "submitted_at": "2024-05-01T10:00:00Z"}``. CSV files have an
+``email`` column, optional ``completed`` and ``submitted_at`` columns, and
+one column per question; cell values are parsed as JSON when possible
+(numbers, lists, booleans) and kept as text otherwise.
+"""
+
+import codecs
+import csv
+import json
+from dataclasses import dataclass, field
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from . import answer_index, distributions, validation
+from .models import SurveyResponse
+
+User = get_user_model()
+
+FORMAT_CSV = 'csv'
+FORMAT_JSONL = 'jsonl'
+FORMATS = (FORMAT_CSV, FORMAT_JSONL)
+
+BATCH_SIZE = 1000
+
+# Rejected rows kept in the report; the rest are only counted
+MAX_REPORTED_ERRORS = 100
+
+CSV_META_COLUMNS = {'email', 'completed', 'submitted_at'}
+TRUE_VALUES = {'1', 'true', 'yes', 'y'}
+
+@dataclass
+class ImportReport:
+    processed: int = 0
+    imported: int = 0
+    rejected: int = 0
+    errors: list = field(default_factory=list)  # [{'line': n, 'errors': ...}]
+
+    def reject(self, line, errors):
+        self.rejected += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({'line': line, 'errors': errors})
+
+    def as_dict(self):
+        return {
+            'processed': self.processed,
+            'imported': self.imported,
+            'rejected': self.rejected,
+            'errors': self.errors,
+        }
+
+def _cell(value):
+    if value == '':
+        return None
+    try:
+        return json.loads(value)
+    except ValueError:
+        return value
+
+def iter_csv(stream):
+    """Yield (line number, row dict) from a CSV text stream."""
+    reader = csv.DictReader(stream)
+    for row in reader:
+        responses = {}
+        for name, raw in row.items():
+            if name is None or name in CSV_META_COLUMNS or raw is None:
+                continue
+            value = _cell(raw)
+            if value is not None:
+                responses[name] = value
+        yield reader.line_num, {
+            'email': row.get('email'),
+            'completed': row.get('completed'),
+            'submitted_at': row.get('submitted_at'),
+            'responses': responses,
+        }
+
+def iter_jsonl(stream):
+    """Yield (line number, row dict) from a JSONL text stream."""
+    for line_number, line in enumerate(stream, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            row = None
+        yield line_number, row if isinstance(row, dict) else {'invalid': True}
+
+def is_utf8(file, chunk_size=64 * 1024) -> bool:
+    """
+    Check that a binary upload decodes as UTF-8 before anything is imported,
+    reading it in chunks and rewinding it afterwards.
+    """
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    try:
+        for chunk in iter(lambda: file.read(chunk_size), b''):
+            decoder.decode(chunk)
+        decoder.decode(b'', final=True)
+    except UnicodeDecodeError:
+        return False
+    finally:
+        file.seek(0)
+    return True
+
+def iter_rows(stream, fmt):
+    return iter_csv(stream) if fmt == FORMAT_CSV else iter_jsonl(stream)
+
+def _completed(value, default):
+    if value is None or value == '':
+        return default
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().lower() in TRUE_VALUES
+
+def _prepare(schema, line, row, default_completed, report):
+    """Validate one parsed row. Returns (email, fields) or None if rejected."""
+    if row.get('invalid'):
+        report.reject(line, {'non_field_errors': ['Not a JSON object.']})
+        return None
+    email = row.get('email')
+    if email is not None and not isinstance(email, str):
+        report.reject(line, {'email': ['Must be a string.']})
+        return None
+    email = (email or '').strip()
+    if not email:
+        report.reject(line, {'email': ['This field is required.']})
+        return None
+
+    submitted_at = timezone.now()
+    if row.get('submitted_at'):
+        submitted_at = parse_datetime(str(row['submitted_at']))
+        if submitted_at is None:
+            report.reject(line, {'submitted_at': ['Invalid datetime.']})
+            return None
+        if timezone.is_naive(submitted_at):
+            submitted_at = timezone.make_aware(submitted_at)
+
+    completed = _completed(row.get('completed'), default_completed)
+    responses = row.get('responses')
+    errors = schema.validate(responses, completed=completed)
+    if errors:
+        report.reject(line, {'responses': errors})
+        return None
+    return email, {'responses': responses, 'completed': completed, 'submitted_at': submitted_at}
+
+def _write_batch(survey, batch, report, dry_run):
+    """Resolve users for a batch with one query and upsert it."""
+    emails = {email for _, email, _ in batch}
+    user_ids = dict(User.objects.filter(email__in=emails).values_list('email', 'id'))
+
+    # The last row wins when a user appears twice in one batch, as it does
+    # across batches; the rows it replaces are reported
+    responses, lines = {}, {}
+    for line, email, fields in reversed(batch):
+        user_id = user_ids.get(email)
+        if user_id is None:
+            report.reject(line, {'email': ['No user with this email.']})
+            continue
+        if user_id in responses:
+            report.reject(line, {'email': [f'Replaced by line {lines[user_id]} for the same user.']})
+            continue
+        responses[user_id] = SurveyResponse(user_id=user_id, survey=survey, **fields)
+        lines[user_id] = line
+    report.errors.sort(key=lambda error: error['line'])
+
+    if responses and not dry_run:
+        now = timezone.now()
+        for response in responses.values():
+            response.updated_at = now
+        SurveyResponse.objects.bulk_create(
+            list(responses.values()),
+            update_conflicts=True,
+            unique_fields=['user', 'survey'],
+            update_fields=['responses', 'completed', 'submitted_at', 'updated_at']
+        )
+        # Upserted rows may not get their primary keys back; look them up
+        ids = dict(
+            SurveyResponse.objects.filter(survey=survey, user_id__in=responses.keys())
+            .values_list('user_id', 'id')
+        )
+        for user_id, response in responses.items():
+            response.pk = ids[user_id]
+        # Like an autosave, an import is a new revision of each response
+        SurveyResponse.objects.filter(pk__in=ids.values()).update(revision=F('revision') + 1)
+        answer_index.sync(responses.values())
+    report.imported += len(responses)
+
+def import_responses(survey, rows, batch_size=BATCH_SIZE, completed=True, dry_run=False,
+                     progress=None) -> ImportReport:
+    """
+    Import parsed ``(line, row)`` pairs into ``survey``. Each batch is
+    written in its own transaction. With ``dry_run`` every row is parsed,
+    validated and matched to a user but nothing is written. ``progress``
+    is called with the report after each batch.
+    """
+    schema = validation.get_schema(survey)
+    report = ImportReport()
+    batch = []
+
+    def flush():
+        with transaction.atomic():
+            _write_batch(survey, batch, report, dry_run)
+        batch.clear()
+        if progress:
+            progress(report)
+
+    for line, row in rows:
+        report.processed += 1
+        prepared = _prepare(schema, line, row, completed, report)
+        if prepared is None:
+            continue
+        batch.append((line, *prepared))
+        if len(batch) >= batch_size:
+            flush()
+    if batch:
+        flush()
+
+    # bulk_create skips the signal that keeps distributions current
+    if report.imported and not dry_run:
+        distributions.rebuild(survey)
+    return report
@@ -0,0 +1,62 @@
+# Backend/Apps/Surveys/management/commands/import_survey_responses.py
+
+import sys
+from django.core.management.base import BaseCommand, CommandError
+from apps.surveys import imports
+from apps.surveys.models import Survey
+
+class Command(BaseCommand):
+    help = "Stream-import survey responses from a CSV or JSONL file"
+
+    def add_arguments(self, parser):
+        parser.add_argument('survey_id', type=int)
+        parser.add_argument('path', help='Input file path, or - for stdin')
+        parser.add_argument(
+            '--format',
+            choices=imports.FORMATS,
+            help='Input format (default: from the file extension, else jsonl)'
+        )
+        parser.add_argument('--batch-size', type=int, default=imports.BATCH_SIZE)
+        parser.add_argument(
+            '--incomplete',
+            action='store_true',
+            help='Treat rows without a completed value as drafts'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Parse, validate and match users without writing anything'
+        )
+
+    def handle(self, *args, **options):
+        survey = Survey.objects.filter(pk=options['survey_id']).first()
+        if survey is None:
+            raise CommandError(f"Survey {options['survey_id']} does not exist")
+
+        path = options['path']
+        fmt = options['format'] or (imports.FORMAT_CSV if path.endswith('.csv') else imports.FORMAT_JSONL)
+        stream = sys.stdin if path == '-' else open(path, newline='', encoding='utf-8')
+        try:
+            report = imports.import_responses(
+                survey,
+                imports.iter_rows(stream, fmt),
+                batch_size=options['batch_size'],
+                completed=not options['incomplete'],
+                dry_run=options['dry_run'],
+                progress=self._progress
+            )
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+
+        for error in report.errors:
+            self.stderr.write(f"Line {error['line']}: {error['errors']}")
+        verb = "Validated" if options['dry_run'] else "Imported"
+        self.stdout.write(self.style.SUCCESS(
+            f"{verb} {report.imported} of {report.processed} rows, {report.rejected} rejected"
+        ))
+
+    def _progress(self, report):
+        self.stderr.write(
+            f"{report.processed} rows processed, {report.imported} imported, {report.rejected} rejected"
+        )
@@ -0,0 +1,30 @@
+# Backend/Apps/Surveys/management/commands/rebuild_survey_answer_index.py
+
+from django.core.management.base import BaseCommand
+from apps.surveys import answer_index
+from apps.surveys.models import Survey
+
+class Command(BaseCommand):
+    help = "Rewrite the normalized answer rows of survey responses"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--survey',
+            type=int,
+            action='append',
+            dest='survey_ids',
+            help='Only rebuild this survey id (repeatable)'
+        )
+
+    def handle(self, *args, **options):
+        surveys = Survey.objects.order_by('id')
+        if options['survey_ids']:
+            surveys = surveys.filter(id__in=options['survey_ids'])
+
+        rebuilt = 0
+        for survey in surveys.iterator():
+            count = answer_index.rebuild(survey)
+            self.stdout.write(f"{survey.title}: {count} responses")
+            rebuilt += 1
+
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt answer rows of {rebuilt} surveys"))
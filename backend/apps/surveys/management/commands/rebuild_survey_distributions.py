@@ -0,0 +1,30 @@
+# Backend/Apps/Surveys/management/commands/rebuild_survey_distributions.py
+
+from django.core.management.base import BaseCommand
+from apps.surveys import distributions
+from apps.surveys.models import Survey
+
+class Command(BaseCommand):
+    help = "Recompute survey answer distributions from completed responses"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--survey',
+            type=int,
+            action='append',
+            dest='survey_ids',
+            help='Only rebuild this survey id (repeatable)'
+        )
+
+    def handle(self, *args, **options):
+        surveys = Survey.objects.order_by('id')
+        if options['survey_ids']:
+            surveys = surveys.filter(id__in=options['survey_ids'])
+
+        rebuilt = 0
+        for survey in surveys.iterator():
+            distribution = distributions.rebuild(survey)
+            self.stdout.write(f"{survey.title}: {distribution.response_count} responses")
+            rebuilt += 1
+
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {rebuilt} survey distributions"))
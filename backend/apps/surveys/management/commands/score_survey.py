@@ -0,0 +1,57 @@
+# Backend/Apps/Surveys/management/commands/score_survey.py
+
+import csv
+import sys
+import time
+import numpy as np
+from django.core.management.base import BaseCommand, CommandError
+from apps.surveys import scoring
+from apps.surveys.models import Survey
+
+class Command(BaseCommand):
+    help = "Score every completed response to a survey and report scale reliability"
+
+    def add_arguments(self, parser):
+        parser.add_argument('survey_id', type=int)
+        parser.add_argument(
+            '--output',
+            help='Write per-response scale scores as CSV to this path, or - for stdout'
+        )
+        parser.add_argument('--chunk-size', type=int, default=5000)
+
+    def handle(self, *args, **options):
+        survey = Survey.objects.filter(pk=options['survey_id']).first()
+        if survey is None:
+            raise CommandError(f"Survey {options['survey_id']} does not exist")
+
+        started = time.perf_counter()
+        key, response_ids, user_ids, scores, alphas = scoring.score_survey(
+            survey, chunk_size=options['chunk_size']
+        )
+        elapsed = time.perf_counter() - started
+        if not key.scales:
+            raise CommandError("Survey declares no scored scales")
+
+        if options['output']:
+            self._write_csv(options['output'], key, response_ids, user_ids, scores)
+
+        self.stderr.write(f"Scored {len(response_ids)} responses in {elapsed:.2f}s")
+        for column, scale in enumerate(key.scales):
+            values = scores[:, column]
+            answered = values[~np.isnan(values)]
+            mean = f"{answered.mean():.3f}" if answered.size else "n/a"
+            alpha = f"{alphas[scale]:.3f}" if alphas[scale] is not None else "n/a"
+            self.stderr.write(f"  {scale}: n={answered.size} mean={mean} alpha={alpha}")
+
+    def _write_csv(self, path, key, response_ids, user_ids, scores):
+        output = sys.stdout if path == '-' else open(path, 'w', newline='')
+        try:
+            writer = csv.writer(output)
+            writer.writerow(['response_id', 'user_id'] + key.scales)
+            for response_id, user_id, row in zip(response_ids, user_ids, scores):
+                writer.writerow(
+                    [response_id, user_id] + ['' if np.isnan(value) else round(value, 4) for value in row]
+                )
+        finally:
+            if output is not sys.stdout:
+                output.close()
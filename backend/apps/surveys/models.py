@@ -37,6 +37,7 @@ class SurveyResponse(models.Model):
     survey = models.ForeignKey('Surveys.Survey', on_delete=models.CASCADE)  # Fixed reference
     responses = models.JSONField()  # Stores user's answers
     completed = models.BooleanField(default=False)
+    revision = models.PositiveIntegerField(default=0)  # Incremented by each autosave
     submitted_at = models.DateTimeField(default=timezone.now)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -46,8 +47,103 @@ class SurveyResponse(models.Model):
         indexes = [
             models.Index(fields=['user', 'survey']),
             models.Index(fields=['completed']),
+            # Keyset pagination of a user's responses
+            models.Index(fields=['user', '-submitted_at', '-id'], name='surveys_resp_user_recent_idx'),
         ]
         unique_together = ['user', 'survey']
 
     def __str__(self):
         return f"{self.user.username}'s submission for {self.survey.title}"
+
+class SurveyAnswerDistribution(models.Model):
+    """
+    Per-question answer tallies of a survey's completed responses,
+    maintained incrementally by ``apps.surveys.distributions``.
+
+    ``counts`` maps question name to {answer: count}; ``numeric`` maps
+    question name to [count, sum, sum of squares] of numeric answers.
+    """
+    survey = models.OneToOneField(
+        'Surveys.Survey',
+        on_delete=models.CASCADE,
+        related_name='answer_distribution'
+    )
+    response_count = models.IntegerField(default=0)
+    counts = models.JSONField(default=dict)
+    numeric = models.JSONField(default=dict)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        app_label = 'Surveys'
+
+    def __str__(self):
+        return f"Answer distribution for {self.survey.title}"
+
+
+class SurveyAnswerQuerySet(models.QuerySet):
+    def answered(self, survey, question, completed=True, **lookups):
+        """
+        Answers to one question, optionally filtered by value lookups:
+        ``answered(survey, 'Q7', gte=4)``, ``answered(survey, 'pace',
+        exact='Fast')``, ``answered(survey, 'tools', in_=['list'])``.
+        The value column is chosen from the type of each lookup value.
+        ``completed=None`` includes draft responses.
+        """
+        rows = self.filter(survey=survey, question=question)
+        if completed is not None:
+            rows = rows.filter(completed=completed)
+        for lookup, value in lookups.items():
+            column = SurveyAnswer.value_column(value[0] if isinstance(value, (list, tuple)) else value)
+            rows = rows.filter(**{f"{column}__{lookup.rstrip('_')}": value})
+        return rows
+
+    def user_ids(self):
+        return self.values('user_id').distinct()
+
+class SurveyAnswer(models.Model):
+    """
+    One answer of a survey response, in typed columns so cohorts can be
+    selected by answer value with index range scans instead of reading
+    every ``SurveyResponse.responses`` blob. Multi-select answers get one
+    row per selected option. Rows are rewritten from the response on
+    save by ``apps.surveys.answer_index``.
+    """
+    TEXT_MAX_LENGTH = 255
+
+    response = models.ForeignKey(
+        'Surveys.SurveyResponse',
+        on_delete=models.CASCADE,
+        related_name='answers'
+    )
+    # Copied from the response so cohort queries never join it
+    survey = models.ForeignKey('Surveys.Survey', on_delete=models.CASCADE, related_name='+')
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='+')
+    completed = models.BooleanField(default=False)
+    question = models.CharField(max_length=255)
+    value_number = models.FloatField(null=True)
+    value_text = models.CharField(max_length=TEXT_MAX_LENGTH, null=True)
+    value_bool = models.BooleanField(null=True)
+
+    objects = SurveyAnswerQuerySet.as_manager()
+
+    class Meta:
+        app_label = 'Surveys'
+        indexes = [
+            models.Index(fields=['survey', 'question', 'completed', 'value_number'],
+                         name='surveys_answer_number_idx'),
+            models.Index(fields=['survey', 'question', 'completed', 'value_text'],
+                         name='surveys_answer_text_idx'),
+            models.Index(fields=['survey', 'question', 'completed', 'value_bool'],
+                         name='surveys_answer_bool_idx'),
+        ]
+
+    @staticmethod
+    def value_column(value):
+        if isinstance(value, bool):
+            return 'value_bool'
+        if isinstance(value, (int, float)):
+            return 'value_number'
+        return 'value_text'
+
+    def __str__(self):
+        return f"{self.question} of response {self.response_id}"
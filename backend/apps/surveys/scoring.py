@@ -0,0 +1,269 @@
+# Backend/Apps/Surveys/scoring.py
+
+"""
+Vectorized scoring of psychometric scales.
+
+Scale membership is declared on survey elements with SurveyJS custom
+properties:
+
+- ``scale``: scale name, or ``scales``: {scale name: weight}
+- ``weight``: item weight when ``scale`` is used (default 1)
+- ``reverse``: true for reverse-keyed items
+
+Rating items are scored by their value; choice items by their 1-based
+position, or by a ``score`` property on the choice object. Reverse-keyed
+items are mirrored within their range.
+
+A survey compiles once into a ``ScoringKey``: per-item answer encoders plus
+an (items x scales) weight matrix. Scoring a batch of responses is then a
+masked matrix multiply, giving each scale the weighted mean of its answered
+items.
+"""
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+
+import numpy as np
+
+from .models import SurveyResponse
+from .validation import CONTAINER_TYPES, SINGLE_CHOICE_TYPES, iter_elements
+
+MAX_CACHED_KEYS = 256
+
+@dataclass
+class ScoringKey:
+    """Compiled scoring key of a survey."""
+    items: list  # question names, in matrix row order
+    scales: list  # scale names, in matrix column order
+    weights: np.ndarray  # (items, scales)
+    encoders: list  # per item: {answer: numeric value}, or (low, high) for numeric ranges
+    reverse: np.ndarray  # (items,) bool
+    mirror: np.ndarray  # (items,) low + high, for reverse keying
+
+    def encode(self, responses) -> np.ndarray:
+        """
+        Turn answer dicts into an (n, items) float matrix with NaN for
+        missing or unscorable answers, reverse keying applied.
+        """
+        responses = [answers if isinstance(answers, dict) else {} for answers in responses]
+        matrix = np.full((len(responses), len(self.items)), np.nan)
+        for column, (name, encoder) in enumerate(zip(self.items, self.encoders)):
+            if isinstance(encoder, dict):
+                values = [encoder.get(answers.get(name)) if _hashable(answers.get(name)) else None
+                          for answers in responses]
+            else:
+                low, high = encoder
+                values = [_in_range(answers.get(name), low, high) for answers in responses]
+            matrix[:, column] = np.array(values, dtype=float)
+        return np.where(self.reverse, self.mirror - matrix, matrix)
+
+    def score_matrix(self, matrix) -> np.ndarray:
+        """
+        Scale scores for an encoded (n, items) matrix: the weighted mean of
+        each scale's answered items, NaN when none were answered.
+        """
+        answered = ~np.isnan(matrix)
+        totals = np.where(answered, matrix, 0.0) @ self.weights
+        coverage = answered.astype(float) @ np.abs(self.weights)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(coverage > 0, totals / coverage, np.nan)
+
+    def score(self, responses) -> np.ndarray:
+        """Scale scores for a list of answer dicts, shape (n, scales)."""
+        return self.score_matrix(self.encode(responses))
+
+    def cronbach_alpha(self, matrix) -> dict:
+        """
+        Cronbach's alpha of each scale over respondents who answered all
+        of its items. None for scales with fewer than two items or two
+        complete respondents.
+        """
+        alphas = {}
+        for column, scale in enumerate(self.scales):
+            members = np.flatnonzero(self.weights[:, column])
+            items = matrix[:, members] * np.sign(self.weights[members, column])
+            items = items[~np.isnan(items).any(axis=1)]
+            k = members.size
+            if k < 2 or items.shape[0] < 2:
+                alphas[scale] = None
+                continue
+            total_variance = items.sum(axis=1).var(ddof=1)
+            if total_variance == 0:
+                alphas[scale] = None
+                continue
+            item_variance = items.var(axis=0, ddof=1).sum()
+            alphas[scale] = float(k / (k - 1) * (1 - item_variance / total_variance))
+        return alphas
+
+def _hashable(value):
+    return isinstance(value, (str, int, float, bool)) or value is None
+
+def _in_range(value, low, high):
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None
+    return value if low <= value <= high else None
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+def _choice_scores(choices):
+    """{value: score} for the choices with a numeric score."""
+    scores = {}
+    for position, choice in enumerate(choices or [], start=1):
+        if isinstance(choice, dict):
+            score = choice.get('score', position)
+            if _is_number(score) and _hashable(choice.get('value')):
+                scores[choice.get('value')] = score
+        elif _hashable(choice):
+            scores[choice] = position
+    return scores
+
+def _scale_weights(element):
+    """
+    {scale: weight} of an element; empty when it belongs to no scale or its
+    membership is malformed (non-string scale names, non-numeric weights).
+    """
+    if 'scales' in element:
+        memberships = element['scales']
+        if not isinstance(memberships, dict):
+            return {}
+    elif element.get('scale'):
+        if not isinstance(element['scale'], str):
+            return {}
+        memberships = {element['scale']: element.get('weight', 1)}
+    else:
+        return {}
+    if not all(isinstance(name, str) and name and _is_number(weight) and np.isfinite(weight)
+               for name, weight in memberships.items()):
+        return {}
+    return {name: float(weight) for name, weight in memberships.items()}
+
+def _encoder(element):
+    """Return (encoder, low, high) for a scorable element, or None."""
+    element_type = element.get('type')
+    if element_type == 'rating':
+        if element.get('rateValues'):
+            return _choice_encoder(element['rateValues'])
+        low, high = element.get('rateMin', 1), element.get('rateMax', 5)
+        return _range_encoder(low, high)
+    if element_type in SINGLE_CHOICE_TYPES and element.get('choices'):
+        return _choice_encoder(element['choices'])
+    if element_type == 'text' and element.get('inputType') == 'number':
+        return _range_encoder(element.get('min'), element.get('max'))
+    return None
+
+def _choice_encoder(choices):
+    # Elements whose choices carry no numeric scores are not scorable
+    scores = _choice_scores(choices)
+    if not scores:
+        return None
+    return scores, min(scores.values()), max(scores.values())
+
+def _range_encoder(low, high):
+    if not (_is_number(low) and _is_number(high)) or low > high:
+        return None
+    return (low, high), low, high
+
+def compile_key(definition) -> ScoringKey:
+    """Compile the scoring key of a SurveyJS definition."""
+    items, scales, encoders, reverse, mirror, memberships = [], [], [], [], [], []
+    stack = list(reversed(list(iter_elements(definition))))
+    while stack:
+        element = stack.pop()
+        if not isinstance(element, dict):
+            continue
+        if element.get('type') in CONTAINER_TYPES:
+            stack.extend(reversed(element.get('elements', [])))
+            continue
+        name = element.get('name')
+        weights = _scale_weights(element) if name and isinstance(name, str) else None
+        encoded = _encoder(element) if weights else None
+        if encoded is None:
+            continue
+        encoder, low, high = encoded
+        items.append(name)
+        encoders.append(encoder)
+        reverse.append(bool(element.get('reverse')))
+        mirror.append(low + high)
+        memberships.append(weights)
+        for scale in weights:
+            if scale not in scales:
+                scales.append(scale)
+
+    matrix = np.zeros((len(items), len(scales)))
+    columns = {scale: column for column, scale in enumerate(scales)}
+    for row, weights in enumerate(memberships):
+        for scale, weight in weights.items():
+            matrix[row, columns[scale]] = weight
+
+    return ScoringKey(
+        items=items,
+        scales=scales,
+        weights=matrix,
+        encoders=encoders,
+        reverse=np.array(reverse, dtype=bool),
+        mirror=np.array(mirror, dtype=float),
+    )
+
+_keys = OrderedDict()
+_lock = threading.Lock()
+
+def get_key(survey) -> ScoringKey:
+    """Return the compiled scoring key of a survey, memoized by updated_at."""
+    marker = (survey.pk, survey.updated_at)
+    with _lock:
+        cached = _keys.get(survey.pk)
+        if cached is not None and cached[0] == marker:
+            _keys.move_to_end(survey.pk)
+            return cached[1]
+
+    key = compile_key(survey.questions)
+    with _lock:
+        _keys[survey.pk] = (marker, key)
+        _keys.move_to_end(survey.pk)
+        while len(_keys) > MAX_CACHED_KEYS:
+            _keys.popitem(last=False)
+    return key
+
+def scores_as_dict(key, row) -> dict:
+    """One row of scale scores as {scale: score or None}."""
+    return {
+        scale: None if np.isnan(value) else round(float(value), 4)
+        for scale, value in zip(key.scales, row)
+    }
+
+def score_response(survey, answers) -> dict:
+    """Score one set of answers. Returns {scale: score}."""
+    key = get_key(survey)
+    return scores_as_dict(key, key.score([answers])[0])
+
+def _encode_batch(key, batch, response_ids, user_ids):
+    response_ids.extend(response_id for response_id, _, _ in batch)
+    user_ids.extend(user_id for _, user_id, _ in batch)
+    return key.encode([answers for _, _, answers in batch])
+
+def score_survey(survey, queryset=None, chunk_size=5000):
+    """
+    Score every (completed) response to a survey.
+
+    Returns ``(key, response_ids, user_ids, scores, alphas)`` where
+    ``scores`` is an (n, scales) array aligned with the id lists.
+    """
+    key = get_key(survey)
+    if queryset is None:
+        queryset = SurveyResponse.objects.filter(survey=survey, completed=True)
+    rows = queryset.order_by('id').values_list('id', 'user_id', 'responses').iterator(chunk_size=chunk_size)
+
+    response_ids, user_ids, matrices = [], [], []
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= chunk_size:
+            matrices.append(_encode_batch(key, batch, response_ids, user_ids))
+            batch = []
+    if batch:
+        matrices.append(_encode_batch(key, batch, response_ids, user_ids))
+
+    matrix = np.vstack(matrices) if matrices else np.empty((0, len(key.items)))
+    return key, response_ids, user_ids, key.score_matrix(matrix), key.cronbach_alpha(matrix)
@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from . import validation
 from .models import Survey, SurveyResponse
 
 class SurveySerializer(serializers.ModelSerializer):
@@ -14,11 +15,31 @@ class SurveyResponseSerializer(serializers.ModelSerializer):
     class Meta:
         model = SurveyResponse
         fields = [
-            'id', 'survey', 'responses', 'completed',
+            'id', 'survey', 'responses', 'completed', 'revision',
             'submitted_at', 'updated_at'
         ]
-        read_only_fields = ['submitted_at', 'updated_at']
+        read_only_fields = ['revision', 'submitted_at', 'updated_at']
+
+    def validate(self, data):
+        survey = data.get('survey') or getattr(self.instance, 'survey', None)
+        if survey is not None and ('responses' in data or 'completed' in data):
+            # A partial update is checked as the response it will leave behind
+            responses = data['responses'] if 'responses' in data else getattr(self.instance, 'responses', {})
+            completed = data.get('completed', getattr(self.instance, 'completed', False))
+            errors = validation.get_schema(survey).validate(responses, completed=completed)
+            if errors:
+                raise serializers.ValidationError({'responses': errors})
+        return data
 
     def create(self, validated_data):
         validated_data['user'] = self.context['request'].user
-        return super().create(validated_data) 
\ No newline at end of file
+        return super().create(validated_data)
+
+class SurveyAutosaveSerializer(serializers.Serializer):
+    """
+    Changed answers for an autosave. A null answer clears the question.
+    ``revision`` is the revision the client last saw, for conflict checks.
+    """
+    answers = serializers.DictField(allow_empty=False)
+    revision = serializers.IntegerField(min_value=0, required=False)
+    completed = serializers.BooleanField(required=False)
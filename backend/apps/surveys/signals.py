@@ -1,10 +1,52 @@
-from django.db.models.signals import post_save
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
-from .models import SurveyResponse
+from .models import Survey, SurveyResponse
+from . import answer_index, catalog, distributions
+
+@receiver(pre_save, sender=SurveyResponse)
+def remember_counted_answers(sender, instance, raw=False, **kwargs):
+    """Signal to keep the answers a response contributed before this save"""
+    instance._counted_answers = None
+    if instance.pk and not raw:
+        previous = SurveyResponse.objects.filter(pk=instance.pk, completed=True) \
+            .values_list('responses', flat=True).first()
+        instance._counted_answers = previous
+
+@receiver(post_save, sender=SurveyResponse)
+def update_answer_distribution(sender, instance, raw=False, **kwargs):
+    """Signal to move the response's contribution in the survey's answer distribution"""
+    if raw:
+        return
+    distributions.apply_change(
+        instance.survey_id,
+        old_answers=getattr(instance, '_counted_answers', None),
+        new_answers=instance.responses if instance.completed else None
+    )
+
+@receiver(post_save, sender=SurveyResponse)
+def update_answer_index(sender, instance, raw=False, **kwargs):
+    """Signal to rewrite the response's normalized answer rows"""
+    if not raw:
+        answer_index.sync([instance])
+
+@receiver(post_delete, sender=SurveyResponse)
+def remove_from_answer_distribution(sender, instance, **kwargs):
+    """Signal to drop a deleted response from the survey's answer distribution"""
+    if instance.completed:
+        distributions.apply_change(instance.survey_id, old_answers=instance.responses)
 
 @receiver(post_save, sender=SurveyResponse)
 def handle_survey_completion(sender, instance, created, **kwargs):
     """Signal to handle survey completion"""
     if created and instance.completed:
         # Add survey completion logic here
-        pass 
\ No newline at end of file
+        pass 
+
+@receiver(post_save, sender=Survey)
+@receiver(post_delete, sender=Survey)
+def invalidate_survey_catalog(sender, **kwargs):
+    """Signal to start a new catalog version for conditional GETs"""
+    catalog.invalidate()
+    # Requests may cache the old version before the transaction commits
+    transaction.on_commit(catalog.invalidate)
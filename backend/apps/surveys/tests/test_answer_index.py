@@ -0,0 +1,53 @@
+from apps.surveys import answer_index
+from apps.surveys.models import SurveyAnswer, SurveyResponse
+
+def _response(answers, completed=True):
+    return SurveyResponse(pk=5, user_id=3, survey_id=2, responses=answers, completed=completed)
+
+class TestAnswerRows:
+    def test_one_typed_row_per_answer_or_option(self):
+        rows = answer_index.answer_rows(_response({
+            'pace': 'Fast',
+            'focus': 4,
+            'consent': True,
+            'tools': ['list', 'apps'],
+            'notes': 'x' * (SurveyAnswer.TEXT_MAX_LENGTH + 1),
+            'matrix': {'a': 1},
+            'skipped': None,
+        }))
+        values = sorted(
+            (row.question, row.value_text, row.value_number, row.value_bool) for row in rows
+        )
+
+        assert values == [
+            ('consent', None, None, True),
+            ('focus', None, 4.0, None),
+            ('pace', 'Fast', None, None),
+            ('tools', 'apps', None, None),
+            ('tools', 'list', None, None),
+        ]
+        assert {(row.response_id, row.user_id, row.survey_id, row.completed) for row in rows} == {(5, 3, 2, True)}
+
+    def test_drafts_are_marked(self):
+        rows = answer_index.answer_rows(_response({'focus': 4}, completed=False))
+
+        assert [row.completed for row in rows] == [False]
+
+    def test_rows_of_a_subset_of_answers(self):
+        rows = answer_index.answer_rows(_response({'focus': 4, 'pace': 'Fast'}), {'pace': 'Slow'})
+
+        assert [(row.question, row.value_text) for row in rows] == [('pace', 'Slow')]
+
+class TestAnswerFilters:
+    def test_lookup_picks_typed_column(self):
+        where = str(SurveyAnswer.objects.answered(2, 'Q7', gte=4).query).split('WHERE')[1]
+
+        assert '"value_number" >= 4' in where
+        assert '"completed"' in where
+
+    def test_in_lookup_and_drafts(self):
+        where = str(SurveyAnswer.objects.answered(2, 'tools', completed=None, in_=['list']).query).split('WHERE')[1]
+
+        assert '"value_text" IN' in where
+        assert '"completed"' not in where
+        assert SurveyAnswer.value_column(True) == 'value_bool'
@@ -0,0 +1,53 @@
+import pytest
+from django.db.models import F
+from apps.games.models import Game, GameScore
+from apps.surveys import autosave
+from apps.surveys.autosave import JSONMerge, stored_answers
+from apps.surveys.models import Survey, SurveyResponse
+
+pytestmark = pytest.mark.django_db
+
+def _merge(stored, delta, user):
+    # Any JSON column will do; GameScore.metadata stands in for responses
+    score = GameScore.objects.create(user=user, game=Game.objects.create(title='Go/No-Go'), score=1,
+                                     metadata=stored)
+    GameScore.objects.filter(pk=score.pk).update(metadata=JSONMerge(F('metadata'), delta))
+    score.refresh_from_db()
+    return score.metadata
+
+class TestJSONMerge:
+    def test_top_level_keys_are_replaced(self, test_user):
+        merged = _merge({'mood': 3, 'grid': {'a': 1, 'b': 2}}, {'mood': 4, 'grid': {'a': 5}}, test_user)
+        assert merged == {'mood': 4, 'grid': {'a': 5}}
+
+    def test_null_clears_only_delta_keys(self, test_user):
+        stored = {'mood': 3, 'notes': None, 'grid': {'a': None, 'b': 2}}
+        merged = _merge(stored, {'mood': None, 'panel': {'x': None}}, test_user)
+        assert merged == {'notes': None, 'grid': {'a': None, 'b': 2}, 'panel': {'x': None}}
+
+class TestStoredAnswers:
+    def test_reads_only_the_requested_keys(self, test_user):
+        score = GameScore.objects.create(user=test_user, game=Game.objects.create(title='Stroop'), score=1,
+                                         metadata={'mood': 3, 'tools': ['list'], 'notes': None, 'grid': {'a': 1}})
+        rows = GameScore.objects.filter(pk=score.pk)
+
+        assert stored_answers(rows, ['mood', 'tools', 'notes', 'missing'], field='metadata') == {
+            'mood': 3, 'tools': ['list'],
+        }
+        assert stored_answers(rows, [], field='metadata') == {}
+
+class TestApplyDelta:
+    def test_completed_response_keeps_required_answers(self, test_user):
+        survey = Survey.objects.create(title='Sleep', questions=[
+            {'type': 'rating', 'name': 'quality', 'isRequired': True},
+            {'type': 'comment', 'name': 'notes'},
+        ])
+        autosave.apply_delta(test_user, survey, {'quality': 4}, completed=True)
+
+        with pytest.raises(autosave.IncompleteResponse) as raised:
+            autosave.apply_delta(test_user, survey, {'quality': None})
+        assert set(raised.value.errors) == {'quality'}
+        assert SurveyResponse.objects.get(user=test_user, survey=survey).responses == {'quality': 4}
+
+        response = autosave.apply_delta(test_user, survey, {'notes': 'Slept late'})
+        assert response.revision == 2
@@ -0,0 +1,59 @@
+import pytest
+from apps.surveys import distributions
+from apps.surveys.models import Survey, SurveyAnswerDistribution, SurveyResponse
+
+def _distribution_of(*responses):
+    counts, numeric = distributions.tally(None)
+    for answers in responses:
+        distributions.tally(answers, counts=counts, numeric=numeric)
+    distribution = SurveyAnswerDistribution(response_count=len(responses))
+    distributions.merge(distribution, counts, numeric)
+    return distribution
+
+class TestAnswerDistributions:
+    def test_counts_and_numeric_summary(self):
+        distribution = _distribution_of(
+            {'pace': 'Fast', 'focus': 4, 'tools': ['list', 'apps']},
+            {'pace': 'Slow', 'focus': 8, 'tools': ['list'], 'notes': ''},
+        )
+        summary = distributions.summarize(distribution)
+
+        assert summary['response_count'] == 2
+        assert summary['questions']['pace']['counts'] == {'Fast': 1, 'Slow': 1}
+        assert summary['questions']['tools']['counts'] == {'list': 2, 'apps': 1}
+        assert summary['questions']['focus']['counts'] == {'4': 1, '8': 1}
+        assert summary['questions']['focus']['mean'] == 6
+        assert summary['questions']['focus']['variance'] == 4
+        assert 'notes' not in summary['questions']
+
+    def test_edit_moves_contribution(self):
+        old = {'pace': 'Fast', 'focus': 4}
+        new = {'pace': 'Slow', 'focus': 4}
+        distribution = _distribution_of(old, {'pace': 'Fast', 'focus': 6})
+
+        counts, numeric = distributions.tally(old, sign=-1)
+        distributions.tally(new, counts=counts, numeric=numeric)
+        distributions.merge(distribution, counts, numeric)
+
+        assert distribution.counts['pace'] == {'Fast': 1, 'Slow': 1}
+        assert distribution.numeric['focus'] == [2, 10.0, 52.0]
+
+    def test_removing_last_answer_drops_question(self):
+        answers = {'pace': 'Fast', 'focus': 3}
+        distribution = _distribution_of(answers)
+
+        counts, numeric = distributions.tally(answers, sign=-1)
+        distributions.merge(distribution, counts, numeric)
+
+        assert distribution.counts == {}
+        assert distribution.numeric == {}
+
+@pytest.mark.django_db
+class TestDistributionSignals:
+    def test_deleting_survey_with_completed_responses(self, test_user):
+        survey = Survey.objects.create(title='Sleep', questions={'elements': []})
+        SurveyResponse.objects.create(user=test_user, survey=survey, responses={'hours': 7}, completed=True)
+        assert SurveyAnswerDistribution.objects.get(survey=survey).response_count == 1
+
+        survey.delete()
+        assert not SurveyAnswerDistribution.objects.exists()
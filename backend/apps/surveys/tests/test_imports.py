@@ -0,0 +1,94 @@
+import io
+import pytest
+from django.contrib.auth import get_user_model
+from apps.surveys import imports
+from apps.surveys.models import Survey
+from apps.surveys.validation import compile_schema
+
+SCHEMA = compile_schema([
+    {'type': 'radiogroup', 'name': 'pace', 'choices': ['Fast', 'Slow'], 'isRequired': True},
+    {'type': 'rating', 'name': 'focus', 'rateMin': 1, 'rateMax': 10},
+    {'type': 'checkbox', 'name': 'tools', 'choices': ['list', 'apps']},
+])
+
+class TestImportParsing:
+    def test_csv_cells_are_parsed_as_json_or_text(self):
+        stream = io.StringIO(
+            'email,completed,pace,focus,tools\n'
+            'a@example.com,yes,Fast,7,"[""list""]"\n'
+            'b@example.com,,Slow,,\n'
+        )
+        rows = list(imports.iter_csv(stream))
+
+        assert rows[0] == (2, {
+            'email': 'a@example.com',
+            'completed': 'yes',
+            'submitted_at': None,
+            'responses': {'pace': 'Fast', 'focus': 7, 'tools': ['list']},
+        })
+        assert rows[1][1]['responses'] == {'pace': 'Slow'}
+
+    def test_utf8_check_rewinds(self):
+        good, bad = io.BytesIO('{"email": "é"}\n'.encode()), io.BytesIO(b'email\n\xff\xfe\n')
+
+        assert imports.is_utf8(good, chunk_size=3) and good.tell() == 0
+        assert not imports.is_utf8(bad) and bad.tell() == 0
+
+    def test_jsonl_skips_blank_lines_and_flags_bad_ones(self):
+        stream = io.StringIO('{"email": "a@example.com", "responses": {}}\n\nnot json\n[1]\n')
+        rows = list(imports.iter_jsonl(stream))
+
+        assert [line for line, _ in rows] == [1, 3, 4]
+        assert rows[0][1]['email'] == 'a@example.com'
+        assert rows[1][1] == {'invalid': True} and rows[2][1] == {'invalid': True}
+
+class TestImportValidation:
+    def test_valid_row(self):
+        report = imports.ImportReport()
+        row = {'email': ' a@example.com ', 'responses': {'pace': 'Fast'},
+               'submitted_at': '2024-05-01T10:00:00'}
+        email, fields = imports._prepare(SCHEMA, 1, row, True, report)
+
+        assert email == 'a@example.com'
+        assert fields['completed'] is True
+        assert fields['submitted_at'].tzinfo is not None
+        assert report.rejected == 0
+
+    def test_rejections_are_reported_by_line(self):
+        report = imports.ImportReport()
+        rows = [
+            (1, {'invalid': True}),
+            (2, {'responses': {'pace': 'Fast'}}),
+            (3, {'email': 'a@example.com', 'responses': {'focus': 4}}),
+            (4, {'email': 'a@example.com', 'responses': {'pace': 'Fast'}, 'submitted_at': 'soon'}),
+            (5, {'email': ['a@example.com'], 'responses': {'pace': 'Fast'}}),
+        ]
+        for line, row in rows:
+            assert imports._prepare(SCHEMA, line, row, True, report) is None
+
+        assert report.rejected == 5
+        assert [error['line'] for error in report.errors] == [1, 2, 3, 4, 5]
+        assert report.errors[2]['errors'] == {'responses': {'pace': ['This question is required.']}}
+
+    def test_drafts_skip_required_questions(self):
+        report = imports.ImportReport()
+        row = {'email': 'a@example.com', 'responses': {'focus': 4}, 'completed': 'false'}
+
+        assert imports._prepare(SCHEMA, 1, row, True, report)[1]['completed'] is False
+
+@pytest.mark.django_db
+class TestImportBatches:
+    def test_duplicate_users_in_a_batch_are_reported(self):
+        get_user_model().objects.create_user(username='a', email='a@example.com', password='x')
+        report = imports.ImportReport()
+        batch = [
+            (line, 'a@example.com', {'responses': {'pace': pace}, 'completed': True, 'submitted_at': None})
+            for line, pace in ((2, 'Fast'), (3, 'Slow'))
+        ] + [(4, 'nobody@example.com', {'responses': {}, 'completed': True, 'submitted_at': None})]
+        imports._write_batch(Survey(pk=1), batch, report, dry_run=True)
+
+        assert (report.imported, report.rejected) == (1, 2)
+        assert report.errors == [
+            {'line': 2, 'errors': {'email': ['Replaced by line 3 for the same user.']}},
+            {'line': 4, 'errors': {'email': ['No user with this email.']}},
+        ]
@@ -0,0 +1,94 @@
+import numpy as np
+import pytest
+from apps.surveys import scoring
+
+DEFINITION = {
+    'pages': [{'elements': [
+        {'type': 'rating', 'name': 'plan_1', 'rateMin': 1, 'rateMax': 5, 'scale': 'planning'},
+        {'type': 'rating', 'name': 'plan_2', 'rateMin': 1, 'rateMax': 5, 'scale': 'planning', 'reverse': True},
+        {'type': 'radiogroup', 'name': 'plan_3', 'choices': ['Never', 'Sometimes', 'Always'],
+         'scales': {'planning': 2, 'focus': 1}},
+        {'type': 'radiogroup', 'name': 'focus_1',
+         'choices': [{'value': 'low', 'score': 0}, {'value': 'high', 'score': 10}], 'scale': 'focus'},
+        {'type': 'comment', 'name': 'notes'},
+    ]}]
+}
+
+@pytest.fixture
+def key():
+    return scoring.compile_key(DEFINITION)
+
+class TestScoringKey:
+    def test_compiles_weight_matrix(self, key):
+        assert key.items == ['plan_1', 'plan_2', 'plan_3', 'focus_1']
+        assert key.scales == ['planning', 'focus']
+        np.testing.assert_array_equal(key.weights, [[1, 0], [1, 0], [2, 1], [0, 1]])
+
+    def test_scores_with_reverse_keys_and_missing_items(self, key):
+        scores = key.score([
+            {'plan_1': 5, 'plan_2': 1, 'plan_3': 'Always', 'focus_1': 'high'},
+            {'plan_1': 2, 'plan_3': 'Never'},
+            {'notes': 'nothing scorable'},
+        ])
+        # planning: (5 + (6 - 1) + 2 * 3) / 4; focus: (3 + 10) / 2
+        np.testing.assert_allclose(scores[0], [4.0, 6.5])
+        np.testing.assert_allclose(scores[1], [(2 + 2 * 1) / 3, 1.0])
+        assert np.isnan(scores[2]).all()
+
+    def test_out_of_range_answers_are_ignored(self, key):
+        scores = key.score([{'plan_1': 9, 'plan_2': True, 'plan_3': ['Always']}])
+        assert np.isnan(scores[0, 0])
+
+    def test_cronbach_alpha(self):
+        key = scoring.compile_key([
+            {'type': 'rating', 'name': f'item_{index}', 'rateMax': 5, 'scale': 'trait'}
+            for index in range(3)
+        ])
+        responses = [
+            {'item_0': 1, 'item_1': 2, 'item_2': 1},
+            {'item_0': 3, 'item_1': 3, 'item_2': 4},
+            {'item_0': 5, 'item_1': 4, 'item_2': 5},
+            {'item_0': 2, 'item_1': 2},
+        ]
+        matrix = key.encode(responses)
+        complete = matrix[:3]
+        k = 3
+        expected = k / (k - 1) * (
+            1 - complete.var(axis=0, ddof=1).sum() / complete.sum(axis=1).var(ddof=1)
+        )
+        assert key.cronbach_alpha(matrix)['trait'] == pytest.approx(expected)
+
+    def test_scores_many_responses_at_once(self, key):
+        rng = np.random.default_rng(0)
+        responses = [
+            {'plan_1': int(a), 'plan_2': int(b), 'plan_3': 'Sometimes', 'focus_1': 'low'}
+            for a, b in rng.integers(1, 6, size=(20000, 2))
+        ]
+        scores = key.score(responses)
+        assert scores.shape == (20000, 2)
+        assert np.allclose(scores[:, 1], 1.0)
+
+    def test_elements_without_numeric_scores_are_skipped(self):
+        key = scoring.compile_key({'elements': [
+            {'type': 'rating', 'name': 'mood', 'scale': 'affect',
+             'rateValues': [{'value': 'a', 'score': 'low'}, {'value': 'b', 'score': 'high'}]},
+            {'type': 'text', 'inputType': 'number', 'name': 'hours', 'min': 'x', 'max': 24, 'scale': 'sleep'},
+            {'type': 'rating', 'name': 'energy', 'scale': 'affect'},
+        ]})
+        assert key.items == ['energy']
+        np.testing.assert_allclose(key.score([{'energy': 4}, ['not', 'a', 'dict']]), [[4.0], [np.nan]])
+
+    @pytest.mark.parametrize('element', [
+        {'type': 'rating', 'scale': 'affect'},
+        {'type': 'rating', 'name': ['mood'], 'scale': 'affect'},
+        {'type': 'rating', 'name': 'mood', 'scale': 'affect', 'weight': 'heavy'},
+        {'type': 'rating', 'name': 'mood', 'scale': 'affect', 'weight': float('nan')},
+        {'type': 'rating', 'name': 'mood', 'scale': ['affect']},
+        {'type': 'rating', 'name': 'mood', 'scales': ['affect']},
+        {'type': 'rating', 'name': 'mood', 'scales': {'affect': 'x'}},
+    ])
+    def test_malformed_scale_elements_are_skipped(self, element):
+        key = scoring.compile_key({'elements': [element, {'type': 'rating', 'name': 'energy', 'scale': 'affect'}]})
+
+        assert key.items == ['energy']
+        assert scoring.scores_as_dict(key, key.score([{'mood': 1, 'energy': 4}])[0]) == {'affect': 4.0}
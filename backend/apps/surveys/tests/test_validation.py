@@ -0,0 +1,90 @@
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from apps.surveys import validation
+from apps.surveys.models import Survey, SurveyResponse
+from apps.surveys.serializers import SurveyResponseSerializer
+
+DEFINITION = {
+    'pages': [
+        {'elements': [{'type': 'html', 'name': 'intro'}]},
+        {'elements': [
+            {'type': 'radiogroup', 'name': 'pace', 'choices': ['Slow', 'Fast'], 'isRequired': True},
+            {'type': 'rating', 'name': 'focus', 'rateMin': 1, 'rateMax': 10, 'isRequired': True},
+            {'type': 'text', 'name': 'pace_other', 'visibleIf': "{pace} = 'Other'", 'isRequired': True},
+        ]},
+        {'elements': [{
+            'type': 'panel',
+            'name': 'habits',
+            'elements': [
+                {'type': 'checkbox', 'name': 'tools', 'choices': [{'value': 'list', 'text': 'Lists'}, 'apps']},
+                {'type': 'text', 'name': 'hours', 'inputType': 'number', 'min': 0, 'max': 24},
+                {'type': 'boolean', 'name': 'naps', 'isRequired': True},
+            ],
+        }]},
+    ]
+}
+
+@pytest.fixture
+def schema():
+    return validation.compile_schema(DEFINITION)
+
+class TestSurveySchema:
+    def test_valid_answers(self, schema):
+        answers = {'pace': 'Fast', 'focus': 7, 'tools': ['list', 'apps'], 'hours': 2.5, 'naps': False}
+        assert schema.validate(answers, completed=True) == {}
+
+    def test_invalid_types_options_and_ranges(self, schema):
+        errors = schema.validate({
+            'pace': 'Medium',
+            'focus': 11,
+            'tools': ['list', ['nested']],
+            'hours': '2',
+            'naps': 'yes',
+            'mystery': 1,
+        })
+        assert set(errors) == {'pace', 'focus', 'tools', 'hours', 'naps', 'mystery'}
+
+    def test_required_only_for_completed_submissions(self, schema):
+        assert schema.validate({'pace': 'Slow'}) == {}
+        errors = schema.validate({'pace': 'Slow'}, completed=True)
+        assert set(errors) == {'focus', 'naps'}
+
+    @pytest.mark.parametrize('value, valid', [(0.3, True), (0.7, True), (1, True), (0.35, False)])
+    def test_decimal_steps(self, value, valid):
+        schema = validation.compile_schema([
+            {'type': 'rating', 'name': 'mood', 'rateMin': 0, 'rateMax': 1, 'rateStep': 0.1},
+            {'type': 'text', 'name': 'dose', 'inputType': 'number', 'min': 0.1, 'step': 0.1},
+        ])
+        assert (schema.validate({'mood': value, 'dose': value}) == {}) is valid
+
+    def test_malformed_step_is_ignored(self):
+        schema = validation.compile_schema([{'type': 'rating', 'name': 'mood', 'rateStep': 'x'}])
+        assert schema.validate({'mood': 3}) == {}
+
+    def test_partial_update_checks_the_stored_answers(self):
+        survey = Survey(pk=98, updated_at=datetime(2024, 1, 1), questions=DEFINITION)
+        instance = SurveyResponse(survey=survey, responses={'pace': 'Slow'}, completed=False)
+
+        serializer = SurveyResponseSerializer(instance, data={'completed': True}, partial=True)
+        assert not serializer.is_valid()
+        assert set(serializer.errors['responses']) == {'focus', 'naps'}
+
+        instance.responses = {'pace': 'Slow', 'focus': 3, 'naps': True}
+        assert SurveyResponseSerializer(instance, data={'completed': True}, partial=True).is_valid()
+
+    def test_rejects_non_object(self, schema):
+        assert 'non_field_errors' in schema.validate(['Fast'])
+
+    def test_memoized_by_updated_at(self):
+        updated_at = datetime(2024, 1, 1)
+        survey = SimpleNamespace(pk=99, updated_at=updated_at, questions=DEFINITION)
+        first = validation.get_schema(survey)
+        assert validation.get_schema(survey) is first
+
+        survey.updated_at = updated_at + timedelta(seconds=1)
+        survey.questions = [{'type': 'comment', 'name': 'feedback'}]
+        recompiled = validation.get_schema(survey)
+        assert recompiled is not first
+        assert list(recompiled.checkers) == ['feedback']
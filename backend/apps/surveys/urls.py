@@ -4,7 +4,11 @@ from django.urls import path
 from .views import (
     SurveyView,
     SurveyDetailView,
-    SurveyResponseView
+    SurveyResponseView,
+    SurveyAutosaveView,
+    SurveyDistributionView,
+    SurveyImportView,
+    SurveyResponseListView
 )
 
 app_name = 'surveys'
@@ -13,4 +17,8 @@ urlpatterns = [
     path('', SurveyView.as_view(), name='survey-list'),
     path('<int:pk>/', SurveyDetailView.as_view(), name='survey-detail'),
     path('<int:pk>/submit/', SurveyResponseView.as_view(), name='survey-submit'),
+    path('<int:pk>/autosave/', SurveyAutosaveView.as_view(), name='survey-autosave'),
+    path('<int:pk>/distribution/', SurveyDistributionView.as_view(), name='survey-distribution'),
+    path('<int:pk>/import/', SurveyImportView.as_view(), name='survey-import'),
+    path('responses/', SurveyResponseListView.as_view(), name='survey-response-list'),
 ]
@@ -0,0 +1,237 @@
+# Backend/Apps/Surveys/validation.py
+
+"""
+Compiled validators for survey submissions.
+
+``Survey.questions`` holds a SurveyJS definition (``pages`` -> ``elements``,
+with nested ``panel`` elements). Interpreting it on every submission is
+wasteful, so each survey is compiled once into a ``SurveySchema``: a map
+from question name to a small checker function plus the set of required
+names. Compiled schemas are memoized per process by survey id and
+``updated_at``, so editing a survey recompiles it on next use.
+"""
+
+import math
+import threading
+from collections import OrderedDict
+from decimal import Decimal
+
+# Element types that never carry an answer
+DISPLAY_TYPES = {'html', 'image', 'expression'}
+
+# Element types holding other elements
+CONTAINER_TYPES = {'panel'}
+
+SINGLE_CHOICE_TYPES = {'radiogroup', 'dropdown', 'imagepicker'}
+MULTI_CHOICE_TYPES = {'checkbox', 'tagbox', 'ranking'}
+NUMERIC_INPUT_TYPES = {'number', 'range'}
+
+# SurveyJS stores free-text for "other" choices under "<name>-Comment"
+COMMENT_SUFFIX = '-Comment'
+
+MAX_CACHED_SCHEMAS = 256
+
+class SurveySchema:
+    """
+    Compiled form of a survey definition.
+    """
+    def __init__(self, checkers, required):
+        self.checkers = checkers  # {name: callable(value) -> error or None}
+        self.required = required  # frozenset of names
+
+    def validate(self, answers, completed=False):
+        """
+        Check submitted answers. Required questions are only enforced for
+        completed submissions, so drafts can be saved partially.
+        Returns {question name: [error]}; empty when the answers are valid.
+        """
+        if not isinstance(answers, dict):
+            return {'non_field_errors': ['Expected an object of answers keyed by question name.']}
+
+        errors = {}
+        checkers = self.checkers
+        for name, value in answers.items():
+            checker = checkers.get(name)
+            if checker is None:
+                if name.endswith(COMMENT_SUFFIX) and name[:-len(COMMENT_SUFFIX)] in checkers:
+                    checker = _check_string
+                else:
+                    errors[name] = ['Unknown question.']
+                    continue
+            if value is None:
+                continue
+            error = checker(value)
+            if error:
+                errors[name] = [error]
+
+        if completed:
+            for name in self.required:
+                if answers.get(name) in (None, '', []):
+                    errors[name] = ['This question is required.']
+        return errors
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value)
+
+def _check_string(value):
+    return None if isinstance(value, str) else 'Expected text.'
+
+def _check_any(value):
+    return None
+
+def _check_boolean(value):
+    return None if isinstance(value, bool) else 'Expected true or false.'
+
+def _is_option(value, allowed):
+    # Unhashable answers (lists, objects) can never be a listed option
+    try:
+        return value in allowed
+    except TypeError:
+        return False
+
+def _choice_values(choices):
+    return frozenset(
+        choice.get('value') if isinstance(choice, dict) else choice
+        for choice in choices or []
+    )
+
+def _single_choice(element):
+    allowed = _choice_values(element.get('choices'))
+    allows_other = element.get('hasOther') or element.get('showOtherItem')
+
+    def check(value):
+        if _is_option(value, allowed) or (allows_other and value == 'other'):
+            return None
+        return 'Not an allowed option.'
+    return check
+
+def _multi_choice(element):
+    allowed = _choice_values(element.get('choices'))
+    if element.get('hasOther') or element.get('showOtherItem'):
+        allowed = allowed | {'other'}
+
+    def check(value):
+        if not isinstance(value, list):
+            return 'Expected a list of options.'
+        if not all(_is_option(item, allowed) for item in value):
+            return 'Not an allowed option.'
+        return None
+    return check
+
+def _decimal(value):
+    # Through str, so 0.3 is the 0.3 the client meant and not the nearest float
+    return Decimal(str(value))
+
+def _number_range(low, high, step=None):
+    # Malformed steps in the definition are ignored rather than failing every answer
+    step = _decimal(step) if _is_number(step) and step > 0 else None
+    origin = _decimal(low) if _is_number(low) else Decimal(0)
+
+    def check(value):
+        if not _is_number(value):
+            return 'Expected a number.'
+        if (low is not None and value < low) or (high is not None and value > high):
+            return f'Must be between {low} and {high}.'
+        if step and (_decimal(value) - origin) % step:
+            return f'Must be a multiple of {step}.'
+        return None
+    return check
+
+def _rating(element):
+    if element.get('rateValues'):
+        allowed = _choice_values(element['rateValues'])
+
+        def check(value):
+            if isinstance(value, bool) or not _is_option(value, allowed):
+                return 'Not an allowed rating.'
+            return None
+        return check
+    return _number_range(
+        element.get('rateMin', 1),
+        element.get('rateMax', 5),
+        element.get('rateStep', 1)
+    )
+
+def _text(element):
+    if element.get('inputType') in NUMERIC_INPUT_TYPES:
+        return _number_range(element.get('min'), element.get('max'), element.get('step'))
+    max_length = element.get('maxLength')
+    if not max_length:
+        return _check_string
+
+    def check(value):
+        if not isinstance(value, str):
+            return 'Expected text.'
+        if len(value) > max_length:
+            return f'Must be at most {max_length} characters.'
+        return None
+    return check
+
+def _checker(element):
+    element_type = element.get('type')
+    if element_type in SINGLE_CHOICE_TYPES:
+        return _single_choice(element)
+    if element_type in MULTI_CHOICE_TYPES:
+        return _multi_choice(element)
+    if element_type == 'rating':
+        return _rating(element)
+    if element_type == 'text':
+        return _text(element)
+    if element_type == 'comment':
+        return _check_string
+    if element_type == 'boolean':
+        return _check_boolean
+    # Unknown and composite question types are stored as submitted
+    return _check_any
+
+def iter_elements(definition):
+    if isinstance(definition, list):
+        yield from definition
+        return
+    if not isinstance(definition, dict):
+        return
+    for page in definition.get('pages', []):
+        yield from page.get('elements', [])
+    yield from definition.get('elements', [])
+
+def compile_schema(definition) -> SurveySchema:
+    """Compile a SurveyJS definition (or bare list of elements)."""
+    checkers = {}
+    required = set()
+    stack = [(element, False) for element in iter_elements(definition)]
+    while stack:
+        element, conditional = stack.pop()
+        if not isinstance(element, dict):
+            continue
+        # Conditionally shown questions may legitimately be unanswered
+        conditional = conditional or bool(element.get('visibleIf') or element.get('enableIf'))
+        if element.get('type') in CONTAINER_TYPES:
+            stack.extend((child, conditional) for child in element.get('elements', []))
+            continue
+        name = element.get('name')
+        if not name or element.get('type') in DISPLAY_TYPES:
+            continue
+        checkers[name] = _checker(element)
+        if element.get('isRequired') and not conditional:
+            required.add(name)
+    return SurveySchema(checkers, frozenset(required))
+
+_schemas = OrderedDict()
+_lock = threading.Lock()
+
+def get_schema(survey) -> SurveySchema:
+    """Return the compiled schema of a survey, compiling it on first use."""
+    key = (survey.pk, survey.updated_at)
+    with _lock:
+        schema = _schemas.get(survey.pk)
+        if schema is not None and schema[0] == key:
+            _schemas.move_to_end(survey.pk)
+            return schema[1]
+
+    compiled = compile_schema(survey.questions)
+    with _lock:
+        _schemas[survey.pk] = (key, compiled)
+        _schemas.move_to_end(survey.pk)
+        while len(_schemas) > MAX_CACHED_SCHEMAS:
+            _schemas.popitem(last=False)
+    return compiled
@@ -1,9 +1,14 @@
 # Backend/Apps/Surveys/views.py
 
-from rest_framework import generics
-from rest_framework.permissions import IsAuthenticated
+import io
+from django.shortcuts import get_object_or_404
+from rest_framework import generics, status
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
+from rest_framework.response import Response
+from mindmodel.core.utils import APIResponse, KeysetPagination, conditional_get
+from . import autosave, catalog, distributions, imports, validation
 from .models import Survey, SurveyResponse
-from .serializers import SurveySerializer, SurveyResponseSerializer
+from .serializers import SurveySerializer, SurveyResponseSerializer, SurveyAutosaveSerializer
 
 class SurveyView(generics.ListAPIView):
     """
@@ -13,6 +18,13 @@ class SurveyView(generics.ListAPIView):
     serializer_class = SurveySerializer
     permission_classes = [IsAuthenticated]
 
+    def get_content_version(self, request):
+        return catalog.version()
+
+    @conditional_get
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
 class SurveyDetailView(generics.RetrieveAPIView):
     """
     Retrieve a specific survey.
@@ -30,3 +42,96 @@ class SurveyResponseView(generics.CreateAPIView):
 
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
+
+class SurveyAutosaveView(generics.GenericAPIView):
+    """
+    Autosave changed answers of the user's response to a survey.
+    """
+    serializer_class = SurveyAutosaveSerializer
+    permission_classes = [IsAuthenticated]
+
+    def patch(self, request, pk):
+        survey = get_object_or_404(Survey, pk=pk, is_active=True)
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        answers = serializer.validated_data['answers']
+
+        errors = validation.get_schema(survey).validate(answers)
+        if errors:
+            return Response({'answers': errors}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            response = autosave.apply_delta(
+                request.user,
+                survey,
+                answers,
+                revision=serializer.validated_data.get('revision'),
+                completed=serializer.validated_data.get('completed')
+            )
+        except autosave.RevisionConflict as e:
+            return Response(
+                {'detail': 'Response was changed by another save', 'revision': e.revision},
+                status=status.HTTP_409_CONFLICT
+            )
+        except autosave.IncompleteResponse as e:
+            return Response({'responses': e.errors}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response({
+            'id': response.id,
+            'revision': response.revision,
+            'completed': response.completed,
+            'updated_at': response.updated_at,
+        })
+
+class SurveyDistributionView(generics.GenericAPIView):
+    """
+    Per-question answer counts and means of a survey's completed responses.
+    """
+    permission_classes = [IsAdminUser]
+
+    def get(self, request, pk):
+        survey = get_object_or_404(Survey, pk=pk)
+        return Response(distributions.get_distribution(survey))
+
+class SurveyImportView(generics.GenericAPIView):
+    """
+    Bulk import responses to a survey from an uploaded CSV or JSONL file.
+    The upload is parsed as a stream and written in batches.
+    """
+    permission_classes = [IsAdminUser]
+
+    def post(self, request, pk):
+        survey = get_object_or_404(Survey, pk=pk)
+        upload = request.FILES.get('file')
+        if upload is None:
+            return Response({'file': ['This field is required.']}, status=status.HTTP_400_BAD_REQUEST)
+
+        fmt = request.data.get('format') or (
+            imports.FORMAT_CSV if upload.name.endswith('.csv') else imports.FORMAT_JSONL
+        )
+        if fmt not in imports.FORMATS:
+            return Response({'format': [f'Must be one of {", ".join(imports.FORMATS)}.']},
+                            status=status.HTTP_400_BAD_REQUEST)
+        dry_run = str(request.data.get('dry_run', '')).lower() in imports.TRUE_VALUES
+
+        if not imports.is_utf8(upload.file):
+            return APIResponse.error(
+                message="The file is not valid UTF-8 text",
+                errors={'file': ['Save the file with UTF-8 encoding.']},
+                code="invalid_encoding"
+            )
+        stream = io.TextIOWrapper(upload.file, encoding='utf-8', newline='')
+        report = imports.import_responses(survey, imports.iter_rows(stream, fmt), dry_run=dry_run)
+        return Response(report.as_dict())
+
+class SurveyResponseListView(generics.ListAPIView):
+    """
+    List the authenticated user's survey responses, newest first.
+    """
+    serializer_class = SurveyResponseSerializer
+    permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
+    keyset_ordering = ('-submitted_at', '-id')
+
+    def get_queryset(self):
+        return SurveyResponse.objects.filter(user=self.request.user)
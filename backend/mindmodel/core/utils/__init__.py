@@ -1,4 +1,7 @@
 from .response import APIResponse
 from .exceptions import custom_exception_handler
+from .pagination import KeysetPagination
+from .conditional import conditional_get
+from .local_redis import LocalRedis
 
-__all__ = ['APIResponse', 'custom_exception_handler'] 
\ No newline at end of file
+__all__ = ['APIResponse', 'custom_exception_handler', 'KeysetPagination', 'conditional_get', 'LocalRedis'] 
\ No newline at end of file
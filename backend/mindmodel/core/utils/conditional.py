@@ -0,0 +1,40 @@
+"""
+Conditional GET support for rarely changing catalog endpoints.
+"""
+import hashlib
+from functools import wraps
+
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+def conditional_get(handler):
+    """
+    Decorate a view handler so ``If-None-Match``/``If-Modified-Since`` are
+    answered with 304 before the handler queries or serializes anything.
+
+    The view implements ``get_content_version(request)`` returning
+    ``(version, last_modified)``: an opaque token that changes whenever the
+    content does (such as a cache version counter) and an optional
+    datetime. Both must be cheap to compute. The ETag also covers the query
+    string and negotiated media type, since those change the body.
+    """
+    @wraps(handler)
+    def wrapper(self, request, *args, **kwargs):
+        version, last_modified = self.get_content_version(request)
+        digest = hashlib.sha1(
+            f"{version}|{request.get_full_path()}|{request.accepted_media_type}".encode()
+        ).hexdigest()
+        etag = quote_etag(digest)
+        timestamp = int(last_modified.timestamp()) if last_modified else None
+
+        response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+        if response is None:
+            response = handler(self, request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+
+        response['ETag'] = etag
+        if timestamp is not None:
+            response['Last-Modified'] = http_date(timestamp)
+        return response
+    return wrapper
@@ -0,0 +1,190 @@
+"""
+In-process stand-in for the Redis client.
+"""
+import bisect
+import fnmatch
+import threading
+import time
+
+class LocalRedis:
+    """
+    Minimal in-memory implementation of the Redis string, sorted-set and
+    list commands used by the leaderboards and the AI event store, used
+    when no Redis URL is configured. Commands are serialized by a lock, and a
+    pipeline runs all of its commands under one acquisition, like
+    MULTI/EXEC. Intended for development and tests only; it is
+    process-local and not shared between workers.
+    """
+    def __init__(self):
+        self._data = {}
+        self._expiry = {}
+        self._lock = threading.RLock()
+
+    def _get(self, key, create=None):
+        expires_at = self._expiry.get(key)
+        if expires_at is not None and expires_at <= time.monotonic():
+            self._data.pop(key, None)
+            self._expiry.pop(key, None)
+        if key not in self._data and create is not None:
+            self._data[key] = create()
+        return self._data.get(key)
+
+    # Strings
+
+    def get(self, name):
+        with self._lock:
+            return self._get(name)
+
+    def set(self, name, value, ex=None):
+        with self._lock:
+            self._data[name] = value
+            self._expiry.pop(name, None)
+            if ex is not None:
+                self._expiry[name] = time.monotonic() + ex
+            return True
+
+    # Sorted sets: {'scores': {member: score}, 'order': ascending [(score, member)]};
+    # read in reverse, ties are by member descending like ZREVRANGE
+
+    @staticmethod
+    def _zset():
+        return {'scores': {}, 'order': []}
+
+    def zadd(self, name, mapping, gt=False):
+        with self._lock:
+            zset = self._get(name, create=self._zset)
+            added = 0
+            for member, score in mapping.items():
+                member = str(member)
+                score = float(score)
+                current = zset['scores'].get(member)
+                if current is not None:
+                    if gt and score <= current:
+                        continue
+                    zset['order'].remove((current, member))
+                else:
+                    added += 1
+                zset['scores'][member] = score
+                bisect.insort(zset['order'], (score, member))
+            return added
+
+    def zscore(self, name, member):
+        with self._lock:
+            zset = self._get(name)
+            if zset is None:
+                return None
+            return zset['scores'].get(str(member))
+
+    def zrevrank(self, name, member):
+        with self._lock:
+            zset = self._get(name)
+            if zset is None:
+                return None
+            member = str(member)
+            score = zset['scores'].get(member)
+            if score is None:
+                return None
+            return len(zset['order']) - 1 - bisect.bisect_left(zset['order'], (score, member))
+
+    def zrevrange(self, name, start, end, withscores=False):
+        with self._lock:
+            zset = self._get(name)
+            if zset is None:
+                return []
+            length = len(zset['order'])
+            stop = length if end == -1 else min(end + 1, length)
+            items = zset['order'][max(length - stop, 0):max(length - start, 0)][::-1]
+            if withscores:
+                return [(member, score) for score, member in items]
+            return [member for _, member in items]
+
+    def zcard(self, name):
+        with self._lock:
+            zset = self._get(name)
+            return len(zset['scores']) if zset else 0
+
+    # Lists
+
+    @staticmethod
+    def _stop(length, end):
+        return length + end + 1 if end < 0 else end + 1
+
+    def rpush(self, name, *values):
+        with self._lock:
+            items = self._get(name, create=list)
+            items.extend(values)
+            return len(items)
+
+    def lrange(self, name, start, end):
+        with self._lock:
+            items = self._get(name) or []
+            return items[start:self._stop(len(items), end)]
+
+    def ltrim(self, name, start, end):
+        with self._lock:
+            items = self._get(name)
+            if items is not None:
+                items[:] = items[start:self._stop(len(items), end)]
+            return True
+
+    # Keys
+
+    def expire(self, name, seconds):
+        with self._lock:
+            if self._get(name) is None:
+                return False
+            self._expiry[name] = time.monotonic() + seconds
+            return True
+
+    def rename(self, src, dst):
+        with self._lock:
+            if self._get(src) is None:
+                raise KeyError(src)
+            self._data[dst] = self._data.pop(src)
+            self._expiry.pop(dst, None)
+            if src in self._expiry:
+                self._expiry[dst] = self._expiry.pop(src)
+            return True
+
+    def scan_iter(self, match='*'):
+        with self._lock:
+            keys = [
+                key for key in list(self._data)
+                if fnmatch.fnmatchcase(key, match) and self._get(key) is not None
+            ]
+        yield from keys
+
+    def delete(self, *names):
+        with self._lock:
+            removed = 0
+            for name in names:
+                removed += self._data.pop(name, None) is not None
+                self._expiry.pop(name, None)
+            return removed
+
+    def flushall(self):
+        with self._lock:
+            self._data.clear()
+            self._expiry.clear()
+
+    def pipeline(self, transaction=True):
+        return _LocalPipeline(self)
+
+class _LocalPipeline:
+    """Queues commands and runs them atomically against ``LocalRedis``."""
+    def __init__(self, client):
+        self._client = client
+        self._commands = []
+
+    def __getattr__(self, name):
+        method = getattr(self._client, name)
+
+        def queue(*args, **kwargs):
+            self._commands.append((method, args, kwargs))
+            return self
+        return queue
+
+    def execute(self):
+        commands, self._commands = self._commands, []
+        with self._client._lock:
+            return [method(*args, **kwargs) for method, args, kwargs in commands]
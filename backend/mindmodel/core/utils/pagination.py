@@ -0,0 +1,154 @@
+"""
+Keyset (cursor) pagination for large, append-heavy tables.
+"""
+import base64
+import json
+from typing import Any, List, Optional, Sequence
+
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.settings import api_settings
+
+from .response import APIResponse
+
+class KeysetPagination(BasePagination):
+    """
+    Paginate by seeking past the last row seen instead of using OFFSET.
+
+    Views set ``keyset_ordering`` to a unique ordering such as
+    ``('-played_at', '-id')``, backed by a matching composite index. Each
+    page is a single index range scan with no ``COUNT(*)``, so deep pages
+    cost the same as the first one.
+
+    Responses keep the ``APIResponse`` paginated envelope, with opaque
+    ``next``/``previous`` cursors in place of page numbers.
+    """
+    page_size = api_settings.PAGE_SIZE or 10
+    max_page_size = 100
+    page_size_query_param = 'page_size'
+    cursor_query_param = 'cursor'
+    default_ordering = ('-id',)
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.ordering = tuple(getattr(view, 'keyset_ordering', self.default_ordering))
+        self.fields = [name.lstrip('-') for name in self.ordering]
+        self.per_page = self.get_page_size(request)
+
+        cursor = self.decode_cursor(request, queryset.model)
+        reverse = cursor is not None and cursor['reverse']
+        ordering = self._reversed(self.ordering) if reverse else self.ordering
+
+        queryset = queryset.order_by(*ordering)
+        if cursor is not None:
+            queryset = queryset.filter(self._seek(ordering, cursor['position']))
+
+        rows = list(queryset[:self.per_page + 1])
+        has_more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+        if reverse:
+            rows.reverse()
+
+        self.page = rows
+        self.next_cursor = None
+        self.previous_cursor = None
+        if rows:
+            if has_more or reverse:
+                self.next_cursor = self.encode_cursor(rows[-1], reverse=False)
+            if cursor is not None and (has_more or not reverse):
+                self.previous_cursor = self.encode_cursor(rows[0], reverse=True)
+        return rows
+
+    def get_page_size(self, request) -> int:
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return min(max(size, 1), self.max_page_size)
+
+    @staticmethod
+    def _reversed(ordering: Sequence[str]) -> tuple:
+        return tuple(name[1:] if name.startswith('-') else f'-{name}' for name in ordering)
+
+    def _seek(self, ordering: Sequence[str], position: List[Any]) -> Q:
+        """
+        Build ``(a, b) > (x, y)`` in the direction of each ordering field as
+        ``a > x OR (a = x AND b > y)``.
+        """
+        condition = Q()
+        for index in reversed(range(len(ordering))):
+            name = ordering[index].lstrip('-')
+            lookup = 'lt' if ordering[index].startswith('-') else 'gt'
+            step = Q(**{f'{name}__{lookup}': position[index]})
+            if index < len(ordering) - 1:
+                step |= Q(**{name: position[index]}) & condition
+            condition = step
+        return condition
+
+    @staticmethod
+    def _encode_value(value):
+        # DjangoJSONEncoder drops microseconds, which would break seeking
+        if hasattr(value, 'isoformat'):
+            return value.isoformat()
+        if isinstance(value, (str, int, float, bool)) or value is None:
+            return value
+        return str(value)
+
+    def encode_cursor(self, instance, reverse: bool) -> str:
+        payload = {
+            'p': [self._encode_value(getattr(instance, name)) for name in self.fields],
+            'r': reverse,
+        }
+        data = json.dumps(payload, separators=(',', ':'))
+        return base64.urlsafe_b64encode(data.encode()).decode().rstrip('=')
+
+    def decode_cursor(self, request, model) -> Optional[dict]:
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            padded = encoded + '=' * (-len(encoded) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+            values = payload['p']
+            if len(values) != len(self.fields):
+                raise ValueError
+            position = [
+                model._meta.get_field(name).to_python(value)
+                for name, value in zip(self.fields, values)
+            ]
+        except Exception:
+            raise NotFound(self.invalid_cursor_message)
+        return {'position': position, 'reverse': bool(payload.get('r'))}
+
+    def get_paginated_response(self, data):
+        return APIResponse.cursor_paginated_response(
+            items=data,
+            next_cursor=self.next_cursor,
+            previous_cursor=self.previous_cursor,
+            per_page=self.per_page
+        )
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'properties': {
+                'success': {'type': 'boolean'},
+                'message': {'type': 'string'},
+                'data': {
+                    'type': 'object',
+                    'properties': {
+                        'items': schema,
+                        'pagination': {
+                            'type': 'object',
+                            'properties': {
+                                'next': {'type': 'string', 'nullable': True},
+                                'previous': {'type': 'string', 'nullable': True},
+                                'per_page': {'type': 'integer'},
+                            },
+                        },
+                    },
+                },
+            },
+        }
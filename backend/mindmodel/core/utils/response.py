@@ -100,4 +100,40 @@ class APIResponse:
             },
             message=message,
             metadata=metadata
-        ) 
\ No newline at end of file
+        )
+
+    @staticmethod
+    def cursor_paginated_response(
+        items: List[Any],
+        next_cursor: Optional[str],
+        previous_cursor: Optional[str],
+        per_page: int,
+        message: str = "Success",
+        metadata: Optional[Dict] = None
+    ) -> Response:
+        """
+        Format keyset-paginated API response
+        
+        Args:
+            items: Serialized items for the current page
+            next_cursor: Cursor for the following page, if any
+            previous_cursor: Cursor for the preceding page, if any
+            per_page: Page size
+            message: Success message
+            metadata: Additional metadata
+            
+        Returns:
+            Response: Formatted DRF response with cursor pagination
+        """
+        return APIResponse.success(
+            data={
+                "items": items,
+                "pagination": {
+                    "next": next_cursor,
+                    "previous": previous_cursor,
+                    "per_page": per_page,
+                }
+            },
+            message=message,
+            metadata=metadata
+        )
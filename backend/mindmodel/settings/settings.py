@@ -175,12 +175,45 @@ RATE_LIMIT_PER_USER = int(os.getenv('RATE_LIMIT_PER_USER', 100))
 RATE_LIMIT_PER_IP = int(os.getenv('RATE_LIMIT_PER_IP', 50))
 RATE_LIMIT_WINDOW = 300  # 5 minutes
 
-# Cache configuration
-CACHES = {
-    'default': {
-        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+# Cache configuration. Set CACHE_REDIS_URL to share the cache between web
+# processes and Celery workers; the per-process LocMemCache is the default.
+CACHE_REDIS_URL = os.getenv('CACHE_REDIS_URL')
+if CACHE_REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django_redis.cache.RedisCache',
+            'LOCATION': CACHE_REDIS_URL,
+        }
     }
-}
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+# Coalesce game progress heartbeats in the cache and write them back with
+# the periodic flush task. Unset, they are buffered only when the cache is
+# shared between processes, i.e. when CACHE_REDIS_URL is set; with the
+# LocMemCache default each heartbeat is written straight to the database.
+GAME_PROGRESS_BUFFER = None
+
+# Leaderboards (sorted sets). Falls back to an in-process store when unset.
+LEADERBOARD_REDIS_URL = os.getenv('LEADERBOARD_REDIS_URL')
+
+# AI event store: completion event lists, analysis stream replay and progress
+# state, shared by Celery workers and web processes. Required unless DEBUG;
+# falls back to an in-process store when unset.
+AI_DATA_REDIS_URL = os.getenv('AI_DATA_REDIS_URL')
+
+# Model used for analyses; part of the analysis result cache key
+AI_ANALYSIS_MODEL = os.getenv('AI_ANALYSIS_MODEL', 'gpt-4o-mini')
+
+# Async model runner: alternate API server, concurrency and provider rate limits
+OPENAI_BASE_URL = os.getenv('OPENAI_BASE_URL')
+AI_MAX_IN_FLIGHT = int(os.getenv('AI_MAX_IN_FLIGHT', 16))
+AI_REQUESTS_PER_MINUTE = int(os.getenv('AI_REQUESTS_PER_MINUTE', 500))
+AI_TOKENS_PER_MINUTE = int(os.getenv('AI_TOKENS_PER_MINUTE', 200000))
 
 # Google OAuth2 settings
 SOCIAL_AUTH_GOOGLE_OAUTH2_KEY = os.getenv('GOOGLE_OAUTH2_CLIENT_ID')
@@ -199,8 +232,8 @@ SPECTACULAR_SETTINGS = {
     'COMPONENT_SPLIT_REQUEST': True,
 }
 
-# Logging Configuration
-LOGS_DIR = os.path.join(BASE_DIR, 'logs')
+# Logging Configuration. Set LOGS_DIR to keep log files out of the checkout
+LOGS_DIR = os.getenv('LOGS_DIR', os.path.join(BASE_DIR, 'logs'))
 os.makedirs(LOGS_DIR, exist_ok=True)
 
 LOGGING = {